@@ -0,0 +1,42 @@
+# capture_source.py
+"""
+Opens a frame source with the matching capture backend: image sequences,
+the ffmpeg pipe decoder or OpenCV. Every capture implements the subset of
+the cv2.VideoCapture interface used by VideoHandler and parallel_decode.
+"""
+from typing import Any, Dict, Optional, Union
+
+import cv2 # type: ignore
+
+import video_index
+from ffmpeg_source import BACKEND_FFMPEG, FFmpegPipeCapture, open_ffmpeg_capture
+from image_sequence_source import ImageSequenceCapture, is_image_sequence_source
+
+def open_capture(source: str,
+                 sequence_options: Optional[Dict[str, Any]] = None,
+                 decode_backend: Optional[str] = None,
+                 ffmpeg_threads: int = 0,
+                 profile: Optional[Any] = None) -> Union[cv2.VideoCapture, ImageSequenceCapture, FFmpegPipeCapture]:
+    """
+    Opens source with the matching backend: ImageSequenceCapture for image sequences,
+    otherwise FFmpegPipeCapture when decode_backend is BACKEND_FFMPEG, else cv2.VideoCapture.
+
+    profile (a DecodeProfile) lets the ffmpeg backend crop and convert frames itself;
+    use residual_profile() to find what is left to apply to the frames read.
+    Variable-frame-rate ffmpeg captures get the timestamp index from the video's
+    sidecar, when it has been built, so they can seek exactly.
+    """
+    if is_image_sequence_source(source):
+        return ImageSequenceCapture(source, sequence_options)
+    if decode_backend == BACKEND_FFMPEG:
+        capture = open_ffmpeg_capture(source, ffmpeg_threads, profile)
+        if capture.isOpened() and capture.needs_frame_times:
+            capture.set_frame_times(video_index.load_index_section(source, video_index.SECTION_FRAME_TIMES))
+        return capture
+    return cv2.VideoCapture(source)
+
+def residual_profile(capture: Any, profile: Any) -> Any:
+    """The part of a DecodeProfile still to be applied to frames read from capture (see open_capture)."""
+    if isinstance(capture, FFmpegPipeCapture) and capture.applies_profile:
+        return profile.with_roi(None)
+    return profile
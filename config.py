@@ -29,6 +29,8 @@ META_SCALE_LINE_P1Y = "Scale Line P1 Y (Scene px)"
 META_SCALE_LINE_P2X = "Scale Line P2 X (Scene px)"
 META_SCALE_LINE_P2Y = "Scale Line P2 Y (Scene px)"
 META_SHOW_MEASUREMENT_LINE_LENGTHS = "Show Measurement Line Lengths" # [cite: 75]
+META_SEQUENCE_OPTIONS = "Image Sequence Options" # FPS/raw layout; only present for image-sequence sources
+META_DECODE_BACKEND = "Decode Backend" # "opencv" or "ffmpeg"; the decoder the video was opened with
 
 
 # --- Table Column Indices ---
@@ -96,6 +98,8 @@ STYLE_MEASUREMENT_LINE_ACTIVE = "style_measurement_line_active"
 # --- END NEW ---
 
 CLICK_TOLERANCE = 10.0
+# Point times closer than this to the video's frame timestamps are not retimed.
+RETIME_TOLERANCE_MS = 1e-3
 CLICK_TOLERANCE_SQ = CLICK_TOLERANCE * CLICK_TOLERANCE
 
 # --- Formatting Constants for Scale Display ---
@@ -115,6 +119,49 @@ ROUND_NUMBER_SEQUENCE = [1.0, 2.0, 2.5, 5.0]
 DRAG_THRESHOLD = 5
 MAX_ABS_SCALE = 50.0
 
+# --- Video Decoding Constants ---
+# Forward gaps up to this many frames are bridged with grab() instead of a
+# seek, since a seek on long-GOP codecs re-decodes from the previous keyframe.
+VIDEO_SEQUENTIAL_GRAB_MAX_GAP = 30
+# Memory for one backward read-ahead chunk (reverse playback and stepping).
+# A GOP is decoded forward once and its frames are served in reverse; GOPs
+# larger than this are split into several chunks.
+REVERSE_DECODE_CHUNK_BYTES = 256 * 1024 * 1024
+
+# Parallel (multi-process) decoding of frame ranges. Ranges shorter than the
+# minimum are decoded in-process, as starting worker processes costs ~1 s.
+PARALLEL_DECODE_MIN_FRAMES = 600
+PARALLEL_DECODE_CHUNK_BYTES = 64 * 1024 * 1024 # Shared-memory size per chunk
+PARALLEL_DECODE_MIN_CHUNK_FRAMES = 8
+
+# Kymograph results at least this large are written to a temporary-file-backed
+# memmap instead of RAM.
+KYMOGRAPH_MEMMAP_MIN_BYTES = 1024 * 1024 * 1024
+# Minimum time between progress updates from kymograph generation.
+KYMOGRAPH_PROGRESS_INTERVAL_S = 0.1
+# Process-parallel kymographs: chunks queued per worker (for load balancing)
+# and the largest chunk (so progress and cancellation stay responsive).
+KYMOGRAPH_CHUNKS_PER_WORKER = 4
+KYMOGRAPH_MAX_CHUNK_FRAMES = 2000
+# Line endpoints are rounded to this many decimal places in kymograph cache keys.
+KYMOGRAPH_CACHE_ENDPOINT_DECIMALS = 2
+
+# FFmpeg pipe decoder backend. Plain names are looked up on PATH.
+FFMPEG_EXECUTABLE = "ffmpeg"
+FFPROBE_EXECUTABLE = "ffprobe"
+# Mean absolute grayscale difference up to which an ffmpeg frame is taken to
+# match the OpenCV frame (the decoders' colour conversions differ slightly).
+FFMPEG_ACCURACY_MAX_MEAN_DIFF = 3.0
+
+# --- Playback Constants ---
+# Display ticks are never shorter than this (~60 Hz); faster footage advances
+# several frames per tick instead of asking for sub-millisecond timers.
+PLAYBACK_MIN_DISPLAY_INTERVAL_MS = 16.0
+PLAYBACK_RATE_MIN = 0.1
+PLAYBACK_RATE_MAX = 8.0
+PLAYBACK_RATES = [0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0] # Offered in the playback speed selector
+PLAYBACK_STATS_INTERVAL_MS = 1000
+
 # --- Application Info ---
 APP_NAME = "PyroTracker"
 APP_ORGANIZATION = "Durham University"
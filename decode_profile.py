@@ -0,0 +1,90 @@
+# decode_profile.py
+"""
+Decode profiles for analysis passes: the colour format and crop that batch
+consumers (kymographs, intensity profiles, detection) need from each frame.
+Applying the profile once, right after decoding, means full BGR frames never
+travel further than the decoder.
+"""
+from enum import Enum
+from typing import Optional, Tuple
+
+import cv2 # type: ignore
+import numpy as np
+
+class DecodeColorMode(Enum):
+    BGR8 = "bgr8"     # 3-channel 8-bit, as displayed
+    GRAY8 = "gray8"   # Luminance, 8-bit
+    GRAY16 = "gray16" # Luminance at the source's native depth (>8-bit image sequences only)
+
+class DecodeProfile:
+    """
+    Colour mode plus an optional (x, y, width, height) crop. Instances are
+    immutable and picklable, so they can be handed to decoder processes.
+    """
+
+    def __init__(self,
+                 color_mode: DecodeColorMode = DecodeColorMode.BGR8,
+                 roi: Optional[Tuple[int, int, int, int]] = None) -> None:
+        self._color_mode = color_mode
+        self._roi = tuple(int(v) for v in roi) if roi is not None else None
+
+    def __repr__(self) -> str:
+        return f"DecodeProfile({self._color_mode.value}, roi={self._roi})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, DecodeProfile) and (self._color_mode, self._roi) == (other._color_mode, other._roi)
+
+    def __hash__(self) -> int:
+        return hash((self._color_mode, self._roi))
+
+    @property
+    def color_mode(self) -> DecodeColorMode:
+        return self._color_mode
+
+    @property
+    def roi(self) -> Optional[Tuple[int, int, int, int]]:
+        return self._roi
+
+    @property
+    def is_gray(self) -> bool:
+        return self._color_mode != DecodeColorMode.BGR8
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.uint16 if self._color_mode == DecodeColorMode.GRAY16 else np.uint8)
+
+    def with_roi(self, roi: Optional[Tuple[int, int, int, int]]) -> "DecodeProfile":
+        return DecodeProfile(self._color_mode, roi)
+
+    def with_color_mode(self, color_mode: DecodeColorMode) -> "DecodeProfile":
+        return DecodeProfile(color_mode, self._roi)
+
+    def frame_shape(self, frame_width: int, frame_height: int) -> Tuple[int, ...]:
+        """Shape of a frame after the profile is applied to a frame_width x frame_height source."""
+        width, height = (self._roi[2], self._roi[3]) if self._roi is not None else (frame_width, frame_height)
+        return (height, width) if self.is_gray else (height, width, 3)
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Crops and converts a decoded frame. Input is 8-bit BGR or grayscale (from
+        the display path or a grayscale frame store), or native-depth grayscale
+        for GRAY16. The result never aliases a cropped source buffer.
+        """
+        if self._roi is not None:
+            x, y, w, h = self._roi
+            frame = frame[y:y + h, x:x + w]
+        if self.is_gray and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        elif not self.is_gray and frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        elif self._roi is not None:
+            frame = np.ascontiguousarray(frame)
+        if frame.dtype != self.dtype:
+            # 8-bit luminance requested as 16-bit: spread over the full range.
+            if self.dtype == np.uint16:
+                frame = frame.astype(np.uint16) * 257
+            else:
+                frame = cv2.convertScaleAbs(frame, alpha=255.0 / 65535.0)
+        return frame
+
+BGR8_PROFILE = DecodeProfile()
@@ -0,0 +1,203 @@
+# decoded_frame_store.py
+"""
+Disk-backed store of decoded frames ("decode once" mode).
+
+Frames are written into a memory-mapped .npy scratch file the first time they
+are decoded; every later access is a zero-copy view of the mapping. A validity
+bitmap saved next to the frames records which slots have been filled, so the
+store survives project reopens for as long as the source video's fingerprint
+(size and modification time) is unchanged.
+"""
+import hashlib
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+import cv2 # type: ignore
+import numpy as np
+from PySide6 import QtCore
+
+from video_index import compute_file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+FRAMES_SUFFIX = ".frames.npy"
+VALID_SUFFIX = ".valid.npy"
+_BITMAP_FLUSH_INTERVAL = 256 # Frames written between validity bitmap saves
+
+def store_directory() -> str:
+    cache_dir = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(cache_dir, "decoded_frames")
+
+def _store_size_bytes(frames_path: str) -> int:
+    size = 0
+    for path in (frames_path, frames_path[:-len(FRAMES_SUFFIX)] + VALID_SUFFIX):
+        try:
+            size += os.path.getsize(path)
+        except OSError:
+            pass
+    return size
+
+def _evict_stores_to_fit(directory: str, needed_bytes: int, max_total_bytes: int, keep_prefix: str) -> None:
+    """Deletes least-recently-used stores until needed_bytes more fit under max_total_bytes."""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(FRAMES_SUFFIX)]
+    except OSError:
+        return
+    stores = []
+    for name in names:
+        path = os.path.join(directory, name)
+        if name.startswith(keep_prefix):
+            continue
+        try:
+            stores.append((os.path.getmtime(path), path, _store_size_bytes(path)))
+        except OSError:
+            continue
+    total = sum(size for _mtime, _path, size in stores)
+    for _mtime, path, size in sorted(stores):
+        if total + needed_bytes <= max_total_bytes:
+            break
+        base = path[:-len(FRAMES_SUFFIX)]
+        for stale_path in (path, base + VALID_SUFFIX):
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+        total -= size
+        logger.info(f"Evicted decoded-frame store '{os.path.basename(path)}' to stay within the disk cap.")
+
+
+class DecodedFrameStore:
+    """
+    Memory-mapped array of decoded frames for one video, with a validity bitmap.
+
+    In grayscale mode frames are stored as single-channel 8-bit images (one
+    third of the size); put() converts BGR input. All methods are thread-safe.
+    """
+
+    def __init__(self, frames_path: str, frame_shape: Tuple[int, ...], total_frames: int) -> None:
+        self._frames_path = frames_path
+        self._valid_path = frames_path[:-len(FRAMES_SUFFIX)] + VALID_SUFFIX
+        self._lock = threading.Lock()
+        self._writes_since_flush = 0
+        shape = (total_frames,) + tuple(frame_shape)
+        frames: Optional[np.ndarray] = None
+        valid: Optional[np.ndarray] = None
+        if os.path.isfile(frames_path) and os.path.isfile(self._valid_path):
+            try:
+                frames = np.lib.format.open_memmap(frames_path, mode="r+")
+                valid = np.load(self._valid_path)
+                if frames.shape != shape or frames.dtype != np.uint8 or valid.shape != (total_frames,):
+                    logger.info("Decoded-frame store layout changed. Recreating it.")
+                    frames = valid = None
+                else:
+                    os.utime(frames_path) # Mark as recently used for eviction
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not reopen decoded-frame store '{frames_path}': {e}. Recreating it.")
+                frames = valid = None
+        if frames is None or valid is None:
+            frames = np.lib.format.open_memmap(frames_path, mode="w+", dtype=np.uint8, shape=shape)
+            valid = np.zeros(total_frames, dtype=bool)
+        self._frames: np.ndarray = frames
+        self._valid: np.ndarray = valid
+        self._is_grayscale = len(frame_shape) == 2
+        logger.info(f"Decoded-frame store '{os.path.basename(frames_path)}': "
+                    f"{int(self._valid.sum())}/{total_frames} frames already decoded.")
+
+    @classmethod
+    def open_for_video(cls,
+                       filepath: str,
+                       frame_width: int,
+                       frame_height: int,
+                       total_frames: int,
+                       grayscale: bool,
+                       max_total_bytes: int) -> Optional["DecodedFrameStore"]:
+        """
+        Opens (or creates) the store for filepath. Returns None if the video cannot
+        be fingerprinted, the store would exceed max_total_bytes, or the scratch
+        file cannot be created.
+        """
+        fingerprint = compute_file_fingerprint(filepath)
+        if fingerprint is None:
+            return None
+        frame_shape: Tuple[int, ...] = (frame_height, frame_width) if grayscale else (frame_height, frame_width, 3)
+        needed_bytes = total_frames * int(np.prod(frame_shape))
+        if needed_bytes > max_total_bytes:
+            logger.info(f"Decoded-frame store for '{os.path.basename(filepath)}' would need "
+                        f"{needed_bytes / 1024**3:.1f} GB (cap {max_total_bytes / 1024**3:.1f} GB). Not creating it.")
+            return None
+        profile = "gray8" if grayscale else "bgr8"
+        key = f"{os.path.abspath(filepath)}|{fingerprint['size']}|{fingerprint['mtime_ns']}|{profile}"
+        key_hash = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        directory = store_directory()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            _evict_stores_to_fit(directory, needed_bytes, max_total_bytes, keep_prefix=key_hash)
+            return cls(os.path.join(directory, key_hash + FRAMES_SUFFIX), frame_shape, total_frames)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not open decoded-frame store for '{os.path.basename(filepath)}': {e}")
+            return None
+
+    def get(self, frame_index: int) -> Optional[np.ndarray]:
+        """Returns a read-only view of the stored frame, or None if it has not been decoded yet."""
+        with self._lock:
+            if not (0 <= frame_index < self._valid.size) or not self._valid[frame_index]:
+                return None
+            # Take the view under the lock: close() swaps _frames, but the view
+            # keeps the mapping it was taken from alive.
+            view = self._frames[frame_index]
+        view.flags.writeable = False
+        return view
+
+    def put(self, frame_index: int, frame: np.ndarray) -> None:
+        if self._is_grayscale and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if frame.dtype != np.uint8:
+            return
+        with self._lock:
+            if not (0 <= frame_index < self._valid.size) or self._valid[frame_index]:
+                return
+            if frame.shape != self._frames.shape[1:]:
+                return
+            self._frames[frame_index] = frame
+            self._valid[frame_index] = True
+            self._writes_since_flush += 1
+            if self._writes_since_flush >= _BITMAP_FLUSH_INTERVAL:
+                self._flush_locked()
+
+    def covers(self, start_frame_idx: int, end_frame_idx: int, step: int = 1) -> bool:
+        """True if every frame of the range is already stored."""
+        with self._lock:
+            return bool(self._valid[start_frame_idx:end_frame_idx + 1:step].all())
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            # Drop the mapping; the store behaves as empty afterwards.
+            self._frames = np.zeros((0,) + self._frames.shape[1:], dtype=np.uint8)
+            self._valid = np.zeros(0, dtype=bool)
+
+    def _flush_locked(self) -> None:
+        # Pixel data reaches the file before the bitmap that vouches for it.
+        if self._writes_since_flush == 0:
+            return
+        try:
+            if isinstance(self._frames, np.memmap):
+                self._frames.flush()
+            temp_path = self._valid_path + ".tmp"
+            with open(temp_path, "wb") as f:
+                np.save(f, self._valid)
+            os.replace(temp_path, self._valid_path)
+            self._writes_since_flush = 0
+        except OSError as e:
+            logger.warning(f"Could not save decoded-frame store bitmap: {e}")
+
+    @property
+    def is_grayscale(self) -> bool:
+        return self._is_grayscale
+
+    @property
+    def stored_frame_count(self) -> int:
+        with self._lock:
+            return int(self._valid.sum())
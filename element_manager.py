@@ -9,9 +9,10 @@ import logging
 import math # Added for length and angle calculation
 from collections import defaultdict
 from enum import Enum, auto
-from typing import List, Tuple, Dict, Optional, Any, TYPE_CHECKING # Added TYPE_CHECKING
+from typing import List, Tuple, Dict, Optional, Any, Callable, TYPE_CHECKING # Added TYPE_CHECKING
 import copy
 
+import numpy as np
 from PySide6 import QtCore
 
 import config
@@ -563,6 +564,42 @@ class ElementManager(QtCore.QObject):
         if self.elements[element_index]['visibility_mode'] != ElementVisibilityMode.HIDDEN: self.visualsNeedUpdate.emit()
         return True
 
+    def retime_points(self, frame_to_time_ms: Callable[[Any], Any]) -> int:
+        """
+        Recomputes the time of every point from its frame index, e.g. once the video's
+        per-frame timestamps are known. frame_to_time_ms maps an array of frame indices
+        to times in ms. Times within config.RETIME_TOLERANCE_MS of the new value are
+        left alone, and only fits of tracks with a changed time are invalidated.
+
+        Returns:
+            The number of points whose time changed.
+        """
+        changed_points = 0
+        for element in self.elements:
+            element_data: ElementData = element['data']
+            if not element_data:
+                continue
+            new_times = np.asarray(frame_to_time_ms(np.array([p[0] for p in element_data], dtype=np.int64)), dtype=np.float64)
+            element_changed = 0
+            for i, (point, new_time) in enumerate(zip(element_data, new_times)):
+                if abs(point[1] - new_time) > config.RETIME_TOLERANCE_MS:
+                    element_data[i] = (point[0], float(new_time), point[2], point[3])
+                    element_changed += 1
+            changed_points += element_changed
+            if element_changed and element['type'] == ElementType.TRACK and \
+               element.get('analysis_state', {}).get('fit_results', {}).get('coefficients_poly2') is not None:
+                logger.info(f"Invalidating fit for Track ID {element['id']} because its point times changed.")
+                element['analysis_state']['fit_results']['coefficients_poly2'] = None
+                element['analysis_state']['fit_results']['r_squared'] = None
+                element['analysis_state']['fit_results']['derived_scale_m_per_px'] = None
+        if self._defining_element_first_point_data is not None:
+            f_idx, _t, x, y = self._defining_element_first_point_data
+            self._defining_element_first_point_data = (f_idx, float(frame_to_time_ms(f_idx)), x, y)
+        if changed_points:
+            self._clear_last_action() # An undo would restore a point with its old time
+            self.activeElementDataChanged.emit(); self.elementListChanged.emit()
+        return changed_points
+
     def find_closest_visible_track_element_index(self, click_x: float, click_y: float, current_frame_index: int) -> int:
         # ... (existing logic) ...
         min_dist_sq = config.CLICK_TOLERANCE_SQ; closest_element_index = -1
@@ -893,7 +930,8 @@ class ElementManager(QtCore.QObject):
                                         video_width: int,
                                         video_height: int,
                                         video_frame_count: int,
-                                        video_fps: float
+                                        video_fps: float,
+                                        frame_to_time_ms: Optional[Callable[[int], float]] = None
                                        ) -> Tuple[bool, List[str]]:
         """
         Loads elements from a list of dictionaries (typically from a JSON project file).
@@ -905,6 +943,9 @@ class ElementManager(QtCore.QObject):
             video_height: Height of the current video for validating point coordinates.
             video_frame_count: Total frames in the current video for validation.
             video_fps: FPS of the current video for optional time consistency checks.
+            frame_to_time_ms: Optional frame index -> time (ms) mapping for the time
+                              consistency checks, used instead of video_fps when the
+                              video's per-frame timestamps are known.
 
         Returns:
             Tuple[bool, List[str]]: A tuple containing a success boolean and a list
@@ -1002,7 +1043,7 @@ class ElementManager(QtCore.QObject):
                         warnings.append(f"{point_description}: Y-coordinate ({y_tl_px:.2f}) out of video height [0, {video_height-1}]. Skipped.")
                         is_valid_point = False
                     if is_valid_point and video_fps > 0: 
-                        expected_time_ms = (frame_idx / video_fps) * 1000.0
+                        expected_time_ms = frame_to_time_ms(frame_idx) if frame_to_time_ms else (frame_idx / video_fps) * 1000.0
                         if abs(time_ms - expected_time_ms) > time_tolerance_ms:
                             warnings.append(f"{point_description}: Time ({time_ms:.1f}ms) seems inconsistent with frame index and FPS (expected ~{expected_time_ms:.1f}ms). Using file time.")
                 
@@ -325,7 +325,7 @@ class ExportHandler(QtCore.QObject):
         total_frames_str = str(self._video_handler.total_frames) if self._video_handler.total_frames > 0 else "-"
         current_frame_str = str(current_frame_index + 1) if current_frame_index >= 0 else "-"
         frame_display_text = f"Frame: {current_frame_str} / {total_frames_str}"
-        current_time_ms_val = (current_frame_index / self._video_handler.fps) * 1000 if self._video_handler.fps > 0 else 0.0
+        current_time_ms_val = self._video_handler.frame_index_to_time_ms(current_frame_index) if self._video_handler.fps > 0 else 0.0
         total_time_ms_val = self._video_handler.total_duration_ms
         time_display_text = f"Time: {self._format_time_for_export(current_time_ms_val)} / {self._format_time_for_export(total_time_ms_val)}"
 
@@ -420,7 +420,7 @@ class ExportHandler(QtCore.QObject):
             
             processed_clip_frames = 0 # Counter for frames processed in the current clip export
 
-            for original_frame_idx in range(start_frame_idx, end_frame_idx + 1):
+            for original_frame_idx, raw_cv_frame in self._video_handler.iter_frames(start_frame_idx, end_frame_idx, parallel=True):
                 if self._main_window._export_progress_dialog and self._main_window._export_progress_dialog.wasCanceled():
                     export_cancelled = True
                     break
@@ -431,7 +431,6 @@ class ExportHandler(QtCore.QObject):
                 self.exportProgress.emit(progress_msg, processed_clip_frames, num_frames_in_clip)
                 QtWidgets.QApplication.processEvents()
 
-                raw_cv_frame = self._video_handler.get_raw_frame_at_index(original_frame_idx)
                 source_qimage_for_drawing: Optional[QtGui.QImage] = None
                 if raw_cv_frame is not None:
                     h_raw, w_raw = raw_cv_frame.shape[:2]
@@ -0,0 +1,59 @@
+# ffmpeg_frame_check.py
+"""
+Checks that the ffmpeg decoder backend seeks to the same frames as OpenCV.
+
+Usage:
+    python ffmpeg_frame_check.py VIDEO [--frames N] [--samples K] [--threads T]
+
+Seeks the ffmpeg backend to K frames spread over the first N and compares each
+with the frame OpenCV decodes sequentially at that index. Uses the timestamp
+index from the video's sidecar when one has been built, as the application
+does for variable-frame-rate videos. Exits with status 1 if any frame differs.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+import numpy as np
+
+import video_index
+from ffmpeg_source import check_frame_accuracy, ffmpeg_available, probe_video
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("video")
+    parser.add_argument("--frames", type=int, default=300, help="Check frames within the first N (default: 300)")
+    parser.add_argument("--samples", type=int, default=12, help="Frames to check (default: 12)")
+    parser.add_argument("--threads", type=int, default=0, help="ffmpeg decoder threads (default: auto)")
+    args = parser.parse_args(argv)
+
+    if not ffmpeg_available():
+        print("ffmpeg and ffprobe were not found on PATH.", file=sys.stderr)
+        return 1
+    info = probe_video(args.video)
+    if info is None or info["frame_count"] <= 0:
+        print(f"Could not probe '{args.video}'.", file=sys.stderr)
+        return 1
+    last_index = min(args.frames, info["frame_count"]) - 1
+    # Checked in reverse so every read needs a backward seek.
+    frame_indices = sorted({int(i) for i in np.linspace(1, last_index, max(1, args.samples))}, reverse=True)
+    frame_times_ms = None if info["is_cfr"] else \
+        video_index.load_index_section(args.video, video_index.SECTION_FRAME_TIMES)
+
+    print(f"{os.path.basename(args.video)}: {info['frame_count']} frames, FPS {info['fps']:g} "
+          f"({'constant' if info['is_cfr'] else 'variable'}), timestamp index {'yes' if frame_times_ms is not None else 'no'}")
+    mismatches = check_frame_accuracy(args.video, frame_indices, args.threads, frame_times_ms)
+    for frame_index in sorted(frame_indices):
+        if frame_index not in mismatches:
+            result = "ok"
+        elif mismatches[frame_index] is None:
+            result = "MISMATCH (no matching OpenCV frame)"
+        else:
+            result = f"MISMATCH (matches OpenCV frame {frame_index + mismatches[frame_index]})"
+        print(f"{frame_index:>8} {result}")
+    print(f"{len(frame_indices) - len(mismatches)} of {len(frame_indices)} frames match.")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+# ffmpeg_source.py
+"""
+Video decoding through a local ffmpeg binary.
+
+FFmpegPipeCapture runs ffmpeg as a subprocess and reads raw frames from its
+stdout pipe. Unlike cv2.VideoCapture it lets us choose the decoder thread
+count and have ffmpeg crop, scale and convert to grayscale before frames
+reach Python. Seeks restart ffmpeg with an input-side -ss, which decodes
+from the preceding keyframe and discards frames up to the exact target.
+The seek time comes from the nominal frame rate for constant-frame-rate
+streams and from the timestamp index for variable-frame-rate ones; without
+either, ffmpeg restarts at frame 0 and decodes forward to the target.
+"""
+import functools
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2 # type: ignore
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+BACKEND_OPENCV = "opencv"
+BACKEND_FFMPEG = "ffmpeg"
+
+# Output pixel formats: ffmpeg name -> (channels, numpy dtype)
+PIXEL_FORMATS = {
+    "bgr24": (3, np.uint8),
+    "gray": (1, np.uint8),
+    "gray16le": (1, np.dtype("<u2")),
+}
+
+def subprocess_flags() -> int:
+    # Keep ffmpeg from flashing a console window on Windows.
+    return getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+
+def ffmpeg_available() -> bool:
+    """True if both the ffmpeg and ffprobe executables can be found."""
+    return shutil.which(config.FFMPEG_EXECUTABLE) is not None and shutil.which(config.FFPROBE_EXECUTABLE) is not None
+
+@functools.lru_cache(maxsize=1)
+def passthrough_arguments() -> Tuple[str, str]:
+    """
+    Output option keeping every decoded frame exactly once. -fps_mode replaced
+    the deprecated -vsync in ffmpeg 5.1; older builds only understand -vsync.
+    Development builds without a release number are assumed to be recent.
+    """
+    try:
+        result = subprocess.run([config.FFMPEG_EXECUTABLE, "-hide_banner", "-version"], capture_output=True,
+                                timeout=10, creationflags=subprocess_flags())
+        first_line = result.stdout.decode("utf-8", errors="replace").partition("\n")[0]
+    except (OSError, subprocess.SubprocessError):
+        return ("-fps_mode", "passthrough")
+    match = re.match(r"ffmpeg version n?(\d+)\.(\d+)", first_line)
+    if match and (int(match.group(1)), int(match.group(2))) < (5, 1):
+        return ("-vsync", "passthrough")
+    return ("-fps_mode", "passthrough")
+
+def _parse_rate(rate: Optional[str]) -> float:
+    try:
+        numerator, _, denominator = (rate or "").partition("/")
+        value = float(numerator) / float(denominator or 1)
+        return value if value > 0 else 0.0
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+def probe_video(filepath: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns width, height, fps, frame_count and is_cfr of the first video stream,
+    or None. is_cfr is True when the stream's average and base frame rates agree,
+    i.e. frame n is presented at n / fps.
+    """
+    command = [config.FFPROBE_EXECUTABLE, "-v", "error", "-select_streams", "v:0",
+               "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate,nb_frames,duration:format=duration",
+               "-of", "json", filepath]
+    try:
+        result = subprocess.run(command, capture_output=True, check=True, timeout=30,
+                                creationflags=subprocess_flags())
+        info = json.loads(result.stdout.decode("utf-8", errors="replace"))
+        stream = info["streams"][0]
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError) as e:
+        logger.error(f"ffprobe failed for '{os.path.basename(filepath)}': {e}")
+        return None
+    average_fps, base_fps = _parse_rate(stream.get("avg_frame_rate")), _parse_rate(stream.get("r_frame_rate"))
+    fps = average_fps or base_fps
+    is_cfr = average_fps > 0 and abs(average_fps - base_fps) <= 1e-3 * average_fps
+    frame_count = int(stream.get("nb_frames") or 0)
+    if frame_count <= 0:
+        duration = float(stream.get("duration") or info.get("format", {}).get("duration") or 0.0)
+        frame_count = int(round(duration * fps)) if fps > 0 else 0
+    return {"width": int(stream.get("width") or 0), "height": int(stream.get("height") or 0),
+            "fps": fps, "frame_count": frame_count, "is_cfr": is_cfr}
+
+
+class FFmpegPipeCapture:
+    """
+    cv2.VideoCapture-compatible reader backed by an ffmpeg subprocess.
+
+    Args:
+        filepath: Video file to decode.
+        threads: Decoder thread count passed to ffmpeg (0 lets ffmpeg decide).
+        pixel_format: One of PIXEL_FORMATS. read() returns (h, w, 3) uint8 for
+                      bgr24 and single-channel frames for the gray formats.
+        crop: Optional (x, y, width, height) crop applied by ffmpeg.
+        scale: Optional (width, height) output size, applied after cropping.
+
+    grab() still decodes (ffmpeg cannot skip frames in a pipe) but skips
+    copying the frame out. set(CAP_PROP_POS_FRAMES) is exact and lazy: ffmpeg
+    is restarted at the new position on the next read. Variable-frame-rate
+    streams need set_frame_times() for that restart to seek by timestamp;
+    until then it decodes forward from frame 0.
+    """
+
+    def __init__(self,
+                 filepath: str,
+                 threads: int = 0,
+                 pixel_format: str = "bgr24",
+                 crop: Optional[Tuple[int, int, int, int]] = None,
+                 scale: Optional[Tuple[int, int]] = None) -> None:
+        self._filepath = filepath
+        self._threads = max(0, int(threads))
+        self._pixel_format = pixel_format
+        self._crop = crop
+        self._scale = scale
+        self._process: Optional[subprocess.Popen] = None
+        self._position = 0 # Index of the frame the next read() returns
+        self._opened = False
+        self._fps = 0.0
+        self._frame_count = 0
+        self._is_cfr = False
+        self._frame_times_s: Optional[np.ndarray] = None # Presentation time of each frame, for VFR seeks
+        self._width = 0 # Output size (after crop and scale)
+        self._height = 0
+        self.applies_profile = False # Set when ffmpeg already crops/converts for a decode profile
+        if pixel_format not in PIXEL_FORMATS:
+            logger.error(f"Unsupported ffmpeg output pixel format '{pixel_format}'.")
+            return
+        info = probe_video(filepath)
+        if info is None or info["width"] <= 0 or info["height"] <= 0:
+            return
+        self._fps = info["fps"]
+        self._frame_count = info["frame_count"]
+        self._is_cfr = info["is_cfr"]
+        self._width, self._height = info["width"], info["height"]
+        if crop is not None:
+            self._width, self._height = int(crop[2]), int(crop[3])
+        if scale is not None:
+            self._width, self._height = int(scale[0]), int(scale[1])
+        channels, dtype = PIXEL_FORMATS[pixel_format]
+        self._frame_shape = (self._height, self._width, channels) if channels > 1 else (self._height, self._width)
+        self._dtype = np.dtype(dtype)
+        self._frame_bytes = int(np.prod(self._frame_shape)) * self._dtype.itemsize
+        self._scratch = bytearray(self._frame_bytes) # Target of grab(); never handed out
+        self._opened = True
+        logger.info(f"FFmpeg decoder for '{os.path.basename(filepath)}': {self._frame_count} frames, "
+                    f"{self._width}x{self._height} {pixel_format}, FPS {self._fps:g}{'' if self._is_cfr else ' (variable)'}, "
+                    f"threads {self._threads or 'auto'}.")
+
+    # --- cv2.VideoCapture interface ---
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        frame = np.empty(self._frame_shape, dtype=self._dtype) if self._opened else None
+        if frame is None or not self._read_into(memoryview(frame).cast("B")):
+            return False, None
+        return True, frame.astype(self._dtype.newbyteorder("="), copy=False) # No-op on little-endian hosts
+
+    def grab(self) -> bool:
+        return self._opened and self._read_into(memoryview(self._scratch))
+
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id != cv2.CAP_PROP_POS_FRAMES or not self._opened:
+            return False
+        target = max(0, min(int(value), self._frame_count))
+        if target != self._position or self._process is None:
+            self._stop_process()
+            self._position = target
+        return True
+
+    def get(self, prop_id: int) -> float:
+        values = {
+            cv2.CAP_PROP_FRAME_COUNT: self._frame_count,
+            cv2.CAP_PROP_FPS: self._fps,
+            cv2.CAP_PROP_FRAME_WIDTH: self._width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self._height,
+            cv2.CAP_PROP_POS_FRAMES: self._position,
+            cv2.CAP_PROP_POS_MSEC: (self._position * 1000.0 / self._fps) if self._fps > 0 else 0.0,
+        }
+        return float(values.get(prop_id, 0.0))
+
+    def release(self) -> None:
+        self._stop_process()
+        self._opened = False
+
+    # --- Extras ---
+
+    @property
+    def is_cfr(self) -> bool:
+        return self._is_cfr
+
+    @property
+    def needs_frame_times(self) -> bool:
+        """True if seeks need set_frame_times() to be exact (a variable-frame-rate stream without them)."""
+        return not self._is_cfr and self._frame_times_s is None
+
+    @property
+    def seeks_exactly(self) -> bool:
+        """
+        True if a seek restarts ffmpeg at the target's timestamp, so cursors should
+        seek straight to the target rather than via the keyframe index.
+        """
+        return not self.needs_frame_times
+
+    def set_frame_times(self, frame_times_ms: Optional[np.ndarray]) -> None:
+        """Sets the per-frame presentation times (ms from frame 0, see video_index.scan_frame_times) used for seeking."""
+        self._frame_times_s = np.asarray(frame_times_ms, dtype=np.float64) / 1000.0 if frame_times_ms is not None else None
+        self._stop_process() # The next read seeks with the new times
+
+    # --- Internal helpers ---
+
+    def _seek_time_s(self) -> Optional[float]:
+        """Input -ss time that lands on the current position, or None if it cannot be computed exactly."""
+        if self._position == 0:
+            return 0.0
+        # Halfway to the previous frame, so rounding can never skip the target frame.
+        if self._frame_times_s is not None and self._position < self._frame_times_s.size:
+            return float(self._frame_times_s[self._position - 1] + self._frame_times_s[self._position]) / 2.0
+        if self._is_cfr and self._fps > 0:
+            return (self._position - 0.5) / self._fps
+        return None
+
+    def _command(self, seek_time_s: float) -> list:
+        command = [config.FFMPEG_EXECUTABLE, "-hide_banner", "-loglevel", "error", "-nostdin"]
+        if self._threads > 0:
+            command += ["-threads", str(self._threads)]
+        if seek_time_s > 0:
+            command += ["-ss", f"{seek_time_s:.6f}"]
+        command += ["-i", self._filepath, "-map", "0:v:0", "-an", "-sn", "-dn"]
+        filters = []
+        if self._crop is not None:
+            x, y, w, h = self._crop
+            filters.append(f"crop={w}:{h}:{x}:{y}")
+        if self._scale is not None:
+            filters.append(f"scale={self._scale[0]}:{self._scale[1]}:flags=area")
+        if filters:
+            command += ["-vf", ",".join(filters)]
+        # passthrough: never duplicate or drop frames, so pipe frame n is file frame n.
+        command += [*passthrough_arguments(), "-f", "rawvideo", "-pix_fmt", self._pixel_format, "-"]
+        return command
+
+    def _start_process(self) -> bool:
+        seek_time_s = self._seek_time_s()
+        command = self._command(seek_time_s or 0.0)
+        logger.debug(f"Starting ffmpeg at frame {self._position}: {' '.join(command)}")
+        try:
+            self._process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                             stdin=subprocess.DEVNULL, bufsize=0, # Unbuffered: readinto() fills frames directly
+                                             creationflags=subprocess_flags())
+        except OSError as e:
+            logger.error(f"Could not start ffmpeg: {e}")
+            self._process = None
+            return False
+        if seek_time_s is None:
+            # No exact timestamp for the target: decode forward from frame 0.
+            logger.debug(f"Variable frame rate without a timestamp index: decoding {self._position} frames to reach the target.")
+            for _ in range(self._position):
+                if not self._fill(memoryview(self._scratch)):
+                    return False
+        return True
+
+    def _stop_process(self) -> None:
+        if self._process is None:
+            return
+        try:
+            self._process.kill()
+            self._process.stdout.close()
+            self._process.wait(timeout=2.0)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"Error stopping ffmpeg: {e}")
+        self._process = None
+
+    def _read_into(self, buffer: memoryview) -> bool:
+        if self._position >= self._frame_count:
+            return False
+        if self._process is None and not self._start_process():
+            return False
+        if not self._fill(buffer):
+            return False
+        self._position += 1
+        return True
+
+    def _fill(self, buffer: memoryview) -> bool:
+        """Reads the next frame from the pipe into buffer. Stops ffmpeg at the end of the stream."""
+        filled = 0
+        while filled < self._frame_bytes:
+            count = self._process.stdout.readinto(buffer[filled:])
+            if not count:
+                logger.debug(f"ffmpeg stream ended at frame {self._position}.")
+                self._stop_process()
+                return False
+            filled += count
+        return True
+
+
+def open_ffmpeg_capture(filepath: str,
+                        threads: int = 0,
+                        profile: Optional[Any] = None) -> FFmpegPipeCapture:
+    """
+    Opens filepath with ffmpeg. With a DecodeProfile, ffmpeg performs the crop
+    and (8-bit) grayscale conversion itself; 16-bit output is not requested
+    because the analysis path only offers it for image sequences.
+    """
+    if profile is None:
+        return FFmpegPipeCapture(filepath, threads)
+    pixel_format = "gray" if profile.is_gray else "bgr24"
+    capture = FFmpegPipeCapture(filepath, threads, pixel_format=pixel_format, crop=profile.roi)
+    capture.applies_profile = True
+    return capture
+
+
+def check_frame_accuracy(filepath: str,
+                         frame_indices: List[int],
+                         threads: int = 0,
+                         frame_times_ms: Optional[np.ndarray] = None) -> Dict[int, Optional[int]]:
+    """
+    Checks that seeking the ffmpeg backend returns the same frames as decoding
+    sequentially with OpenCV. Each frame is compared (as grayscale) with the
+    OpenCV frames at the same index and its two neighbours.
+
+    Returns {frame_index: offset} for every checked frame whose best match is
+    not the same index: offset is the neighbour it matched (-1 or +1), or None
+    if no OpenCV frame is within config.FFMPEG_ACCURACY_MAX_MEAN_DIFF. An empty
+    dict means every frame matched.
+    """
+    wanted = {i for index in frame_indices for i in (index - 1, index, index + 1) if i >= 0}
+    reference: Dict[int, np.ndarray] = {}
+    capture = cv2.VideoCapture(filepath)
+    try:
+        for index in range(max(wanted) + 1 if wanted else 0):
+            if not capture.grab():
+                break
+            if index in wanted:
+                ok, frame = capture.retrieve()
+                if ok:
+                    reference[index] = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY).astype(np.float32)
+    finally:
+        capture.release()
+
+    ffmpeg_capture = FFmpegPipeCapture(filepath, threads, pixel_format="gray")
+    if frame_times_ms is not None:
+        ffmpeg_capture.set_frame_times(frame_times_ms)
+    mismatches: Dict[int, Optional[int]] = {}
+    try:
+        for index in frame_indices:
+            if index not in reference:
+                continue
+            ffmpeg_capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+            ok, frame = ffmpeg_capture.read()
+            if not ok:
+                mismatches[index] = None
+                continue
+            differences = {offset: float(np.mean(np.abs(frame.astype(np.float32) - reference[index + offset])))
+                           for offset in (-1, 0, 1) if index + offset in reference}
+            best_offset = min(differences, key=differences.get)
+            if differences[best_offset] > config.FFMPEG_ACCURACY_MAX_MEAN_DIFF:
+                mismatches[index] = None
+            elif best_offset != 0:
+                mismatches[index] = best_offset
+    finally:
+        ffmpeg_capture.release()
+    return mismatches
@@ -0,0 +1,107 @@
+# frame_cache.py
+"""
+Byte-budgeted LRU cache of decoded video frames, shared by the display,
+kymograph and export paths through VideoHandler.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class FrameCache:
+    """
+    Least-recently-used cache of decoded frames keyed by 0-based frame index.
+
+    The budget is expressed in bytes rather than frames because frame sizes vary
+    by several orders of magnitude between clips (a 4K frame is ~25 MB).
+    Cached arrays are marked read-only, as the same array is handed to every
+    consumer. All methods are thread-safe.
+    """
+
+    def __init__(self, budget_bytes: int = 0) -> None:
+        self._frames: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._budget_bytes: int = max(0, int(budget_bytes))
+        self._current_bytes: int = 0
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    def get(self, frame_index: int) -> Optional[np.ndarray]:
+        """Returns the cached frame and marks it most recently used, or None on a miss."""
+        with self._lock:
+            frame = self._frames.get(frame_index)
+            if frame is None:
+                self._misses += 1
+                return None
+            self._frames.move_to_end(frame_index)
+            self._hits += 1
+            return frame
+
+    def put(self, frame_index: int, frame: np.ndarray) -> None:
+        """Stores a frame, evicting least-recently-used frames to stay within the budget."""
+        frame_bytes = frame.nbytes
+        if frame_bytes > self._budget_bytes:
+            return
+        frame.flags.writeable = False
+        with self._lock:
+            previous = self._frames.pop(frame_index, None)
+            if previous is not None:
+                self._current_bytes -= previous.nbytes
+            self._frames[frame_index] = frame
+            self._current_bytes += frame_bytes
+            self._evict_to_budget()
+
+    def contains(self, frame_index: int) -> bool:
+        """Checks for a cached frame without affecting LRU order or counters."""
+        with self._lock:
+            return frame_index in self._frames
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._current_bytes = 0
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def set_budget(self, budget_bytes: int) -> None:
+        with self._lock:
+            self._budget_bytes = max(0, int(budget_bytes))
+            self._evict_to_budget()
+        logger.info(f"Frame cache budget set to {self._budget_bytes / (1024 * 1024):.0f} MB.")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "frames": len(self._frames),
+                "bytes": self._current_bytes,
+                "budget_bytes": self._budget_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": (self._hits / lookups) if lookups > 0 else 0.0,
+            }
+
+    def _evict_to_budget(self) -> None:
+        # Caller must hold self._lock.
+        while self._frames and self._current_bytes > self._budget_bytes:
+            _evicted_index, evicted_frame = self._frames.popitem(last=False)
+            self._current_bytes -= evicted_frame.nbytes
+            self._evictions += 1
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget_bytes
+
+    @property
+    def current_bytes(self) -> int:
+        return self._current_bytes
@@ -0,0 +1,226 @@
+# frame_prefetcher.py
+"""
+Background read-ahead of video frames for playback and frame stepping.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Any
+
+import numpy as np
+
+from video_index import keyframe_at_or_before
+
+logger = logging.getLogger(__name__)
+
+class FramePrefetcher:
+    """
+    Decodes frames ahead of the playhead on a worker thread into a bounded buffer.
+    With a stride above 1 (fast playback), only every stride-th frame is
+    decoded into the buffer; the cursor grabs over the frames in between.
+
+    The worker owns its own decoder (created through cursor_factory on the worker
+    thread), so it never touches the capture used by the GUI thread. Frames are
+    decoded in the current read-ahead direction starting at an anchor index; the
+    GUI thread pops them with take() and moves the anchor with retarget().
+
+    Backward read-ahead decodes in chunks: the worker seeks to the start of the
+    chunk (the keyframe of the target's GOP when the cursor knows its keyframes),
+    decodes forward once up to the target, and buffers the whole chunk for the
+    GUI to take in reverse. Stepping backward then costs O(1) decodes per frame
+    on average instead of a seek and O(GOP) decodes per frame. Chunks hold up
+    to reverse_chunk_frames buffered frames, which may exceed depth.
+
+    The cursor returned by cursor_factory must provide read_frame(index) and
+    release(), and may provide a keyframes array.
+    """
+
+    def __init__(self,
+                 cursor_factory: Callable[[], Optional[Any]],
+                 total_frames: int,
+                 depth: int,
+                 reverse_chunk_frames: int = 0) -> None:
+        self._cursor_factory = cursor_factory
+        self._total_frames = total_frames
+        self._depth = max(1, depth)
+        self._reverse_chunk_frames = max(self._depth, reverse_chunk_frames)
+
+        self._condition = threading.Condition()
+        self._buffer: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._next_index: int = 0
+        self._chunk_start: int = -1 # Lowest frame of the backward chunk being decoded, or -1
+        self._direction: int = 1
+        self._stride: int = 1
+        self._generation: int = 0 # Incremented on every retarget to discard in-flight results
+        self._exhausted: bool = False # True when the worker ran off the video or failed to decode
+        self._stop_requested: bool = False
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Public API (GUI thread) ---
+
+    def retarget(self, anchor_index: int, direction: int, stride: int = 1) -> None:
+        """
+        Points the read-ahead at anchor_index, moving in direction (+1 or -1)
+        by stride frames at a time. Buffered frames that are still ahead of the
+        anchor are kept.
+        """
+        direction = 1 if direction >= 0 else -1
+        stride = max(1, int(stride))
+        with self._condition:
+            if direction == self._direction and stride == self._stride and self._is_within_window(anchor_index):
+                self._drop_behind(anchor_index)
+            else:
+                self._buffer.clear()
+                self._next_index = anchor_index
+                self._chunk_start = -1
+                self._direction = direction
+                self._stride = stride
+                self._generation += 1
+                self._exhausted = False
+            self._condition.notify_all()
+        self._ensure_thread()
+
+    def take(self, frame_index: int, timeout_s: float = 0.0) -> Optional[np.ndarray]:
+        """
+        Pops the frame at frame_index if it has been prefetched. When the frame is
+        the one currently being decoded or queued next, waits up to timeout_s for it.
+        Frames behind frame_index in the read-ahead direction are discarded.
+        """
+        with self._condition:
+            if frame_index not in self._buffer and timeout_s > 0 and self._is_pending(frame_index):
+                self._condition.wait_for(
+                    lambda: frame_index in self._buffer or self._exhausted or self._stop_requested or
+                            not self._is_pending(frame_index),
+                    timeout=timeout_s)
+            frame = self._buffer.pop(frame_index, None)
+            self._drop_behind(frame_index)
+            self._condition.notify_all()
+            return frame
+
+    def stop(self) -> None:
+        """Stops the worker thread and releases its decoder."""
+        with self._condition:
+            self._stop_requested = True
+            self._buffer.clear()
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            if self._thread.is_alive():
+                logger.warning("Frame prefetch thread did not stop within timeout.")
+        self._thread = None
+
+    def is_pending(self, frame_index: int) -> bool:
+        """True if frame_index is buffered or will be decoded without a retarget."""
+        with self._condition:
+            return frame_index in self._buffer or self._is_pending(frame_index)
+
+    @property
+    def direction(self) -> int:
+        return self._direction
+
+    # --- Internal helpers ---
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_requested = False
+        self._thread = threading.Thread(target=self._run, name="FramePrefetcher", daemon=True)
+        self._thread.start()
+        logger.debug("Frame prefetch thread started.")
+
+    def _is_within_window(self, frame_index: int) -> bool:
+        # Caller must hold self._condition. True if frame_index lies between the
+        # oldest buffered frame and the next frame the worker will decode.
+        oldest = next(iter(self._buffer), self._next_index)
+        if self._direction > 0:
+            return oldest <= frame_index <= self._next_index
+        lowest = min(self._next_index, self._chunk_start) if self._chunk_start >= 0 else self._next_index
+        return lowest <= frame_index <= oldest
+
+    def _is_pending(self, frame_index: int) -> bool:
+        # Caller must hold self._condition.
+        return not self._exhausted and self._is_within_window(frame_index) and \
+               (frame_index - self._next_index) % self._stride == 0
+
+    def _drop_behind(self, frame_index: int) -> None:
+        # Caller must hold self._condition.
+        stale = [idx for idx in self._buffer
+                 if (idx < frame_index if self._direction > 0 else idx > frame_index)]
+        for idx in stale:
+            del self._buffer[idx]
+
+    def _has_work(self) -> bool:
+        # Caller must hold self._condition.
+        return (not self._exhausted and
+                len(self._buffer) < self._depth and
+                0 <= self._next_index < self._total_frames)
+
+    def _run(self) -> None:
+        cursor = self._cursor_factory()
+        if cursor is None:
+            logger.error("Frame prefetcher could not open its own decoder. Prefetching disabled.")
+            with self._condition:
+                self._exhausted = True
+                self._condition.notify_all()
+            return
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._stop_requested or self._has_work())
+                    if self._stop_requested:
+                        break
+                    target_index = self._next_index
+                    direction, stride = self._direction, self._stride
+                    generation = self._generation
+                    if direction < 0:
+                        self._chunk_start = self._backward_chunk_start(cursor, target_index, stride)
+                if direction < 0:
+                    decoded = self._decode_backward_chunk(cursor, target_index, stride, generation)
+                else:
+                    frame = cursor.read_frame(target_index)
+                    decoded = [(target_index, frame)] if frame is not None else []
+                with self._condition:
+                    if generation != self._generation:
+                        continue # Retargeted while decoding; result is stale.
+                    self._chunk_start = -1
+                    if not decoded:
+                        logger.debug(f"Prefetcher could not decode frame {target_index}; pausing read-ahead.")
+                        self._exhausted = True
+                    else:
+                        for frame_index, frame in decoded: # In read-ahead order
+                            self._buffer[frame_index] = frame
+                        self._next_index = decoded[-1][0] + direction * stride
+                    self._condition.notify_all()
+        except Exception as e:
+            logger.exception(f"Frame prefetch thread failed: {e}")
+        finally:
+            cursor.release()
+            logger.debug("Frame prefetch thread exited and released its decoder.")
+
+    def _backward_chunk_start(self, cursor: Any, target_index: int, stride: int) -> int:
+        start = max(0, target_index - (self._reverse_chunk_frames - 1) * stride)
+        keyframes = getattr(cursor, "keyframes", None)
+        if keyframes is not None and keyframes.size > 0:
+            start = max(start, keyframe_at_or_before(keyframes, target_index)) # Never decode past a GOP boundary twice
+        return start
+
+    def _decode_backward_chunk(self, cursor: Any, target_index: int, stride: int, generation: int) -> list:
+        """
+        Decodes the chunk ending at target_index forward, keeping every stride-th
+        frame counting back from the target. Returns [(index, frame)] from the
+        target downwards, or [] if decoding failed or the read-ahead was retargeted.
+        """
+        chunk_start = self._backward_chunk_start(cursor, target_index, stride)
+        first_index = target_index - ((target_index - chunk_start) // stride) * stride
+        decoded = []
+        for frame_index in range(first_index, target_index + 1, stride):
+            with self._condition:
+                if self._stop_requested or generation != self._generation:
+                    return []
+            frame = cursor.read_frame(frame_index)
+            if frame is None:
+                return []
+            decoded.append((frame_index, frame))
+        decoded.reverse()
+        logger.debug(f"Decoded backward chunk {first_index}-{target_index} ({len(decoded)} frames).")
+        return decoded
@@ -0,0 +1,173 @@
+# image_sequence_dialog.py
+"""
+Dialog for choosing an image-sequence source (folder, glob pattern or frame
+stack file) together with its frame rate and, for raw dumps, its frame layout.
+"""
+import logging
+import os
+from typing import Optional, Dict, Any
+
+from PySide6 import QtCore, QtWidgets
+
+import image_sequence_source
+from image_sequence_source import RAW_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+class ImageSequenceDialog(QtWidgets.QDialog):
+    def __init__(self, parent: Optional[QtWidgets.QWidget] = None):
+        super().__init__(parent)
+        self.setWindowTitle("Open Image Sequence")
+        self.setModal(True)
+        self.setMinimumWidth(560)
+
+        self._setup_ui()
+        self._connect_signals()
+        self._update_source_status()
+
+    def _setup_ui(self):
+        main_layout = QtWidgets.QVBoxLayout(self)
+
+        # --- Source Section ---
+        source_group_box = QtWidgets.QGroupBox("Source")
+        source_layout = QtWidgets.QFormLayout(source_group_box)
+        source_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        source_layout.setHorizontalSpacing(10)
+        source_layout.setVerticalSpacing(8)
+
+        source_input_layout = QtWidgets.QHBoxLayout()
+        self.sourceLineEdit = QtWidgets.QLineEdit()
+        self.sourceLineEdit.setPlaceholderText("Folder, pattern (e.g. C:/run1/frame_*.tif) or .npy/.raw stack file")
+        self.sourceLineEdit.setToolTip("A folder of numbered images, a glob pattern, or a single file holding all frames")
+        self.browseFolderButton = QtWidgets.QPushButton("Folder...")
+        self.browseStackButton = QtWidgets.QPushButton("Stack File...")
+        source_input_layout.addWidget(self.sourceLineEdit, 1)
+        source_input_layout.addWidget(self.browseFolderButton)
+        source_input_layout.addWidget(self.browseStackButton)
+        source_layout.addRow("Frames:", source_input_layout)
+
+        self.sourceStatusLabel = QtWidgets.QLabel("")
+        source_layout.addRow("", self.sourceStatusLabel)
+
+        self.fpsSpinBox = QtWidgets.QDoubleSpinBox()
+        self.fpsSpinBox.setRange(0.001, 10_000_000.0)
+        self.fpsSpinBox.setDecimals(3)
+        self.fpsSpinBox.setValue(30.0)
+        self.fpsSpinBox.setToolTip("Acquisition frame rate of the camera (frames per second)")
+        source_layout.addRow("Frame Rate (FPS):", self.fpsSpinBox)
+
+        self.bitDepthComboBox = QtWidgets.QComboBox()
+        self.bitDepthComboBox.addItem("Container Depth", 0)
+        for bits in (10, 12, 14):
+            self.bitDepthComboBox.addItem(f"{bits}-bit", bits)
+        self.bitDepthComboBox.setToolTip("Significant bits of 16-bit samples, used to scale them for display "
+                                         "(e.g. 12 for 12-bit camera data stored in 16-bit files)")
+        source_layout.addRow("Significant Bits:", self.bitDepthComboBox)
+        main_layout.addWidget(source_group_box)
+
+        # --- Raw Layout Section ---
+        self.rawGroupBox = QtWidgets.QGroupBox("Raw Frame Layout")
+        raw_layout = QtWidgets.QFormLayout(self.rawGroupBox)
+        raw_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        raw_layout.setHorizontalSpacing(10)
+        raw_layout.setVerticalSpacing(8)
+
+        self.rawWidthSpinBox = QtWidgets.QSpinBox()
+        self.rawWidthSpinBox.setRange(1, 65535)
+        self.rawWidthSpinBox.setValue(1024)
+        raw_layout.addRow("Width (px):", self.rawWidthSpinBox)
+        self.rawHeightSpinBox = QtWidgets.QSpinBox()
+        self.rawHeightSpinBox.setRange(1, 65535)
+        self.rawHeightSpinBox.setValue(1024)
+        raw_layout.addRow("Height (px):", self.rawHeightSpinBox)
+        self.rawChannelsComboBox = QtWidgets.QComboBox()
+        self.rawChannelsComboBox.addItem("1 (Monochrome)", 1)
+        self.rawChannelsComboBox.addItem("3 (RGB)", 3)
+        raw_layout.addRow("Channels:", self.rawChannelsComboBox)
+        self.rawDtypeComboBox = QtWidgets.QComboBox()
+        self.rawDtypeComboBox.addItem("8-bit", "uint8")
+        self.rawDtypeComboBox.addItem("16-bit (little-endian)", "uint16")
+        raw_layout.addRow("Sample Depth:", self.rawDtypeComboBox)
+        self.rawHeaderSpinBox = QtWidgets.QSpinBox()
+        self.rawHeaderSpinBox.setRange(0, 1_000_000_000)
+        self.rawHeaderSpinBox.setToolTip("Bytes to skip at the start of each raw file")
+        raw_layout.addRow("Header Bytes:", self.rawHeaderSpinBox)
+        main_layout.addWidget(self.rawGroupBox)
+
+        # --- Dialog Buttons ---
+        self.buttonBox = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.StandardButton.Ok | QtWidgets.QDialogButtonBox.StandardButton.Cancel
+        )
+        open_button = self.buttonBox.button(QtWidgets.QDialogButtonBox.StandardButton.Ok)
+        open_button.setText("Open")
+        open_button.setAutoDefault(True)
+        main_layout.addWidget(self.buttonBox)
+
+    def _connect_signals(self):
+        self.sourceLineEdit.textChanged.connect(self._update_source_status)
+        self.browseFolderButton.clicked.connect(self._browse_folder)
+        self.browseStackButton.clicked.connect(self._browse_stack_file)
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    @QtCore.Slot()
+    def _browse_folder(self):
+        folder = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Image Sequence Folder", self.sourceLineEdit.text())
+        if folder:
+            self.sourceLineEdit.setText(folder)
+
+    @QtCore.Slot()
+    def _browse_stack_file(self):
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Select Frame Stack File", self.sourceLineEdit.text(),
+            "Frame Stacks (*.npy *.raw *.bin);;All Files (*)")
+        if file_path:
+            self.sourceLineEdit.setText(file_path)
+
+    def _is_raw_source(self) -> bool:
+        source = self.get_source()
+        if not source:
+            return False
+        if os.path.isfile(source):
+            return source.lower().endswith(RAW_EXTENSIONS)
+        files = image_sequence_source.list_sequence_files(source)
+        return bool(files) and files[0].lower().endswith(RAW_EXTENSIONS)
+
+    @QtCore.Slot()
+    def _update_source_status(self):
+        source = self.get_source()
+        ok_button = self.buttonBox.button(QtWidgets.QDialogButtonBox.StandardButton.Ok)
+        if not source:
+            self.sourceStatusLabel.setText("")
+            ok_button.setEnabled(False)
+            self.rawGroupBox.setEnabled(False)
+            return
+        if os.path.isfile(source):
+            is_valid = source.lower().endswith(image_sequence_source.STACK_EXTENSIONS)
+            self.sourceStatusLabel.setText("Single-file frame stack." if is_valid else "Not a .npy or raw stack file.")
+        elif image_sequence_source.is_image_sequence_source(source):
+            frame_count = len(image_sequence_source.list_sequence_files(source))
+            is_valid = frame_count > 0
+            self.sourceStatusLabel.setText(f"{frame_count} image file{'s' if frame_count != 1 else ''} found.")
+        else:
+            is_valid = False
+            self.sourceStatusLabel.setText("No such folder or file.")
+        ok_button.setEnabled(is_valid)
+        self.rawGroupBox.setEnabled(is_valid and self._is_raw_source())
+
+    # --- Public Methods to Get Results ---
+    def get_source(self) -> str:
+        return self.sourceLineEdit.text().strip()
+
+    def get_sequence_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {image_sequence_source.OPTION_FPS: self.fpsSpinBox.value()}
+        if self.bitDepthComboBox.currentData():
+            options[image_sequence_source.OPTION_BIT_DEPTH] = self.bitDepthComboBox.currentData()
+        if self._is_raw_source():
+            options[image_sequence_source.OPTION_RAW_WIDTH] = self.rawWidthSpinBox.value()
+            options[image_sequence_source.OPTION_RAW_HEIGHT] = self.rawHeightSpinBox.value()
+            options[image_sequence_source.OPTION_RAW_CHANNELS] = self.rawChannelsComboBox.currentData()
+            options[image_sequence_source.OPTION_RAW_DTYPE] = self.rawDtypeComboBox.currentData()
+            options[image_sequence_source.OPTION_RAW_HEADER_BYTES] = self.rawHeaderSpinBox.value()
+        logger.debug(f"Image sequence options: {options}")
+        return options
@@ -0,0 +1,353 @@
+# image_sequence_source.py
+"""
+Image-sequence video sources: numbered TIFF/PNG/JPEG/NPY files in a directory
+or matching a glob pattern, or a single raw/.npy frame stack.
+
+ImageSequenceCapture implements the subset of the cv2.VideoCapture interface
+used by VideoHandler, so seeking, playback, kymographs and export work on
+sequences unchanged. Uncompressed frames (baseline TIFF, .npy, raw dumps) are
+memory-mapped, so random access costs a page-in rather than a decode.
+"""
+import glob
+import logging
+import os
+import re
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2 # type: ignore
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+RAW_EXTENSIONS = (".raw", ".bin")
+STACK_EXTENSIONS = (".npy",) + RAW_EXTENSIONS # Single files holding every frame
+IMAGE_EXTENSIONS = (".tif", ".tiff", ".png", ".jpg", ".jpeg", ".bmp", ".npy") + RAW_EXTENSIONS
+
+# Keys of the sequence_options dictionary
+OPTION_FPS = "fps"
+OPTION_RAW_WIDTH = "raw_width"
+OPTION_RAW_HEIGHT = "raw_height"
+OPTION_RAW_CHANNELS = "raw_channels"
+OPTION_RAW_DTYPE = "raw_dtype" # "uint8" or "uint16" (little-endian)
+OPTION_RAW_HEADER_BYTES = "raw_header_bytes" # Bytes to skip at the start of each raw file
+OPTION_BIT_DEPTH = "bit_depth" # Significant bits of integer samples (e.g. 12); 0 or absent: the container depth
+
+# TIFF tags needed to locate uncompressed pixel data
+_TIFF_IMAGE_WIDTH = 256
+_TIFF_IMAGE_LENGTH = 257
+_TIFF_BITS_PER_SAMPLE = 258
+_TIFF_COMPRESSION = 259
+_TIFF_PHOTOMETRIC = 262
+_TIFF_STRIP_OFFSETS = 273
+_TIFF_SAMPLES_PER_PIXEL = 277
+_TIFF_STRIP_BYTE_COUNTS = 279
+_TIFF_PLANAR_CONFIG = 284
+_TIFF_SAMPLE_FORMAT = 339
+_TIFF_TYPE_SIZES = {1: 1, 3: 2, 4: 4} # BYTE, SHORT, LONG
+_TIFF_TYPE_CODES = {1: "B", 3: "H", 4: "I"}
+
+def is_image_sequence_source(source: str) -> bool:
+    """True if source names a directory, a glob pattern or a single-file frame stack."""
+    is_stack = source.lower().endswith(STACK_EXTENSIONS)
+    # An existing file is a video unless it is a stack, even if its name has
+    # glob characters (e.g. "run[2].mp4").
+    if os.path.isfile(source):
+        return is_stack
+    return os.path.isdir(source) or glob.has_magic(source) or is_stack
+
+def _natural_sort_key(path: str) -> list:
+    # frame_2.tif sorts before frame_10.tif
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", os.path.basename(path))]
+
+def list_sequence_files(source: str) -> List[str]:
+    """
+    Returns the frame files of a directory or glob source in natural order.
+    For directories, only files with the most common image extension are kept,
+    so stray thumbnails or notes do not become frames.
+    """
+    if os.path.isdir(source):
+        candidates = [os.path.join(source, name) for name in os.listdir(source)]
+        candidates = [path for path in candidates if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)]
+        if candidates:
+            extensions = [os.path.splitext(path)[1].lower() for path in candidates]
+            dominant = max(set(extensions), key=extensions.count)
+            candidates = [path for path, ext in zip(candidates, extensions) if ext == dominant]
+    else:
+        candidates = [path for path in glob.glob(source) if os.path.isfile(path)]
+    return sorted(candidates, key=_natural_sort_key)
+
+def _read_tiff_tag_values(f, endian: str, type_code: int, count: int, raw_value: bytes) -> Optional[List[int]]:
+    size = _TIFF_TYPE_SIZES.get(type_code)
+    if size is None:
+        return None
+    data = raw_value
+    if size * count > 4:
+        (offset,) = struct.unpack(endian + "I", raw_value)
+        f.seek(offset)
+        data = f.read(size * count)
+    return list(struct.unpack(f"{endian}{count}{_TIFF_TYPE_CODES[type_code]}", data[:size * count]))
+
+def map_uncompressed_tiff(path: str) -> Optional[Tuple[np.ndarray, bool]]:
+    """
+    Memory-maps the first image of a baseline uncompressed 8/16-bit TIFF whose
+    strips are stored contiguously. Returns (array, is_rgb), or None if the file
+    needs a real decoder.
+    """
+    with open(path, "rb") as f:
+        header = f.read(8)
+        if len(header) < 8 or header[:2] not in (b"II", b"MM"):
+            return None
+        endian = "<" if header[:2] == b"II" else ">"
+        magic, ifd_offset = struct.unpack(endian + "HI", header[2:8])
+        if magic != 42: # BigTIFF and others go through the decoder
+            return None
+        f.seek(ifd_offset)
+        (entry_count,) = struct.unpack(endian + "H", f.read(2))
+        entries = f.read(12 * entry_count)
+        raw_tags: Dict[int, Tuple[int, int, bytes]] = {}
+        for i in range(entry_count):
+            tag, type_code, count, raw_value = struct.unpack(endian + "HHI4s", entries[i * 12:(i + 1) * 12])
+            raw_tags[tag] = (type_code, count, raw_value)
+
+        def tag(tag_id: int, default: Optional[List[int]] = None) -> Optional[List[int]]:
+            if tag_id not in raw_tags:
+                return default
+            return _read_tiff_tag_values(f, endian, *raw_tags[tag_id])
+
+        width, height = tag(_TIFF_IMAGE_WIDTH), tag(_TIFF_IMAGE_LENGTH)
+        offsets, byte_counts = tag(_TIFF_STRIP_OFFSETS), tag(_TIFF_STRIP_BYTE_COUNTS)
+        bits = tag(_TIFF_BITS_PER_SAMPLE, [1])
+        samples = (tag(_TIFF_SAMPLES_PER_PIXEL, [1]) or [1])[0]
+        photometric = (tag(_TIFF_PHOTOMETRIC, [1]) or [1])[0]
+        compression = (tag(_TIFF_COMPRESSION, [1]) or [0])[0]
+        planar_config = (tag(_TIFF_PLANAR_CONFIG, [1]) or [0])[0]
+        sample_format = (tag(_TIFF_SAMPLE_FORMAT, [1]) or [0])[0]
+    if not (width and height and offsets and byte_counts and bits) or len(offsets) != len(byte_counts):
+        return None
+    if compression != 1 or sample_format != 1 or (samples > 1 and planar_config != 1):
+        return None
+    if len(set(bits)) != 1 or bits[0] not in (8, 16) or samples not in (1, 3, 4) or photometric not in (1, 2):
+        return None
+    for i in range(len(offsets) - 1):
+        if offsets[i] + byte_counts[i] != offsets[i + 1]:
+            return None # Strips scattered through the file
+    dtype = np.dtype(endian + ("u1" if bits[0] == 8 else "u2"))
+    shape = (height[0], width[0]) if samples == 1 else (height[0], width[0], samples)
+    if int(np.prod(shape)) * dtype.itemsize > sum(byte_counts):
+        return None
+    return np.memmap(path, dtype=dtype, mode="r", offset=offsets[0], shape=shape), photometric == 2
+
+
+class ImageSequenceCapture:
+    """
+    cv2.VideoCapture-compatible reader over an image sequence.
+
+    read() returns 8-bit BGR frames like OpenCV's video backends. Data deeper
+    than 8 bits is scaled to 8 bits by one fixed factor for the whole
+    sequence, so a frame's brightness never depends on its neighbours: integer
+    samples use the container depth (the TIFF BitsPerSample or array dtype,
+    e.g. 16 bits) unless the bit_depth option names fewer significant bits
+    (e.g. 12-bit camera data in 16-bit containers); floating-point samples
+    are taken to lie in [0, 1]. Channel order: image files decoded by
+    OpenCV are BGR; TIFFs follow their photometric tag; .npy and raw data are
+    assumed to be RGB. grab() only advances the position and never touches pixel
+    data, so skipping frames is free.
+
+    For analysis passes on 16-bit data, set_native_gray16(True) makes read()
+    return single-channel uint16 frames with the original sample values.
+    """
+
+    def __init__(self, source: str, sequence_options: Optional[Dict[str, Any]] = None) -> None:
+        self._source = os.path.normpath(source) if not glob.has_magic(source) else source
+        self._options: Dict[str, Any] = dict(sequence_options or {})
+        self._fps = float(self._options.get(OPTION_FPS, 0.0) or 0.0)
+        self._files: List[str] = []
+        self._stack: Optional[np.ndarray] = None # Frames of a single-file .npy or raw stack
+        self._frame_count = 0
+        self._position = 0
+        self._width = 0
+        self._height = 0
+        self._alpha: Optional[float] = None # Intensity scale to 8 bits; None for 8-bit data
+        self._has_16bit_samples = False
+        self._native_gray16 = False
+        self._kind = ""
+        self._is_memory_mapped = False
+        self._opened = False
+        try:
+            self._open()
+            self._opened = True
+        except (OSError, ValueError, cv2.error) as e:
+            logger.error(f"Cannot open image sequence '{source}': {e}")
+            self.release()
+
+    # --- cv2.VideoCapture interface ---
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self._opened or self._position >= self._frame_count:
+            return False, None
+        frame = self._read_frame(self._position)
+        self._position += 1
+        return (frame is not None), frame
+
+    def grab(self) -> bool:
+        if not self._opened or self._position >= self._frame_count:
+            return False
+        self._position += 1
+        return True
+
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id == cv2.CAP_PROP_POS_FRAMES and self._opened:
+            self._position = max(0, min(int(value), self._frame_count))
+            return True
+        return False
+
+    def get(self, prop_id: int) -> float:
+        values = {
+            cv2.CAP_PROP_FRAME_COUNT: self._frame_count,
+            cv2.CAP_PROP_FPS: self._fps,
+            cv2.CAP_PROP_FRAME_WIDTH: self._width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self._height,
+            cv2.CAP_PROP_POS_FRAMES: self._position,
+            cv2.CAP_PROP_POS_MSEC: (self._position * 1000.0 / self._fps) if self._fps > 0 else 0.0,
+        }
+        return float(values.get(prop_id, 0.0))
+
+    def release(self) -> None:
+        self._stack = None
+        self._files = []
+        self._opened = False
+
+    # --- Extras ---
+
+    @property
+    def description(self) -> str:
+        """Short human-readable description of the source, e.g. for the video info dialog."""
+        return self._kind
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        """True if frames are read from memory maps rather than decoded."""
+        return self._is_memory_mapped
+
+    @property
+    def has_16bit_samples(self) -> bool:
+        """True if the sequence stores 16-bit integer samples (e.g. 12- or 16-bit camera data)."""
+        return self._has_16bit_samples
+
+    def set_native_gray16(self, enabled: bool) -> bool:
+        """Switches read() to single-channel uint16 output. Returns False if the data is not 16-bit."""
+        self._native_gray16 = bool(enabled) and self._has_16bit_samples
+        return self._native_gray16 == bool(enabled)
+
+    # --- Internal helpers ---
+
+    def _open(self) -> None:
+        lower_source = self._source.lower()
+        if os.path.isfile(self._source) and lower_source.endswith(".npy"):
+            self._stack = np.load(self._source, mmap_mode="r")
+            if self._stack.ndim not in (3, 4):
+                raise ValueError(f".npy stack must have shape (frames, height, width[, channels]), got {self._stack.shape}.")
+            self._frame_count = int(self._stack.shape[0])
+            self._kind = "NumPy frame stack (memory-mapped)"
+        elif os.path.isfile(self._source) and lower_source.endswith(RAW_EXTENSIONS):
+            dtype, frame_shape, header_bytes = self._raw_layout()
+            frame_bytes = int(np.prod(frame_shape)) * dtype.itemsize
+            frame_count = (os.path.getsize(self._source) - header_bytes) // frame_bytes
+            if frame_count <= 0:
+                raise ValueError("Raw file is smaller than one frame with the given layout.")
+            self._stack = np.memmap(self._source, dtype=dtype, mode="r", offset=header_bytes,
+                                    shape=(frame_count,) + frame_shape)
+            self._frame_count = int(frame_count)
+            self._kind = "Raw frame dump (memory-mapped)"
+        else:
+            self._files = list_sequence_files(self._source)
+            if not self._files:
+                raise ValueError("No image files found.")
+            self._frame_count = len(self._files)
+            extension = os.path.splitext(self._files[0])[1].lower().lstrip(".").upper()
+            self._kind = f"{extension} image sequence"
+
+        first_frame, _is_rgb = self._load_frame(0)
+        if first_frame is None or first_frame.ndim not in (2, 3):
+            raise ValueError("Cannot read the first frame of the sequence.")
+        self._height, self._width = int(first_frame.shape[0]), int(first_frame.shape[1])
+        self._alpha = self._intensity_scale(first_frame.dtype, int(self._options.get(OPTION_BIT_DEPTH, 0) or 0))
+        self._has_16bit_samples = first_frame.dtype in (np.uint16, np.dtype("<u2"), np.dtype(">u2"))
+        self._is_memory_mapped = isinstance(first_frame, np.memmap)
+        logger.info(f"Opened {self._kind}: {self._frame_count} frames, {self._width}x{self._height}, "
+                    f"dtype {first_frame.dtype}, FPS {self._fps:g}.")
+
+    def _raw_layout(self) -> Tuple[np.dtype, Tuple[int, ...], int]:
+        width = int(self._options.get(OPTION_RAW_WIDTH, 0) or 0)
+        height = int(self._options.get(OPTION_RAW_HEIGHT, 0) or 0)
+        channels = int(self._options.get(OPTION_RAW_CHANNELS, 1) or 1)
+        if width <= 0 or height <= 0 or channels not in (1, 3):
+            raise ValueError("Raw frames need a width, height and channel count (1 or 3).")
+        dtype = np.dtype("<u2" if self._options.get(OPTION_RAW_DTYPE) == "uint16" else "u1")
+        frame_shape = (height, width) if channels == 1 else (height, width, channels)
+        return dtype, frame_shape, int(self._options.get(OPTION_RAW_HEADER_BYTES, 0) or 0)
+
+    def _load_frame(self, index: int) -> Tuple[Optional[np.ndarray], bool]:
+        """Returns the stored pixels of frame index (memory-mapped when possible) and whether they are RGB."""
+        if self._stack is not None:
+            return self._stack[index], True
+        path = self._files[index]
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".npy":
+            return np.load(path, mmap_mode="r"), True
+        if extension in RAW_EXTENSIONS:
+            dtype, frame_shape, header_bytes = self._raw_layout()
+            return np.memmap(path, dtype=dtype, mode="r", offset=header_bytes, shape=frame_shape), True
+        if extension in (".tif", ".tiff"):
+            mapped = map_uncompressed_tiff(path)
+            if mapped is not None:
+                return mapped
+        return cv2.imread(path, cv2.IMREAD_UNCHANGED), False
+
+    @staticmethod
+    def _intensity_scale(dtype: np.dtype, bit_depth: int) -> Optional[float]:
+        """Factor mapping samples of dtype to 8 bits, or None for 8-bit data."""
+        if dtype == np.uint8:
+            return None
+        if np.issubdtype(dtype, np.integer):
+            container_bits = dtype.itemsize * 8
+            bits = bit_depth if 8 <= bit_depth <= container_bits else container_bits
+            return 255.0 / float((1 << bits) - 1)
+        return 255.0
+
+    def _read_frame(self, index: int) -> Optional[np.ndarray]:
+        try:
+            frame, is_rgb = self._load_frame(index)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot read frame {index} of image sequence: {e}")
+            return None
+        if frame is None:
+            logger.warning(f"Cannot decode frame {index} of image sequence.")
+            return None
+        if self._native_gray16:
+            return self._to_gray16(frame, is_rgb)
+        if self._alpha is not None:
+            frame = cv2.convertScaleAbs(np.asarray(frame), alpha=self._alpha)
+        if frame.ndim == 2 or (frame.ndim == 3 and frame.shape[2] == 1):
+            return cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_GRAY2BGR)
+        if frame.shape[2] == 4:
+            return cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_RGBA2BGR if is_rgb else cv2.COLOR_BGRA2BGR)
+        if is_rgb:
+            return cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_RGB2BGR)
+        return np.array(frame) # Detach from any memory map
+
+    @staticmethod
+    def _to_gray16(frame: np.ndarray, is_rgb: bool) -> np.ndarray:
+        frame = np.ascontiguousarray(frame, dtype=np.uint16) # Also normalises byte order
+        if frame.ndim == 3 and frame.shape[2] == 1:
+            frame = frame[:, :, 0]
+        if frame.ndim == 3:
+            if frame.shape[2] == 4:
+                return cv2.cvtColor(frame, cv2.COLOR_RGBA2GRAY if is_rgb else cv2.COLOR_BGRA2GRAY)
+            return cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY if is_rgb else cv2.COLOR_BGR2GRAY)
+        return np.array(frame) if frame.base is not None else frame
@@ -306,7 +306,12 @@ class InteractiveImageView(QtWidgets.QGraphicsView):
         viewport_center = self.viewport().rect().center()
         self._zoom(zoom_out_factor, viewport_center)
 
-    def setPixmap(self, pixmap: QtGui.QPixmap) -> None:
+    def setPixmap(self, pixmap: QtGui.QPixmap, scene_size: Optional[QtCore.QSize] = None) -> None:
+        """
+        Displays pixmap. If scene_size is given (e.g. for a downscaled proxy frame),
+        the pixmap is scaled to cover that size so scene coordinates stay in
+        original video pixels.
+        """
         logger.info(f"Setting pixmap. Is null: {pixmap.isNull()}. Size: {pixmap.size()}")
         current_transform: Optional[QtGui.QTransform] = None
         is_initial: bool = self._initial_load
@@ -329,6 +334,9 @@ class InteractiveImageView(QtWidgets.QGraphicsView):
             self._scene.addItem(self._pixmap_item)
 
             new_scene_rect: QtCore.QRectF = QtCore.QRectF(pixmap.rect())
+            if scene_size is not None and scene_size.width() > 0 and scene_size.width() != pixmap.width():
+                self._pixmap_item.setScale(scene_size.width() / pixmap.width())
+                new_scene_rect = QtCore.QRectF(0, 0, scene_size.width(), scene_size.height())
             self.setSceneRect(new_scene_rect)
             logger.debug(f"Scene rect set to: {new_scene_rect}")
 
@@ -0,0 +1,95 @@
+# kymograph_benchmark.py
+"""
+Measures kymograph throughput against worker-process count.
+
+Usage:
+    python kymograph_benchmark.py VIDEO [--frames N] [--line X1 Y1 X2 Y2]
+                                        [--workers 1 2 4 8] [--gray] [--band-width W]
+
+Each run samples the same line over the same frames. "in-process" decodes and
+samples sequentially in this process (the single-process baseline); the other
+rows use parallel_kymograph with that many worker processes. Uses the
+keyframe index from the video's sidecar when one has been built.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+import cv2 # type: ignore
+import numpy as np
+
+import video_index
+from decode_profile import DecodeColorMode, DecodeProfile
+from kymograph_sampling import LineSampler
+from parallel_decode import iter_chunk_frames
+from parallel_kymograph import sample_lines_parallel
+
+def _probe(filepath: str) -> Optional[tuple]:
+    capture = cv2.VideoCapture(filepath)
+    try:
+        if not capture.isOpened():
+            return None
+        return (int(capture.get(cv2.CAP_PROP_FRAME_COUNT)), int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        capture.release()
+
+def _run_in_process(filepath: str, sampler: LineSampler, num_frames: int, profile: DecodeProfile) -> int:
+    kymograph = np.zeros((num_frames,) + sampler.strip_shape(profile.is_gray), dtype=profile.dtype)
+    sampled = 0
+    for frame_index, frame in iter_chunk_frames(filepath, None, None, 0, 0, 0, num_frames - 1, 1, profile):
+        kymograph[frame_index] = sampler.sample_within(frame, sampler.roi)
+        sampled += 1
+    return sampled
+
+def _run_parallel(filepath: str, sampler: LineSampler, num_frames: int, profile: DecodeProfile,
+                  workers: int, keyframes: Optional[np.ndarray]) -> int:
+    kymographs = {0: np.zeros((num_frames,) + sampler.strip_shape(profile.is_gray), dtype=profile.dtype)}
+    _done, sampled, _cancelled = sample_lines_parallel(kymographs, {0: sampler}, 0, num_frames - 1, sampler.roi,
+                                                       profile, workers, filepath, keyframes=keyframes)
+    return sampled
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("video")
+    parser.add_argument("--frames", type=int, default=0, help="Frames to process from the start (default: all)")
+    parser.add_argument("--line", type=float, nargs=4, metavar=("X1", "Y1", "X2", "Y2"),
+                        help="Line endpoints in pixels (default: a horizontal line across the middle)")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="Worker counts to try (default: 2, 4, ... up to the CPU count)")
+    parser.add_argument("--gray", action="store_true", help="Sample 8-bit grayscale instead of BGR")
+    parser.add_argument("--band-width", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    info = _probe(args.video)
+    if info is None:
+        print(f"Could not open '{args.video}'.", file=sys.stderr)
+        return 1
+    frame_count, width, height = info
+    num_frames = min(args.frames, frame_count) if args.frames > 0 else frame_count
+    start_xy, end_xy = ((args.line[0], args.line[1]), (args.line[2], args.line[3])) if args.line else \
+                       ((0.0, height / 2.0), (width - 1.0, height / 2.0))
+    sampler = LineSampler(start_xy, end_xy, width, height, band_width=args.band_width)
+    profile = DecodeProfile(DecodeColorMode.GRAY8 if args.gray else DecodeColorMode.BGR8, sampler.roi)
+    keyframes = video_index.load_index_section(args.video, video_index.SECTION_KEYFRAMES)
+    cpu_count = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({n for n in (2, 4, 8, 16, 32, 64) if n < cpu_count} | {cpu_count})
+
+    print(f"{os.path.basename(args.video)}: {num_frames} frames, {sampler.num_samples} samples per row, "
+          f"ROI {sampler.roi}, keyframe index {'yes' if keyframes is not None else 'no'}, {cpu_count} CPUs")
+    print(f"{'workers':>12} {'seconds':>9} {'frames/s':>10} {'speedup':>8}")
+    start_time = time.perf_counter()
+    sampled = _run_in_process(args.video, sampler, num_frames, profile)
+    baseline = time.perf_counter() - start_time
+    print(f"{'in-process':>12} {baseline:9.2f} {sampled / baseline:10.1f} {1.0:8.2f}")
+    for workers in worker_counts:
+        start_time = time.perf_counter()
+        sampled = _run_parallel(args.video, sampler, num_frames, profile, workers, keyframes)
+        elapsed = time.perf_counter() - start_time
+        print(f"{workers:>12} {elapsed:9.2f} {sampled / elapsed:10.1f} {baseline / elapsed:8.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
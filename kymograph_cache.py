@@ -0,0 +1,165 @@
+# kymograph_cache.py
+"""
+Persistent cache of generated kymographs.
+
+Each kymograph is saved as a compressed .npz in the user cache directory,
+named by a hash of everything that determines its values: the source's path
+and content fingerprint (size and modification time of the video, or of every
+file of an image sequence), the decoder backend and decoded-frame store mode,
+the line endpoints rounded to config.KYMOGRAPH_CACHE_ENDPOINT_DECIMALS, the
+frame range and the sampling options. Hits refresh a file's modification time, and the least recently
+used files are deleted to keep the directory under its disk cap.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PySide6 import QtCore
+
+import config
+import image_sequence_source
+from decode_profile import DecodeColorMode
+from kymograph_sampling import BandReducer, SampleInterpolation
+from video_index import compute_file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".kymograph.npz"
+_DATA_KEY = "kymograph"
+
+def cache_directory() -> str:
+    cache_dir = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(cache_dir, "kymographs")
+
+def source_fingerprint(filepath: str,
+                       sequence_options: Optional[Dict[str, Any]],
+                       decode_backend: str,
+                       store_grayscale: Optional[bool]) -> Optional[Dict[str, Any]]:
+    """
+    Identifies the decoded frames of a source for kymograph_cache_key(), or
+    returns None if it cannot be fingerprinted. Folder and glob sequences are
+    fingerprinted by their resolved file list (names, sizes and modification
+    times), so adding, removing or rewriting a frame file changes the result.
+    store_grayscale is the mode of the decoded-frame store frames may come
+    from (None without a store): its grayscale conversion can differ from the
+    decoder's.
+    """
+    if sequence_options is not None and not os.path.isfile(filepath):
+        files = []
+        for path in image_sequence_source.list_sequence_files(filepath):
+            fingerprint = compute_file_fingerprint(path)
+            if fingerprint is None:
+                return None
+            files.append([os.path.basename(path), fingerprint["size"], fingerprint["mtime_ns"]])
+        if not files:
+            return None
+        content = hashlib.sha1(json.dumps(files).encode("utf-8")).hexdigest()
+    else:
+        fingerprint = compute_file_fingerprint(filepath)
+        if fingerprint is None:
+            return None
+        content = f"{fingerprint['size']}|{fingerprint['mtime_ns']}"
+    return {"video": os.path.abspath(filepath), "content": content, "sequence_options": sequence_options,
+            "decode_backend": decode_backend, "store_grayscale": store_grayscale}
+
+def kymograph_cache_key(fingerprint: Dict[str, Any],
+                        line_points_data: List[Any],
+                        start_frame_idx: int,
+                        end_frame_idx: int,
+                        color_mode: DecodeColorMode,
+                        interpolation: SampleInterpolation,
+                        samples_per_pixel: float,
+                        band_width: int,
+                        band_reducer: BandReducer) -> str:
+    """
+    Returns the cache key for a kymograph of the source identified by
+    fingerprint (see source_fingerprint()). color_mode should be the mode
+    actually sampled (after VideoHandler.analysis_profile() fallbacks).
+    """
+    decimals = config.KYMOGRAPH_CACHE_ENDPOINT_DECIMALS
+    key = {
+        "source": fingerprint,
+        "endpoints": [[round(float(point[2]), decimals), round(float(point[3]), decimals)] for point in line_points_data],
+        "range": [int(start_frame_idx), int(end_frame_idx)],
+        "color_mode": color_mode.value,
+        "interpolation": interpolation.value,
+        "samples_per_pixel": round(float(samples_per_pixel), 4),
+        "band_width": int(band_width),
+        "band_reducer": band_reducer.value if band_width > 1 else None, # Irrelevant for single-pixel lines
+    }
+    return hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def load_kymograph(key: str) -> Optional[np.ndarray]:
+    """Returns the cached kymograph for key, or None on a miss."""
+    path = os.path.join(cache_directory(), key + CACHE_SUFFIX)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as archive:
+            data = archive[_DATA_KEY]
+        os.utime(path) # Mark as recently used for eviction
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Could not read cached kymograph '{os.path.basename(path)}': {e}")
+        return None
+    logger.info(f"Kymograph loaded from cache ({data.shape[0]} time points, {data.shape[1]} spatial points).")
+    return data
+
+def _evict_to_fit(directory: str, max_total_bytes: int, keep_path: str) -> None:
+    """Deletes least-recently-used cache files until the directory is within max_total_bytes."""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(CACHE_SUFFIX)]
+    except OSError:
+        return
+    entries = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            entries.append((os.path.getmtime(path), path, os.path.getsize(path)))
+        except OSError:
+            continue
+    total = sum(size for _mtime, _path, size in entries)
+    for _mtime, path, size in sorted(entries):
+        if total <= max_total_bytes:
+            break
+        if path == keep_path:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        logger.info(f"Evicted cached kymograph '{os.path.basename(path)}' to stay within the disk cap.")
+
+def save_kymograph(key: str, data: np.ndarray, max_total_bytes: int) -> bool:
+    """
+    Stores data under key, then evicts older entries to stay within
+    max_total_bytes. Results that compress to more than the cap are not kept.
+    """
+    directory = cache_directory()
+    path = os.path.join(directory, key + CACHE_SUFFIX)
+    temp_path = ""
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write under a temporary name so a crash never leaves a truncated entry.
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            np.savez_compressed(temp_file, **{_DATA_KEY: data})
+        if os.path.getsize(temp_path) > max_total_bytes:
+            logger.info(f"Kymograph is larger than the cache cap ({max_total_bytes / 1024**2:.0f} MB). Not caching it.")
+            os.remove(temp_path)
+            return False
+        os.replace(temp_path, path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not cache kymograph: {e}")
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return False
+    _evict_to_fit(directory, max_total_bytes, keep_path=path)
+    return True
@@ -1,42 +1,154 @@
 # kymograph_handler.py
 """
 Handles the generation of kymograph data from a specified line in a video.
+Generation runs on a worker thread so the GUI stays responsive and can cancel it.
 """
+import functools
 import logging
-from typing import TYPE_CHECKING, Optional, Tuple, List
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, List
 
 import numpy as np
-import cv2 # For color handling if needed, and potentially interpolation later
+import cv2 # type: ignore
 from PySide6 import QtCore # Added for signals
 
+import config
+import kymograph_cache
+import parallel_kymograph
+import settings_manager
+from decode_profile import DecodeColorMode, DecodeProfile
+from kymograph_sampling import BandReducer, LineSampler, SampleInterpolation, bounding_roi
+
+from video_handler import VideoHandler
+
 if TYPE_CHECKING:
-    from video_handler import VideoHandler
     from element_manager import PointData # For line_points type hint
 
 logger = logging.getLogger(__name__)
 
+def allocate_kymograph_array(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """
+    Returns a zero-filled array for a kymograph. Results larger than
+    config.KYMOGRAPH_MEMMAP_MIN_BYTES are backed by an anonymous temporary file,
+    so the operating system can page them out instead of exhausting RAM.
+    """
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    if nbytes >= config.KYMOGRAPH_MEMMAP_MIN_BYTES:
+        try:
+            backing_file = tempfile.TemporaryFile(prefix="kymograph_") # Deleted once the mapping is gone
+            logger.info(f"Kymograph needs {nbytes / 1024**2:.0f} MB; backing it with a temporary file.")
+            return np.memmap(backing_file, dtype=dtype, mode="w+", shape=shape)
+        except OSError as e:
+            logger.warning(f"Could not create a file-backed kymograph array ({e}); using memory.")
+    return np.zeros(shape, dtype=dtype)
+
+def export_kymographs_npz(filepath: str,
+                          kymographs: Dict[int, np.ndarray],
+                          line_points: Dict[int, List['PointData']],
+                          start_frame_idx: int,
+                          fps: float) -> bool:
+    """
+    Saves several kymographs to one compressed .npz file: array "line_<id>" per
+    line, plus "line_ids", "line_endpoints" (rows of P1x, P1y, P2x, P2y in
+    top-left pixel coordinates), "start_frame" (0-based) and "fps".
+    """
+    line_ids = sorted(kymographs)
+    arrays = {f"line_{line_id}": kymographs[line_id] for line_id in line_ids}
+    arrays["line_ids"] = np.asarray(line_ids, dtype=np.int64)
+    arrays["line_endpoints"] = np.asarray([[line_points[line_id][0][2], line_points[line_id][0][3],
+                                            line_points[line_id][1][2], line_points[line_id][1][3]]
+                                           for line_id in line_ids], dtype=np.float64).reshape(-1, 4)
+    arrays["start_frame"] = np.int64(start_frame_idx)
+    arrays["fps"] = np.float64(fps)
+    try:
+        np.savez_compressed(filepath, **arrays)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not save kymographs to '{filepath}': {e}")
+        return False
+    logger.info(f"Saved {len(line_ids)} kymographs to '{filepath}'.")
+    return True
+
+class KymographThread(QtCore.QThread):
+    """
+    Runs one kymograph job off the GUI thread. The job is called with a
+    cancellation check and returns (result, message), which is reported
+    through jobFinished(result, message).
+    """
+    jobFinished = QtCore.Signal(object, str)
+
+    def __init__(self,
+                 job: Callable[[Callable[[], bool]], Tuple[Any, str]],
+                 parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self._job = job
+
+    def run(self) -> None:
+        try:
+            result, message = self._job(self.isInterruptionRequested)
+        except Exception as e:
+            logger.exception(f"Kymograph generation failed: {e}")
+            result, message = None, f"Error: {e}"
+        self.jobFinished.emit(result, message)
+
+
 class KymographHandler(QtCore.QObject): # Inherit from QObject for signals
     """
     Generates kymograph data (a 2D array of pixel values over time)
-    along a user-defined line.
+    along user-defined lines, one generation at a time on a worker thread.
     """
     # --- Phase 2: Add Signals ---
     kymographGenerationStarted = QtCore.Signal()
     kymographGenerationProgress = QtCore.Signal(str, int, int)  # message, current_value, max_value
     kymographGenerationFinished = QtCore.Signal(object, str)    # kymo_data_np (np.ndarray | None), status_message
+    kymographBatchFinished = QtCore.Signal(object, str)         # {line_id: np.ndarray} (or None), status_message
 
     def __init__(self, parent: Optional[QtCore.QObject] = None): # Added parent for QObject
         super().__init__(parent) # Call QObject constructor
+        self._thread: Optional[KymographThread] = None
+        self._job_is_batch: bool = False
+        self._job_line_count: int = 0
         logger.debug("KymographHandler initialized.")
 
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def cancel(self) -> None:
+        """Asks the running generation to stop. It still finishes through the usual signal, with a partial result."""
+        if self._thread is not None:
+            logger.info("Kymograph generation cancellation requested.")
+            self._thread.requestInterruption()
+
+    def shutdown(self) -> None:
+        """
+        Stops the running generation and waits for it, discarding its result
+        (e.g. before the video is released). The finished signal is emitted
+        with None straight away.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        thread.jobFinished.disconnect(self._on_job_finished)
+        thread.requestInterruption()
+        thread.wait()
+        self._thread = None
+        finished_signal = self.kymographBatchFinished if self._job_is_batch else self.kymographGenerationFinished
+        finished_signal.emit(None, "Kymograph generation cancelled.")
+
     def generate_kymograph_data(self,
                                 line_points_data: List['PointData'],
                                 video_handler: 'VideoHandler',
                                 start_frame_idx: int, # New parameter
-                                end_frame_idx: int    # New parameter
-                                ) -> Optional[np.ndarray]: # Return type will be handled by signal
+                                end_frame_idx: int,   # New parameter
+                                color_mode: DecodeColorMode = DecodeColorMode.BGR8,
+                                interpolation: SampleInterpolation = SampleInterpolation.BILINEAR,
+                                samples_per_pixel: float = 1.0,
+                                band_width: int = 1,
+                                band_reducer: BandReducer = BandReducer.MEAN
+                                ) -> None:
         """
-        Generates kymograph data for the given line over the specified frame range.
+        Starts generating kymograph data for the given line over the specified frame range.
         The kymograph's spatial axis will be ordered such that the second point
         clicked (P2) corresponds to the 'top' (or start) of the spatial axis,
         and the first point clicked (P1) corresponds to the 'bottom' (or end).
@@ -46,127 +158,289 @@ class KymographHandler(QtCore.QObject): # Inherit from QObject for signals
             video_handler: An instance of VideoHandler to access video frames.
             start_frame_idx: The 0-based starting frame index for kymograph generation.
             end_frame_idx: The 0-based ending frame index (inclusive) for kymograph generation.
+            color_mode: Pixel format to sample. Grayscale modes decode only luminance
+                        (GRAY16 keeps the original values of 16-bit image sequences).
+            interpolation: How pixel values are interpolated at the sub-pixel sample positions.
+            samples_per_pixel: Samples taken per pixel of line length (above 1 oversamples,
+                               below 1 undersamples).
+            band_width: Width in pixels of the band sampled across the line. Above 1,
+                        the band's pixels at each position are combined by band_reducer,
+                        which reduces noise without filtering whole frames.
+            band_reducer: Mean, maximum or median across the band.
 
         Emits:
             kymographGenerationStarted: When generation begins.
-            kymographGenerationProgress: Periodically during generation.
-            kymographGenerationFinished: When generation completes or fails,
+            kymographGenerationProgress: At most every config.KYMOGRAPH_PROGRESS_INTERVAL_S.
+            kymographGenerationFinished: When generation completes, fails or is cancelled,
                                          with the kymograph data (or None) and a message.
-        Returns:
-            This method will emit results via signals. The direct return type is
-            kept for compatibility but the primary way to get data is via the signal.
-            Returns None if initial checks fail before starting the loop.
+                                         A cancelled generation delivers the frames sampled
+                                         so far, or None if there were none.
+        Returns immediately; frames are decoded and sampled on a worker thread.
         """
         self.kymographGenerationStarted.emit()
 
-        if not video_handler.is_loaded:
-            logger.error("Cannot generate kymograph: Video not loaded.")
-            self.kymographGenerationFinished.emit(None, "Error: Video not loaded.")
-            return None
-
         if not line_points_data or len(line_points_data) != 2:
             logger.error("Cannot generate kymograph: Invalid line_points_data provided.")
             self.kymographGenerationFinished.emit(None, "Error: Invalid line data.")
-            return None
+            return
 
-        if not (0 <= start_frame_idx <= end_frame_idx < video_handler.total_frames):
-            err_msg = f"Invalid frame range: Start={start_frame_idx}, End={end_frame_idx}, Total={video_handler.total_frames}"
-            logger.error(err_msg)
-            self.kymographGenerationFinished.emit(None, f"Error: {err_msg}")
-            return None
+        job = functools.partial(self._sample_lines, {0: line_points_data}, self._frame_source(video_handler, color_mode),
+                                start_frame_idx, end_frame_idx, interpolation, samples_per_pixel, band_width, band_reducer,
+                                self._decode_workers(video_handler, start_frame_idx, end_frame_idx, color_mode),
+                                self._cache_max_bytes())
+        self._start_job(job, is_batch=False, line_count=1)
 
-        num_frames_to_process = (end_frame_idx - start_frame_idx) + 1
+    def generate_kymographs_for_lines(self,
+                                      lines: Dict[int, List['PointData']],
+                                      video_handler: 'VideoHandler',
+                                      start_frame_idx: int,
+                                      end_frame_idx: int,
+                                      color_mode: DecodeColorMode = DecodeColorMode.BGR8,
+                                      interpolation: SampleInterpolation = SampleInterpolation.BILINEAR,
+                                      samples_per_pixel: float = 1.0,
+                                      band_width: int = 1,
+                                      band_reducer: BandReducer = BandReducer.MEAN
+                                      ) -> None:
+        """
+        Starts generating one kymograph per line from a single pass over the frame
+        range: each frame is decoded once and every line is sampled from it. Options,
+        axis orientation and threading are as for generate_kymograph_data().
 
-        _f1, _t1, x1_p1, y1_p1 = line_points_data[0] # P1
-        _f2, _t2, x2_p2, y2_p2 = line_points_data[1] # P2
+        Args:
+            lines: Two PointData tuples per line, keyed by line ID.
 
-        logger.info(f"Generating kymograph from line P1:({x1_p1:.1f},{y1_p1:.1f}) to P2:({x2_p2:.1f},{y2_p2:.1f}) "
-                    f"for frames {start_frame_idx} to {end_frame_idx} ({num_frames_to_process} frames). Spatial axis P2 -> P1.")
+        Emits:
+            kymographGenerationStarted, kymographGenerationProgress as for a single line;
+            kymographBatchFinished with {line_id: kymograph} (or None) and a message.
+            Zero-length lines are left out of the result.
+        """
+        self.kymographGenerationStarted.emit()
 
-        length = int(np.round(np.sqrt((x2_p2 - x1_p1)**2 + (y2_p2 - y1_p1)**2)))
-        if length == 0:
-            logger.warning("Line length is zero. Cannot generate kymograph.")
-            self.kymographGenerationFinished.emit(None, "Error: Line length is zero.")
-            return None
+        valid_lines = {line_id: points for line_id, points in lines.items() if points and len(points) == 2}
+        if not valid_lines:
+            logger.error("Cannot generate kymographs: No lines with valid endpoint data provided.")
+            self.kymographBatchFinished.emit(None, "Error: No valid lines.")
+            return
 
-        line_x_coords = np.linspace(x2_p2, x1_p1, length, dtype=float)
-        line_y_coords = np.linspace(y2_p2, y1_p1, length, dtype=float)
-        line_x_indices = np.round(line_x_coords).astype(int)
-        line_y_indices = np.round(line_y_coords).astype(int)
+        job = functools.partial(self._sample_lines, valid_lines, self._frame_source(video_handler, color_mode),
+                                start_frame_idx, end_frame_idx, interpolation, samples_per_pixel, band_width, band_reducer,
+                                self._decode_workers(video_handler, start_frame_idx, end_frame_idx, color_mode),
+                                self._cache_max_bytes())
+        self._start_job(job, is_batch=True, line_count=len(lines))
 
-        kymograph_strips: List[np.ndarray] = []
-        num_channels = 0
-        first_valid_frame_dtype = np.uint8
-        processed_frames_count = 0
+    @staticmethod
+    def _frame_source(video_handler: 'VideoHandler', color_mode: DecodeColorMode) -> Optional[Dict[str, Any]]:
+        # Snapshot taken on the GUI thread: the job never reads video_handler state.
+        return video_handler.frame_source(color_mode) if video_handler.is_loaded else None
 
-        for frame_idx in range(start_frame_idx, end_frame_idx + 1):
-            # Cancellation check could be added here if MainWindow passes a flag
-            # For now, assuming synchronous processing and relying on MainWindow to manage the dialog.
+    @staticmethod
+    def _decode_workers(video_handler: 'VideoHandler', start_frame_idx: int, end_frame_idx: int,
+                        color_mode: DecodeColorMode) -> int:
+        # Preferences are read here, on the GUI thread, rather than by the job.
+        if not video_handler.is_loaded:
+            return 0
+        return video_handler.parallel_decode_workers(start_frame_idx, end_frame_idx,
+                                                     profile=video_handler.analysis_profile(color_mode))
 
-            raw_frame = video_handler.get_raw_frame_at_index(frame_idx)
-            processed_frames_count += 1
-            progress_message = f"Processing frame {processed_frames_count}/{num_frames_to_process} (Video frame {frame_idx + 1})"
-            self.kymographGenerationProgress.emit(progress_message, processed_frames_count, num_frames_to_process)
+    @staticmethod
+    def _cache_max_bytes() -> int:
+        # 0 disables the on-disk result cache.
+        if not settings_manager.get_setting(settings_manager.KEY_KYMOGRAPH_CACHE_ENABLED):
+            return 0
+        return int(float(settings_manager.get_setting(settings_manager.KEY_KYMOGRAPH_CACHE_MAX_MB)) * 1024**2)
 
+    def _start_job(self, job: Callable[[Callable[[], bool]], Tuple[Any, str]], is_batch: bool, line_count: int) -> None:
+        if self._thread is not None:
+            logger.error("Cannot generate kymograph: A generation is already running.")
+            finished_signal = self.kymographBatchFinished if is_batch else self.kymographGenerationFinished
+            finished_signal.emit(None, "Error: A kymograph is already being generated.")
+            return
+        self._job_is_batch = is_batch
+        self._job_line_count = line_count
+        self._thread = KymographThread(job, self)
+        self._thread.jobFinished.connect(self._on_job_finished) # Queued: delivered on the GUI thread
+        self._thread.start()
 
-            if raw_frame is None:
-                logger.warning(f"Could not retrieve frame {frame_idx} for kymograph. Filling with zeros.")
-                if num_channels > 0:
-                    empty_strip_shape = (length, num_channels) if num_channels > 1 else (length,)
-                    kymograph_strips.append(np.zeros(empty_strip_shape, dtype=first_valid_frame_dtype))
-                continue
+    @QtCore.Slot(object, str)
+    def _on_job_finished(self, results: Optional[Dict[int, np.ndarray]], message: str) -> None:
+        if self._thread is not None:
+            self._thread.wait()
+            self._thread.deleteLater()
+            self._thread = None
 
-            if not kymograph_strips or (num_channels == 0 and not kymograph_strips): # First successfully processed frame in this run
-                if len(raw_frame.shape) == 3:
-                    num_channels = raw_frame.shape[2]
-                else:
-                    num_channels = 1
-                first_valid_frame_dtype = raw_frame.dtype
+        if not self._job_is_batch:
+            kymograph_data = results[0] if results else None
+            if kymograph_data is not None and not message:
+                message = f"Kymograph data generated ({kymograph_data.shape[0]} time points, {kymograph_data.shape[1]} spatial points)."
+                logger.info(message)
+            self.kymographGenerationFinished.emit(kymograph_data, message)
+            return
+
+        if results and not message:
+            skipped = self._job_line_count - len(results)
+            num_time_points = next(iter(results.values())).shape[0]
+            message = f"{len(results)} kymographs generated ({num_time_points} time points each)"
+            message += f"; {skipped} line{'s' if skipped != 1 else ''} skipped." if skipped else "."
+            logger.info(message)
+        self.kymographBatchFinished.emit(results, message)
+
+    def _sample_lines(self,
+                      lines: Dict[int, List['PointData']],
+                      source: Optional[Dict[str, Any]],
+                      start_frame_idx: int,
+                      end_frame_idx: int,
+                      interpolation: SampleInterpolation,
+                      samples_per_pixel: float,
+                      band_width: int,
+                      band_reducer: BandReducer,
+                      workers: int,
+                      cache_max_bytes: int,
+                      is_cancelled: Callable[[], bool]) -> Tuple[Optional[Dict[int, np.ndarray]], str]:
+        """
+        Decodes start_frame_idx..end_frame_idx once and samples every line from
+        each frame, on worker processes if workers > 1. Runs on the worker thread,
+        reading the video only through source, a VideoHandler.frame_source()
+        snapshot (None if no video is loaded) whose colour mode is sampled.
+        With cache_max_bytes > 0, lines found in kymograph_cache are loaded
+        instead, and newly sampled ones are added to it. Returns ({line_id: kymograph}, "")
+        on success, (None, error message) on failure, and if cancelled, the rows
+        sampled so far (or None) with a cancellation message.
+        """
+        if source is None:
+            logger.error("Cannot generate kymograph: Video not loaded.")
+            return None, "Error: Video not loaded."
 
-            frame_height, frame_width = raw_frame.shape[:2]
-            current_x_indices = np.clip(line_x_indices, 0, frame_width - 1)
-            current_y_indices = np.clip(line_y_indices, 0, frame_height - 1)
+        if not (0 <= start_frame_idx <= end_frame_idx < source["total_frames"]):
+            err_msg = f"Invalid frame range: Start={start_frame_idx}, End={end_frame_idx}, Total={source['total_frames']}"
+            logger.error(err_msg)
+            return None, f"Error: {err_msg}"
 
+        num_frames_to_process = (end_frame_idx - start_frame_idx) + 1
+
+        samplers: Dict[int, LineSampler] = {}
+        for line_id, line_points_data in lines.items():
+            _f1, _t1, x1_p1, y1_p1 = line_points_data[0] # P1
+            _f2, _t2, x2_p2, y2_p2 = line_points_data[1] # P2
+            logger.info(f"Generating kymograph from line P1:({x1_p1:.1f},{y1_p1:.1f}) to P2:({x2_p2:.1f},{y2_p2:.1f}) "
+                        f"for frames {start_frame_idx} to {end_frame_idx} ({num_frames_to_process} frames). Spatial axis P2 -> P1.")
             try:
-                if num_channels > 1:
-                    pixel_strip = raw_frame[current_y_indices, current_x_indices, :]
+                # Spatial axis runs P2 -> P1. Sample positions are computed once for all frames.
+                samplers[line_id] = LineSampler((x2_p2, y2_p2), (x1_p1, y1_p1), source["frame_width"],
+                                                source["frame_height"], samples_per_pixel, interpolation,
+                                                band_width, band_reducer)
+            except ValueError:
+                logger.warning(f"Line {line_id} has zero length. Skipping it.")
+        if not samplers:
+            return None, "Error: Line length is zero."
+
+        cached: Dict[int, np.ndarray] = {}
+        cache_keys: Dict[int, str] = {}
+        if cache_max_bytes > 0:
+            decode_options = source["decode_options"]
+            store = source["frame_store"]
+            fingerprint = kymograph_cache.source_fingerprint(decode_options["filepath"], decode_options["sequence_options"],
+                                                             decode_options["decode_backend"],
+                                                             store.is_grayscale if store is not None else None)
+            for line_id in list(samplers) if fingerprint is not None else []:
+                key = kymograph_cache.kymograph_cache_key(fingerprint, lines[line_id], start_frame_idx, end_frame_idx,
+                                                          source["color_mode"], interpolation, samples_per_pixel,
+                                                          band_width, band_reducer)
+                data = kymograph_cache.load_kymograph(key)
+                if data is None:
+                    cache_keys[line_id] = key
                 else:
-                    pixel_strip = raw_frame[current_y_indices, current_x_indices]
-                kymograph_strips.append(pixel_strip)
-            except IndexError as e:
-                logger.error(f"IndexError accessing pixel data for frame {frame_idx}. Error: {e}")
-                if num_channels > 0:
-                    empty_strip_shape = (length, num_channels) if num_channels > 1 else (length,)
-                    kymograph_strips.append(np.zeros(empty_strip_shape, dtype=first_valid_frame_dtype))
-
-        if not kymograph_strips:
+                    cached[line_id] = data
+                    del samplers[line_id]
+            if not samplers:
+                return cached, ""
+
+        # Only the lines' common bounding box (within the frame, like each line's
+        # roi) is needed from each frame; crop and colour conversion happen once,
+        # right after decoding.
+        frame_roi = bounding_roi(sampler.roi for sampler in samplers.values())
+        profile = DecodeProfile(source["color_mode"], frame_roi)
+        logger.debug(f"Sampling {len(samplers)} line(s) ({interpolation.value}, {samples_per_pixel:g} per pixel, "
+                     f"band {band_width} px {band_reducer.value}) from ROI {frame_roi}.")
+
+        # Strips are written straight into the results; frames that fail to decode stay zero.
+        kymographs: Dict[int, np.ndarray] = {
+            line_id: allocate_kymograph_array((num_frames_to_process,) + sampler.strip_shape(profile.is_gray), profile.dtype)
+            for line_id, sampler in samplers.items()}
+
+        if workers > 1:
+            # Decoding and sampling both run in the worker processes.
+            def report_progress(frames_done: int, total_frames: int) -> None:
+                self.kymographGenerationProgress.emit(f"Processing frame {frames_done}/{total_frames}", frames_done, total_frames)
+            processed_frames_count, sampled_frames_count, cancelled = parallel_kymograph.sample_lines_parallel(
+                kymographs, samplers, start_frame_idx, end_frame_idx, frame_roi, profile, workers,
+                is_cancelled=is_cancelled, progress_callback=report_progress, **source["decode_options"])
+        else:
+            processed_frames_count, sampled_frames_count, cancelled = self._sample_frames_sequential(
+                kymographs, samplers, source, start_frame_idx, end_frame_idx, frame_roi, profile, is_cancelled)
+
+        if cancelled:
+            logger.info(f"Kymograph generation cancelled after {processed_frames_count} of {num_frames_to_process} frames.")
+            message = f"Kymograph generation cancelled after {processed_frames_count} of {num_frames_to_process} frames."
+            if sampled_frames_count == 0:
+                return cached or None, message
+            partial = {line_id: data[:processed_frames_count] for line_id, data in kymographs.items()}
+            return {**cached, **partial}, message
+
+        if sampled_frames_count == 0:
             logger.warning("No frames successfully processed for kymograph.")
-            self.kymographGenerationFinished.emit(None, "Error: No frames processed.")
-            return None
-
-        consistent_strips = []
-        if kymograph_strips: # Should always be true if we didn't return None above
-            expected_strip_shape = kymograph_strips[0].shape
-            for i, strip in enumerate(kymograph_strips):
-                if strip.shape == expected_strip_shape:
-                    consistent_strips.append(strip)
-                else:
-                    logger.warning(f"Strip for processed frame index {i} has shape {strip.shape}, expected {expected_strip_shape}. Filling with zeros.")
-                    consistent_strips.append(np.zeros(expected_strip_shape, dtype=first_valid_frame_dtype))
-        
-        if not consistent_strips:
-             logger.error("No consistent strips found to build kymograph.")
-             self.kymographGenerationFinished.emit(None, "Error: Failed to prepare kymograph data strips.")
-             return None
+            return None, "Error: No frames processed."
+
+        if cache_keys and sampled_frames_count < num_frames_to_process:
+            # Zero-filled rows of frames that failed would come back on every later run.
+            logger.info(f"Not caching kymograph(s): {num_frames_to_process - sampled_frames_count} of "
+                        f"{num_frames_to_process} frames could not be sampled.")
+        elif cache_keys:
+            self.kymographGenerationProgress.emit("Saving to kymograph cache...", num_frames_to_process, num_frames_to_process)
+            for line_id, key in cache_keys.items():
+                if is_cancelled():
+                    break
+                kymograph_cache.save_kymograph(key, kymographs[line_id], cache_max_bytes)
+        return {**cached, **kymographs}, ""
 
+    def _sample_frames_sequential(self,
+                                  kymographs: Dict[int, np.ndarray],
+                                  samplers: Dict[int, LineSampler],
+                                  source: Dict[str, Any],
+                                  start_frame_idx: int,
+                                  end_frame_idx: int,
+                                  frame_roi: Tuple[int, int, int, int],
+                                  profile: DecodeProfile,
+                                  is_cancelled: Callable[[], bool]) -> Tuple[int, int, bool]:
+        """Streams the range through VideoHandler.iter_source_frames in this thread. Returns (frames done, frames sampled, cancelled)."""
+        num_frames_to_process = (end_frame_idx - start_frame_idx) + 1
+        processed_frames_count = 0
+        sampled_frames_count = 0
+        next_progress_time = 0.0
+
+        frames = VideoHandler.iter_source_frames(source, start_frame_idx, end_frame_idx, profile=profile)
         try:
-            kymograph_data = np.stack(consistent_strips, axis=0)
-            success_msg = f"Kymograph data generated ({kymograph_data.shape[0]} time points, {kymograph_data.shape[1]} spatial points)."
-            logger.info(success_msg)
-            self.kymographGenerationFinished.emit(kymograph_data, success_msg)
-            return kymograph_data # Still return for potential direct use, though signal is primary
-        except ValueError as e:
-            err_msg = f"Error stacking kymograph strips: {e}"
-            logger.error(err_msg)
-            self.kymographGenerationFinished.emit(None, f"Error: {err_msg}")
-            return None
\ No newline at end of file
+            for frame_idx, raw_frame in frames:
+                if is_cancelled():
+                    return processed_frames_count, sampled_frames_count, True
+
+                processed_frames_count += 1
+                now = time.monotonic()
+                if now >= next_progress_time or processed_frames_count == num_frames_to_process:
+                    next_progress_time = now + config.KYMOGRAPH_PROGRESS_INTERVAL_S
+                    progress_message = f"Processing frame {processed_frames_count}/{num_frames_to_process} (Video frame {frame_idx + 1})"
+                    self.kymographGenerationProgress.emit(progress_message, processed_frames_count, num_frames_to_process)
+
+                if raw_frame is None:
+                    logger.warning(f"Could not retrieve frame {frame_idx} for kymograph. Filling with zeros.")
+                    continue
+
+                try:
+                    row = frame_idx - start_frame_idx
+                    for line_id, sampler in samplers.items():
+                        kymographs[line_id][row] = sampler.sample_within(raw_frame, frame_roi)
+                    sampled_frames_count += 1
+                except (cv2.error, ValueError) as e:
+                    logger.error(f"Error sampling pixel data for frame {frame_idx}. Filling with zeros. Error: {e}")
+        finally:
+            frames.close() # Releases the decoder promptly on cancellation
+        return processed_frames_count, sampled_frames_count, False
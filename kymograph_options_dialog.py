@@ -1,14 +1,18 @@
 # kymograph_options_dialog.py
 """
-Dialog for selecting the time or frame range for kymograph generation.
+Dialog for selecting the time or frame range, pixel format and line sampling for kymograph generation,
+and, for batch generation, which measurement lines to include.
 """
 import logging
 import math
 import re
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from decode_profile import DecodeColorMode
+from kymograph_sampling import BandReducer, SampleInterpolation
+
 logger = logging.getLogger(__name__)
 
 class KymographOptionsDialog(QtWidgets.QDialog):
@@ -16,9 +20,12 @@ class KymographOptionsDialog(QtWidgets.QDialog):
                  total_frames: int,
                  fps: float,
                  current_frame_idx: int, # For defaulting start frame
+                 supports_gray16: bool = False, # True for 16-bit image sequences
+                 lines: Optional[List[Tuple[int, str]]] = None, # (line ID, label) choices for batch generation
                  parent: Optional[QtWidgets.QWidget] = None):
         super().__init__(parent)
-        self.setWindowTitle("Kymograph Generation Options")
+        self._lines = lines
+        self.setWindowTitle("Kymograph Generation Options" if lines is None else "Batch Kymograph Generation Options")
         self.setModal(True)
         self.setMinimumWidth(500)
 
@@ -26,6 +33,7 @@ class KymographOptionsDialog(QtWidgets.QDialog):
         self._fps = fps if fps > 0 else 30.0 # Use a sensible default if FPS is invalid
         self._total_duration_ms = (self._total_frames / self._fps) * 1000 if self._fps > 0 and self._total_frames > 0 else 0.0
         self._current_frame_idx_0_based = current_frame_idx # 0-based
+        self._supports_gray16 = supports_gray16
 
         # --- Internal state for selected values ---
         self._use_full_range: bool = True
@@ -47,6 +55,27 @@ class KymographOptionsDialog(QtWidgets.QDialog):
     def _setup_ui(self):
         main_layout = QtWidgets.QVBoxLayout(self)
 
+        # --- Lines Section (batch generation only) ---
+        self.linesListWidget: Optional[QtWidgets.QListWidget] = None
+        self.exportCombinedCheckBox: Optional[QtWidgets.QCheckBox] = None
+        if self._lines is not None:
+            lines_group_box = QtWidgets.QGroupBox("Measurement Lines")
+            lines_layout = QtWidgets.QVBoxLayout(lines_group_box)
+            self.linesListWidget = QtWidgets.QListWidget()
+            self.linesListWidget.setToolTip("Lines to generate kymographs for. All are sampled from a single pass over the video.")
+            for line_id, label in self._lines:
+                item = QtWidgets.QListWidgetItem(label)
+                item.setData(QtCore.Qt.ItemDataRole.UserRole, line_id)
+                item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
+                item.setCheckState(QtCore.Qt.CheckState.Checked)
+                self.linesListWidget.addItem(item)
+            self.linesListWidget.setMaximumHeight(150)
+            lines_layout.addWidget(self.linesListWidget)
+            self.exportCombinedCheckBox = QtWidgets.QCheckBox("Also save all kymographs to one .npz file")
+            self.exportCombinedCheckBox.setToolTip("Saves every kymograph, with its line endpoints, to a single compressed NumPy archive")
+            lines_layout.addWidget(self.exportCombinedCheckBox)
+            main_layout.addWidget(lines_group_box)
+
         # --- Range Section ---
         range_group_box = QtWidgets.QGroupBox("Kymograph Range")
         range_layout = QtWidgets.QVBoxLayout(range_group_box)
@@ -127,6 +156,51 @@ class KymographOptionsDialog(QtWidgets.QDialog):
         range_layout.addWidget(self.customRangeInputsWidget)
         main_layout.addWidget(range_group_box)
 
+        # --- Pixel Format Section ---
+        format_group_box = QtWidgets.QGroupBox("Pixel Format")
+        format_layout = QtWidgets.QFormLayout(format_group_box)
+        format_layout.setHorizontalSpacing(10)
+        self.colorModeComboBox = QtWidgets.QComboBox()
+        self.colorModeComboBox.addItem("Colour (8-bit BGR)", DecodeColorMode.BGR8)
+        self.colorModeComboBox.addItem("Grayscale (8-bit)", DecodeColorMode.GRAY8)
+        if self._supports_gray16:
+            self.colorModeComboBox.addItem("Grayscale (16-bit, original values)", DecodeColorMode.GRAY16)
+        self.colorModeComboBox.setToolTip("Grayscale kymographs decode only luminance, using a third of the memory of colour")
+        format_layout.addRow("Sample As:", self.colorModeComboBox)
+        main_layout.addWidget(format_group_box)
+
+        # --- Line Sampling Section ---
+        sampling_group_box = QtWidgets.QGroupBox("Line Sampling")
+        sampling_layout = QtWidgets.QFormLayout(sampling_group_box)
+        sampling_layout.setHorizontalSpacing(10)
+        self.interpolationComboBox = QtWidgets.QComboBox()
+        self.interpolationComboBox.addItem("Bilinear", SampleInterpolation.BILINEAR)
+        self.interpolationComboBox.addItem("Bicubic", SampleInterpolation.BICUBIC)
+        self.interpolationComboBox.addItem("Nearest pixel", SampleInterpolation.NEAREST)
+        self.interpolationComboBox.setToolTip("How pixel values are interpolated between pixel centres along the line")
+        sampling_layout.addRow("Interpolation:", self.interpolationComboBox)
+        self.samplesPerPixelSpinBox = QtWidgets.QDoubleSpinBox()
+        self.samplesPerPixelSpinBox.setRange(0.1, 8.0)
+        self.samplesPerPixelSpinBox.setSingleStep(0.5)
+        self.samplesPerPixelSpinBox.setDecimals(2)
+        self.samplesPerPixelSpinBox.setValue(1.0)
+        self.samplesPerPixelSpinBox.setToolTip("Samples taken per pixel of line length. Above 1 oversamples, below 1 undersamples.")
+        sampling_layout.addRow("Samples per Pixel:", self.samplesPerPixelSpinBox)
+        self.bandWidthSpinBox = QtWidgets.QSpinBox()
+        self.bandWidthSpinBox.setRange(1, 101)
+        self.bandWidthSpinBox.setValue(1)
+        self.bandWidthSpinBox.setSuffix(" px")
+        self.bandWidthSpinBox.setToolTip("Width of the band sampled across the line. Above 1, pixels across the band are combined to reduce noise.")
+        sampling_layout.addRow("Band Width:", self.bandWidthSpinBox)
+        self.bandReducerComboBox = QtWidgets.QComboBox()
+        self.bandReducerComboBox.addItem("Mean", BandReducer.MEAN)
+        self.bandReducerComboBox.addItem("Maximum", BandReducer.MAX)
+        self.bandReducerComboBox.addItem("Median", BandReducer.MEDIAN)
+        self.bandReducerComboBox.setToolTip("How the pixels across the band are combined at each position along the line")
+        self.bandReducerComboBox.setEnabled(False)
+        sampling_layout.addRow("Combine Band By:", self.bandReducerComboBox)
+        main_layout.addWidget(sampling_group_box)
+
         # --- Dialog Buttons ---
         self.buttonBox = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.StandardButton.Ok | QtWidgets.QDialogButtonBox.StandardButton.Cancel
@@ -153,6 +227,8 @@ class KymographOptionsDialog(QtWidgets.QDialog):
         self.setStartFromCurrentButton.clicked.connect(self._set_start_from_current_video_pos)
         self.setEndFromCurrentButton.clicked.connect(self._set_end_from_current_video_pos)
 
+        self.bandWidthSpinBox.valueChanged.connect(lambda width: self.bandReducerComboBox.setEnabled(width > 1))
+
         self.buttonBox.accepted.connect(self.accept)
         self.buttonBox.rejected.connect(self.reject)
 
@@ -344,6 +420,10 @@ class KymographOptionsDialog(QtWidgets.QDialog):
         self.durationTimeDisplayLabel.setText(f"Duration: {self._format_time_ms(time_duration_ms)}")
 
     def _validate_inputs(self) -> bool:
+        if self.linesListWidget is not None and not self.get_selected_line_ids():
+            QtWidgets.QMessageBox.warning(self, "No Lines Selected", "Select at least one measurement line.")
+            return False
+
         if self._use_full_range:
             return True
 
@@ -393,4 +473,30 @@ class KymographOptionsDialog(QtWidgets.QDialog):
     def get_selected_range_0_based(self) -> Tuple[int, int]:
         if self._use_full_range:
             return 0, (self._total_frames - 1 if self._total_frames > 0 else 0)
-        return self._start_frame_0_based, self._end_frame_0_based
\ No newline at end of file
+        return self._start_frame_0_based, self._end_frame_0_based
+
+    def get_color_mode(self) -> DecodeColorMode:
+        return self.colorModeComboBox.currentData()
+
+    def get_interpolation(self) -> SampleInterpolation:
+        return self.interpolationComboBox.currentData()
+
+    def get_samples_per_pixel(self) -> float:
+        return self.samplesPerPixelSpinBox.value()
+
+    def get_band_width(self) -> int:
+        return self.bandWidthSpinBox.value()
+
+    def get_band_reducer(self) -> BandReducer:
+        return self.bandReducerComboBox.currentData()
+
+    def get_selected_line_ids(self) -> List[int]:
+        """IDs of the checked lines (batch generation only; empty otherwise)."""
+        if self.linesListWidget is None:
+            return []
+        return [self.linesListWidget.item(row).data(QtCore.Qt.ItemDataRole.UserRole)
+                for row in range(self.linesListWidget.count())
+                if self.linesListWidget.item(row).checkState() == QtCore.Qt.CheckState.Checked]
+
+    def get_export_combined(self) -> bool:
+        return self.exportCombinedCheckBox is not None and self.exportCombinedCheckBox.isChecked()
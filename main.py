@@ -8,6 +8,7 @@ instantiates and shows the MainWindow, and starts the Qt event loop.
 
 import sys
 import logging
+import multiprocessing
 import os
 # Import necessary types from typing module
 from typing import Optional
@@ -52,6 +53,8 @@ else:
 
 # Standard Python entry point check
 if __name__ == "__main__":
+    # Required for the parallel decode worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
 
     # Type hint for the application instance
     app: Optional[QtWidgets.QApplication] = None
@@ -29,8 +29,10 @@ from project_manager import ProjectManager
 import settings_manager as sm_module
 import graphics_utils
 from file_io import UnitSelectionDialog
-from kymograph_handler import KymographHandler
+from kymograph_handler import KymographHandler, export_kymographs_npz
 from kymograph_options_dialog import KymographOptionsDialog
+from image_sequence_dialog import ImageSequenceDialog
+import image_sequence_source
 from logging_config_utils import LoggingSettingsDialog, shutdown_logging
 
 logger = logging.getLogger(__name__)
@@ -64,6 +66,7 @@ class MainWindow(QtWidgets.QMainWindow):
     project_manager: ProjectManager
     settings_manager_instance: sm_module
     generateKymographAction: Optional[QtGui.QAction] = None
+    generateLineKymographsAction: Optional[QtGui.QAction] = None
     _kymograph_handler: Optional[KymographHandler] = None
 
     scale_panel_controller: Optional[ScalePanelController]
@@ -102,6 +105,7 @@ class MainWindow(QtWidgets.QMainWindow):
     rightPanelWidget: QtWidgets.QWidget
     frameSlider: QtWidgets.QSlider
     playPauseButton: QtWidgets.QPushButton
+    playbackRateComboBox: QtWidgets.QComboBox
     prevFrameButton: QtWidgets.QPushButton
     nextFrameButton: QtWidgets.QPushButton
     currentFrameLineEdit: QtWidgets.QLineEdit
@@ -182,6 +186,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
     _export_progress_dialog: Optional[QtWidgets.QProgressDialog] = None
     _kymograph_progress_dialog: Optional[QtWidgets.QProgressDialog] = None
+    _kymograph_batch_export_path: Optional[str] = None
+    _kymograph_request_start_frame: int = 0
 
     def __init__(self) -> None:
         super().__init__()
@@ -208,6 +214,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.project_manager.unsavedChangesStateChanged.connect(self._handle_unsaved_changes_state_changed)
 
         self._kymograph_handler = KymographHandler()
+        self._kymograph_request_lines: Dict[int, List[PointData]] = {} # Lines of the generation in progress, by ID
 
         self._setup_pens()
 
@@ -322,6 +329,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         if self.imageView:
             self.imageView.viewTransformChanged.connect(self._update_zoom_display)
+            self.imageView.viewTransformChanged.connect(self._check_proxy_frame_resolution)
 
         if hasattr(self, 'undoAction') and self.undoAction:
             self.undoAction.triggered.connect(self._trigger_undo_point_action)
@@ -430,7 +438,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.video_handler.videoLoaded.connect(self._handle_video_loaded)
         self.video_handler.videoLoadFailed.connect(self._handle_video_load_failed)
         self.video_handler.frameChanged.connect(self._handle_frame_changed)
+        self.video_handler.proxyFrameChanged.connect(self._handle_proxy_frame_changed)
         self.video_handler.playbackStateChanged.connect(self._handle_playback_state_changed)
+        self.video_handler.playbackStatsChanged.connect(self._handle_playback_stats_changed)
+        self.video_handler.frameTimesChanged.connect(self._handle_frame_times_changed)
+        self.video_handler.totalFramesChanged.connect(self._handle_total_frames_changed)
 
         if self.imageView:
             self.imageView.pointClicked.connect(self._handle_add_point_click)
@@ -496,8 +508,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
         if self.frameSlider:
             self.frameSlider.valueChanged.connect(self._slider_value_changed)
+            self.frameSlider.sliderReleased.connect(self._slider_released)
         if self.playPauseButton:
             self.playPauseButton.clicked.connect(self._toggle_playback)
+        if self.playbackRateComboBox:
+            self.playbackRateComboBox.currentIndexChanged.connect(self._playback_rate_changed)
         if self.prevFrameButton:
             self.prevFrameButton.clicked.connect(self._show_previous_frame)
         if self.nextFrameButton:
@@ -532,6 +547,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self._kymograph_handler.kymographGenerationStarted.connect(self._on_kymograph_generation_started)
             self._kymograph_handler.kymographGenerationProgress.connect(self._on_kymograph_generation_progress)
             self._kymograph_handler.kymographGenerationFinished.connect(self._on_kymograph_generation_finished)
+            self._kymograph_handler.kymographBatchFinished.connect(self._on_kymograph_batch_finished)
         else:
             logger.error("MainWindow __init__: _kymograph_handler is None, cannot connect signals.")
 
@@ -593,6 +609,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.openVideoAction.triggered.connect(self.open_video)
         file_menu.addAction(self.openVideoAction)
 
+        self.openImageSequenceAction = QtGui.QAction("Open &Image Sequence...", self)
+        self.openImageSequenceAction.setStatusTip("Load a folder of numbered images or a raw frame stack as a video")
+        self.openImageSequenceAction.triggered.connect(self.open_image_sequence)
+        file_menu.addAction(self.openImageSequenceAction)
+
         file_menu.addSeparator()
 
         if hasattr(self, 'loadProjectAction') and self.loadProjectAction:
@@ -694,6 +715,12 @@ class MainWindow(QtWidgets.QMainWindow):
         self.generateKymographAction.triggered.connect(self._trigger_generate_kymograph)
         analysis_menu.addAction(self.generateKymographAction)
 
+        self.generateLineKymographsAction = QtGui.QAction("Generate Kymographs for Lines...", self)
+        self.generateLineKymographsAction.setStatusTip("Generate kymographs for several measurement lines from one pass over the video")
+        self.generateLineKymographsAction.setEnabled(False)
+        self.generateLineKymographsAction.triggered.connect(self._trigger_generate_line_kymographs)
+        analysis_menu.addAction(self.generateLineKymographsAction)
+
         logger.debug("Analysis menu setup complete with Kymograph and Analyze Track actions.")
 
     def _find_or_create_action(self, 
@@ -1110,6 +1137,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         can_play: bool = is_video_loaded and self.fps > 0 and nav_enabled_during_action
         if self.playPauseButton: self.playPauseButton.setEnabled(can_play)
+        if self.playbackRateComboBox: self.playbackRateComboBox.setEnabled(can_play)
 
         if hasattr(self, 'currentFrameLineEdit') and self.currentFrameLineEdit is not None:
             self.currentFrameLineEdit.setEnabled(is_video_loaded and nav_enabled_during_action)
@@ -1134,9 +1162,11 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             self.analyzeTrackAction.setEnabled(can_analyze_track) 
 
+        is_generating_kymograph = self._kymograph_handler is not None and self._kymograph_handler.is_running
         if hasattr(self, 'generateKymographAction') and self.generateKymographAction:
             can_generate_kymograph = (
                 is_video_loaded and
+                not is_generating_kymograph and
                 not is_defining_any_specific_geometry and 
                 self.element_manager is not None and 
                 self.element_manager.get_active_element_type() == ElementType.MEASUREMENT_LINE and
@@ -1144,6 +1174,12 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             self.generateKymographAction.setEnabled(can_generate_kymograph)
 
+        if hasattr(self, 'generateLineKymographsAction') and self.generateLineKymographsAction:
+            self.generateLineKymographsAction.setEnabled(
+                is_video_loaded and not is_defining_any_specific_geometry and not is_generating_kymograph and
+                bool(self._get_kymograph_lines())
+            )
+
         if hasattr(self, 'newTrackButton') and self.newTrackButton:
             self.newTrackButton.setEnabled(can_create_new_element)
 
@@ -1155,7 +1191,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         if self.playPauseButton and self.stop_icon and self.play_icon:
             self.playPauseButton.setIcon(self.stop_icon if self.is_playing else self.play_icon)
-            self.playPauseButton.setToolTip("Stop Video (Space)" if self.is_playing else "Play Video (Space)")
+            self.playPauseButton.setToolTip("Stop Video (Space)" if self.is_playing else "Play Video (Space, Shift+Space for reverse)")
         
         can_interact_with_project = is_video_loaded or (self.project_manager and self.project_manager.get_current_project_filepath() is not None)
 
@@ -1248,7 +1284,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if hasattr(self, 'currentFrameLineEdit') and isinstance(self.currentFrameLineEdit, QtWidgets.QLineEdit): self.currentFrameLineEdit.blockSignals(True); self.currentFrameLineEdit.setReadOnly(True) ; self.currentFrameLineEdit.setText(str(frame_index + 1)); self.currentFrameLineEdit.deselect(); self.currentFrameLineEdit.blockSignals(False)
         if hasattr(self, 'totalFramesLabel') and isinstance(self.totalFramesLabel, QtWidgets.QLabel): self.totalFramesLabel.setText(f"/ {self.total_frames}")
         if hasattr(self, 'currentTimeLineEdit') and isinstance(self.currentTimeLineEdit, QtWidgets.QLineEdit):
-            current_ms = (frame_index / self.fps) * 1000 if self.fps > 0 else -1.0
+            current_ms = self.video_handler.frame_index_to_time_ms(frame_index) if self.fps > 0 else -1.0
             self.currentTimeLineEdit.blockSignals(True); self.currentTimeLineEdit.setReadOnly(True); self.currentTimeLineEdit.setText(self._format_time(current_ms)); self.currentTimeLineEdit.deselect(); self.currentTimeLineEdit.blockSignals(False)
         if hasattr(self, 'totalTimeLabel') and isinstance(self.totalTimeLabel, QtWidgets.QLabel): self.totalTimeLabel.setText(f"/ {self._format_time(self.total_duration_ms)}")
 
@@ -1285,60 +1321,78 @@ class MainWindow(QtWidgets.QMainWindow):
 
     @QtCore.Slot()
     def open_video(self) -> None:
-        logger.info("Open Video action triggered."); status_bar = self.statusBar(); proceed_with_file_dialog = False
-        if self.video_loaded: 
-            prompt_message = ("Opening a new video will close the current project and video. "
-                              "Any unsaved project changes will be lost.\n\nDo you want to proceed?") \
-                             if self.project_manager and self.project_manager.get_current_project_filepath() else \
-                             ("Opening a new video will close the current video. "
-                              "Any unsaved tracks will be lost.\n\nDo you want to proceed?")
-
-            if self.project_manager and self.project_manager.project_has_unsaved_changes():
-                logger.info("Open Video: Current project has unsaved changes. Triggering close project flow first.")
-                try:
-                    self._trigger_close_project() 
-                    if self.project_manager.project_has_unsaved_changes(): 
-                        logger.info("Open Video: Close project was cancelled. Aborting opening new video.")
-                        if status_bar: status_bar.showMessage("Open new video cancelled.", 3000)
-                        return
-                    proceed_with_file_dialog = True
-                except Exception as e: 
-                    logger.error(f"Error during _trigger_close_project call from open_video: {e}")
-                    proceed_with_file_dialog = False 
-            else: 
-                reply = QtWidgets.QMessageBox.question(self, "Confirm Open New Video", prompt_message,
-                                                       QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
-                                                       QtWidgets.QMessageBox.StandardButton.No)
-                if reply == QtWidgets.QMessageBox.StandardButton.Yes:
-                    proceed_with_file_dialog = True
-                elif status_bar:
-                    status_bar.showMessage("Open new video cancelled.", 3000)
-                    return
-        else: 
-            proceed_with_file_dialog = True
+        logger.info("Open Video action triggered."); status_bar = self.statusBar()
+        if not self._confirm_replace_current_video():
+            return
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Open Video File", "", "Video Files (*.mp4 *.avi *.mov *.mkv);;All Files (*)")
+        if not file_path:
+            if status_bar: status_bar.showMessage("Video loading cancelled.", 3000)
+            return
+        self._open_video_source(file_path)
 
-        if proceed_with_file_dialog:
-            file_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Open Video File", "", "Video Files (*.mp4 *.avi *.mov *.mkv);;All Files (*)")
-            if not file_path:
-                if status_bar: status_bar.showMessage("Video loading cancelled.", 3000)
-                return
-            
-            if self.project_manager and self.project_manager.get_current_project_filepath():
-                logger.info("Clearing previous project state before opening standalone video.")
-                self._release_video() 
-                self.project_manager.clear_project_state_for_close() 
-                self._reset_ui_after_video_close() 
+    @QtCore.Slot()
+    def open_image_sequence(self) -> None:
+        logger.info("Open Image Sequence action triggered."); status_bar = self.statusBar()
+        if not self._confirm_replace_current_video():
+            return
+        dialog = ImageSequenceDialog(self)
+        if dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
+            if status_bar: status_bar.showMessage("Image sequence loading cancelled.", 3000)
+            return
+        self._open_video_source(dialog.get_source(), dialog.get_sequence_options())
 
-            if self.video_loaded: 
-                self._release_video()
+    def _confirm_replace_current_video(self) -> bool:
+        """Asks to close the current video/project before opening another. Returns True to proceed."""
+        status_bar = self.statusBar()
+        if not self.video_loaded:
+            return True
+        prompt_message = ("Opening a new video will close the current project and video. "
+                          "Any unsaved project changes will be lost.\n\nDo you want to proceed?") \
+                         if self.project_manager and self.project_manager.get_current_project_filepath() else \
+                         ("Opening a new video will close the current video. "
+                          "Any unsaved tracks will be lost.\n\nDo you want to proceed?")
 
-            if status_bar: status_bar.showMessage(f"Opening video: {os.path.basename(file_path)}...", 0)
-            QtWidgets.QApplication.processEvents()
-            self.video_handler.open_video(file_path)
+        if self.project_manager and self.project_manager.project_has_unsaved_changes():
+            logger.info("Open Video: Current project has unsaved changes. Triggering close project flow first.")
+            try:
+                self._trigger_close_project() 
+                if self.project_manager.project_has_unsaved_changes(): 
+                    logger.info("Open Video: Close project was cancelled. Aborting opening new video.")
+                    if status_bar: status_bar.showMessage("Open new video cancelled.", 3000)
+                    return False
+                return True
+            except Exception as e: 
+                logger.error(f"Error during _trigger_close_project call from open_video: {e}")
+                return False
+        reply = QtWidgets.QMessageBox.question(self, "Confirm Open New Video", prompt_message,
+                                               QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
+                                               QtWidgets.QMessageBox.StandardButton.No)
+        if reply == QtWidgets.QMessageBox.StandardButton.Yes:
+            return True
+        if status_bar: status_bar.showMessage("Open new video cancelled.", 3000)
+        return False
+
+    def _open_video_source(self, file_path: str, sequence_options: Optional[Dict[str, Any]] = None) -> None:
+        status_bar = self.statusBar()
+        if self.project_manager and self.project_manager.get_current_project_filepath():
+            logger.info("Clearing previous project state before opening standalone video.")
+            self._release_video() 
+            self.project_manager.clear_project_state_for_close() 
+            self._reset_ui_after_video_close() 
+
+        if self.video_loaded: 
+            self._release_video()
+
+        if status_bar: status_bar.showMessage(f"Opening video: {os.path.basename(os.path.normpath(file_path))}...", 0)
+        QtWidgets.QApplication.processEvents()
+        self.video_handler.open_video(file_path, sequence_options)
 
 
     def _release_video(self) -> None:
         logger.info("Releasing video resources and resetting state...")
+        if self._kymograph_handler and self._kymograph_handler.is_running:
+            if self._kymograph_progress_dialog: self._kymograph_progress_dialog.cancel() # Finishes quietly, without an error box
+            self._kymograph_handler.shutdown()
         self.video_handler.release_video(); self.video_loaded = False; self.total_frames = 0; self.current_frame_index = -1; self.fps = 0.0
         self.total_duration_ms = 0.0; self.video_filepath = ""; self.frame_width = 0; self.frame_height = 0; self.is_playing = False
         self.element_manager.reset(); self.scale_manager.reset(); self._reset_ui_after_video_close()
@@ -1514,7 +1568,11 @@ class MainWindow(QtWidgets.QMainWindow):
                     potential_video_path = os.path.join(project_dir, saved_video_filename_from_project)
                     logger.info(f"Project specifies video: '{saved_video_filename_from_project}'. Attempting to open from: '{potential_video_path}'.")
                     
-                    self.video_handler.open_video(potential_video_path) 
+                    sequence_options = project_metadata.get(config.META_SEQUENCE_OPTIONS)
+                    if sequence_options is None and image_sequence_source.is_image_sequence_source(potential_video_path):
+                        sequence_options = {image_sequence_source.OPTION_FPS: float(project_metadata.get(config.META_FPS, 0.0))}
+                    self.video_handler.open_video(potential_video_path, sequence_options,
+                                                  project_metadata.get(config.META_DECODE_BACKEND)) 
                     video_loaded_for_this_project = self.video_handler.is_loaded 
     
                     if video_loaded_for_this_project:
@@ -1609,6 +1667,8 @@ class MainWindow(QtWidgets.QMainWindow):
                     # This call will only emit if state changes from True to False,
                     # or it will re-emit False to ensure UI (like window title) is correct.
                     self.project_manager.mark_project_as_loaded(load_path) 
+                    if self.project_manager.points_retimed_on_load():
+                        self.project_manager.set_project_dirty(True) # Retimed points differ from the file
                 else:
                     # If load failed but we had a path, it's complex.
                     # Simplest is to ensure UI reflects no valid project.
@@ -1642,6 +1702,7 @@ class MainWindow(QtWidgets.QMainWindow):
     @QtCore.Slot()
     def _handle_settings_applied(self) -> None:
         logger.info("MainWindow: Settings applied, refreshing visuals.")
+        self.video_handler.reload_performance_settings()
         self._setup_pens()
         if self.imageView and hasattr(self.imageView, '_scale_bar_widget') and self.imageView._scale_bar_widget:
             self.imageView._scale_bar_widget.update_appearance_from_settings()
@@ -1655,24 +1716,40 @@ class MainWindow(QtWidgets.QMainWindow):
 
     @QtCore.Slot(int)
     def _slider_value_changed(self, value: int) -> None:
-        if self.video_loaded and self.current_frame_index != value: self.video_handler.seek_frame(value)
+        if self.video_loaded and self.current_frame_index != value:
+            self.video_handler.request_seek(value, preview=bool(self.frameSlider and self.frameSlider.isSliderDown()))
+
+    @QtCore.Slot()
+    def _slider_released(self) -> None:
+        if self.video_loaded: self.video_handler.show_full_resolution_frame()
+
+    @QtCore.Slot()
+    def _check_proxy_frame_resolution(self) -> None:
+        # A proxy frame zoomed in beyond its own resolution would look soft; show the real frame.
+        if self.video_loaded and self.imageView and self.video_handler.is_showing_proxy_frame and \
+           self.imageView.transform().m11() > self.video_handler.proxy_scale:
+            self.video_handler.show_full_resolution_frame()
 
     @QtCore.Slot(int)
     def _handle_frame_step(self, step: int) -> None:
-        if self.video_loaded: self.video_handler.next_frame() if step > 0 else self.video_handler.previous_frame()
+        if self.video_loaded: self.video_handler.request_step(step)
 
     @QtCore.Slot()
     def _show_previous_frame(self) -> None:
-        if self.video_loaded: self.video_handler.previous_frame()
+        if self.video_loaded: self.video_handler.request_step(-1)
 
     @QtCore.Slot()
     def _show_next_frame(self) -> None:
-        if self.video_loaded: self.video_handler.next_frame()
+        if self.video_loaded: self.video_handler.request_step(1)
 
     @QtCore.Slot()
     def _toggle_playback(self) -> None:
         if self.video_loaded and self.fps > 0: self.video_handler.toggle_playback()
 
+    @QtCore.Slot()
+    def _toggle_reverse_playback(self) -> None:
+        if self.video_loaded and self.fps > 0: self.video_handler.toggle_playback(direction=-1)
+
     @QtCore.Slot()
     def _update_zoom_display(self) -> None:
         if not self.video_loaded or not hasattr(self, 'imageView') or not hasattr(self, 'zoomLevelLineEdit') or self.zoomLevelLineEdit is None:
@@ -1744,13 +1821,22 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.statusBar(): self.statusBar().showMessage("Error loading video", 5000)
         self._release_video()
 
+    @QtCore.Slot(QtGui.QPixmap, int, int)
+    def _handle_frame_changed(self, pixmap: QtGui.QPixmap, frame_index: int, request_id: int) -> None:
+        if request_id != self.video_handler.latest_seek_request_id: return # Superseded while queued
+        self._display_frame(pixmap, frame_index)
+
     @QtCore.Slot(QtGui.QPixmap, int)
-    def _handle_frame_changed(self, pixmap: QtGui.QPixmap, frame_index: int) -> None:
+    def _handle_proxy_frame_changed(self, pixmap: QtGui.QPixmap, frame_index: int) -> None:
+        self._display_frame(pixmap, frame_index,
+                            QtCore.QSize(self.video_handler.frame_width, self.video_handler.frame_height))
+
+    def _display_frame(self, pixmap: QtGui.QPixmap, frame_index: int, scene_size: Optional[QtCore.QSize] = None) -> None:
         if not self.video_loaded: return
         self.current_frame_index = frame_index
         if self.imageView:
-            self.imageView.setPixmap(pixmap)
-            current_time_ms = (self.current_frame_index / self.fps) * 1000 if self.fps > 0 else 0.0
+            self.imageView.setPixmap(pixmap, scene_size)
+            current_time_ms = self.video_handler.frame_index_to_time_ms(self.current_frame_index) if self.fps > 0 else 0.0
             self.imageView.set_info_overlay_current_frame_time(self.current_frame_index, current_time_ms)
         self._update_ui_for_frame(frame_index); self._redraw_scene_overlay()
         if self.imageView and self.scale_manager and hasattr(self, 'showScaleBarCheckBox') and self.showScaleBarCheckBox and self.showScaleBarCheckBox.isChecked():
@@ -1762,11 +1848,49 @@ class MainWindow(QtWidgets.QMainWindow):
         self.is_playing = is_playing; status_bar = self.statusBar()
         if self.playPauseButton and self.stop_icon and self.play_icon:
             self.playPauseButton.setIcon(self.stop_icon if self.is_playing else self.play_icon)
-            self.playPauseButton.setToolTip("Stop Video (Space)" if self.is_playing else "Play Video (Space)")
+            self.playPauseButton.setToolTip("Stop Video (Space)" if self.is_playing else "Play Video (Space, Shift+Space for reverse)")
             if self.is_playing and status_bar: status_bar.showMessage("Playing...", 0)
             elif status_bar: status_bar.showMessage("Stopped." if self.video_loaded else "Ready.", 3000)
         self._update_ui_state()
 
+    @QtCore.Slot(float, float, int)
+    def _handle_playback_stats_changed(self, display_fps: float, achieved_speed: float, skipped_frames: int) -> None:
+        status_bar = self.statusBar()
+        if not self.is_playing or not status_bar: return
+        message = f"Playing at {self.video_handler.playback_rate:g}x: {display_fps:.1f} fps displayed, {achieved_speed:.2f}x real time"
+        if skipped_frames > 0: message += f", {skipped_frames} frames skipped"
+        status_bar.showMessage(message, 0)
+
+    @QtCore.Slot(int)
+    def _handle_total_frames_changed(self, total_frames: int) -> None:
+        if not self.video_loaded: return
+        self.total_frames = total_frames; self.total_duration_ms = self.video_handler.total_duration_ms
+        if self.frameSlider:
+            self.frameSlider.blockSignals(True); self.frameSlider.setMaximum(max(0, total_frames - 1)); self.frameSlider.blockSignals(False)
+        if self.imageView:
+            self.imageView.set_info_overlay_video_data(filename=os.path.basename(os.path.normpath(self.video_filepath)), total_frames=self.total_frames, total_duration_ms=self.total_duration_ms)
+        if self.table_data_controller: self.table_data_controller.set_video_loaded_status(True, self.total_frames)
+        if 0 <= self.current_frame_index < total_frames: self._update_ui_for_frame(self.current_frame_index)
+        status_bar = self.statusBar()
+        if status_bar: status_bar.showMessage(f"Frame count corrected to {total_frames} decodable frames.", 5000)
+
+    @QtCore.Slot()
+    def _handle_frame_times_changed(self) -> None:
+        if not self.video_loaded: return
+        self.total_duration_ms = self.video_handler.total_duration_ms
+        if self.imageView:
+            self.imageView.set_info_overlay_video_data(filename=os.path.basename(os.path.normpath(self.video_filepath)), total_frames=self.total_frames, total_duration_ms=self.total_duration_ms)
+        retimed_points = self.element_manager.retime_points(self.video_handler.frame_index_to_time_ms)
+        if retimed_points: logger.info(f"Corrected the times of {retimed_points} points from the video's frame timestamps.")
+        if self.current_frame_index >= 0:
+            self._update_ui_for_frame(self.current_frame_index)
+            if self.imageView: self.imageView.set_info_overlay_current_frame_time(self.current_frame_index, self.video_handler.frame_index_to_time_ms(self.current_frame_index))
+
+    @QtCore.Slot(int)
+    def _playback_rate_changed(self, index: int) -> None:
+        rate = self.playbackRateComboBox.itemData(index)
+        if rate is not None: self.video_handler.set_playback_rate(float(rate))
+
     @QtCore.Slot(float, float)
     def _handle_add_point_click(self, x: float, y: float) -> None:
         if self._is_defining_measurement_line: logger.debug("_handle_add_point_click: Ignoring as currently defining a measurement line."); return
@@ -1777,7 +1901,7 @@ class MainWindow(QtWidgets.QMainWindow):
             if status_bar: status_bar.showMessage("Cannot add point: No video loaded.", 3000); return
         if self.element_manager.active_element_index == -1:
             if status_bar: status_bar.showMessage("Select a track to add points.", 3000); return
-        time_ms = (self.current_frame_index / self.fps) * 1000 if self.fps > 0 else -1.0
+        time_ms = self.video_handler.frame_index_to_time_ms(self.current_frame_index) if self.fps > 0 else -1.0
         if self.element_manager.add_point(self.current_frame_index, time_ms, x, y):
             x_d, y_d = self.coord_transformer.transform_point_for_display(x,y); active_id = self.element_manager.get_active_element_id()
             msg = f"Point for Track {active_id} on Frame {self.current_frame_index+1}: ({x_d:.1f}, {y_d:.1f})"
@@ -1911,7 +2035,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.element_manager.active_element_index == -1 or self.element_manager.get_active_element_type() != ElementType.MEASUREMENT_LINE:
             logger.warning("No active measurement line. Cancelling."); self._cancel_active_line_definition_ui_reset(); return
         logger.info(f"Measurement Line: First point for ID {self.element_manager.get_active_element_id()} at ({scene_x:.2f}, {scene_y:.2f}) on frame {self._current_line_definition_frame_index}")
-        time_ms = (self._current_line_definition_frame_index / self.fps) * 1000 if self.fps > 0 else 0.0
+        time_ms = self.video_handler.frame_index_to_time_ms(self._current_line_definition_frame_index) if self.fps > 0 else 0.0
         if self.element_manager.add_point(self._current_line_definition_frame_index, time_ms, scene_x, scene_y):
             active_line_id = self.element_manager.get_active_element_id()
             if status_bar: status_bar.showMessage(f"Line {active_line_id} - First point. Click second point on Frame {self._current_line_definition_frame_index + 1}. (Esc to cancel)", 0)
@@ -1930,7 +2054,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.element_manager.active_element_index == -1 or self.element_manager.get_active_element_type() != ElementType.MEASUREMENT_LINE or self.element_manager._defining_element_first_point_data is None:
             logger.warning("No active measurement line or first point not set. Cancelling."); self._cancel_active_line_definition_ui_reset(); return
         logger.info(f"Measurement Line: Second point for ID {self.element_manager.get_active_element_id()} at ({p2x:.2f}, {p2y:.2f}) on frame {self._current_line_definition_frame_index}")
-        time_ms = (self._current_line_definition_frame_index / self.fps) * 1000 if self.fps > 0 else 0.0
+        time_ms = self.video_handler.frame_index_to_time_ms(self._current_line_definition_frame_index) if self.fps > 0 else 0.0
         if self.element_manager.add_point(self._current_line_definition_frame_index, time_ms, p2x, p2y):
             active_line_id = self.element_manager.get_active_element_id()
             if status_bar: status_bar.showMessage(f"Measurement Line {active_line_id} defined.", 3000)
@@ -2148,8 +2272,11 @@ class MainWindow(QtWidgets.QMainWindow):
             if self.imageView and self.imageView.viewport():
                 self.imageView.viewport().update()
 
-    def _can_enable_kymograph_action(self) -> bool:
-        """Checks if conditions are met to enable the generate kymograph action."""
+    def _can_enable_kymograph_action(self, require_active_line: bool = True) -> bool:
+        """
+        Checks if conditions are met to enable the generate kymograph action, or with
+        require_active_line=False, the batch action (which needs any complete line).
+        """
         if not self.video_loaded:
             return False
         
@@ -2160,9 +2287,12 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.coord_panel_controller and hasattr(self.coord_panel_controller, 'is_setting_origin_mode'):
             is_defining_any_specific_geometry = is_defining_any_specific_geometry or self.coord_panel_controller.is_setting_origin_mode()
 
-        if is_defining_any_specific_geometry:
+        if is_defining_any_specific_geometry or (self._kymograph_handler and self._kymograph_handler.is_running):
             return False
 
+        if not require_active_line:
+            return bool(self._get_kymograph_lines())
+
         active_element_idx = self.element_manager.active_element_index
         if active_element_idx == -1 or \
            self.element_manager.get_active_element_type() != ElementType.MEASUREMENT_LINE:
@@ -2225,6 +2355,7 @@ class MainWindow(QtWidgets.QMainWindow):
             total_frames=self.total_frames,
             fps=self.fps,
             current_frame_idx=self.current_frame_index,
+            supports_gray16=self.video_handler.supports_gray16,
             parent=self
         )
 
@@ -2235,17 +2366,87 @@ class MainWindow(QtWidgets.QMainWindow):
             # Call KymographHandler, results will be emitted via signals
             # No need for try-finally here for cursor, as it's handled by start/finish slots now.
             if self._kymograph_handler:
+                 self._kymograph_request_lines = {self.element_manager.get_active_element_id(): active_line_data}
+                 self._kymograph_request_start_frame = start_frame_idx
                  self._kymograph_handler.generate_kymograph_data(
                     line_points_data=active_line_data, # type: ignore
                     video_handler=self.video_handler,
                     start_frame_idx=start_frame_idx,
-                    end_frame_idx=end_frame_idx
+                    end_frame_idx=end_frame_idx,
+                    color_mode=options_dialog.get_color_mode(),
+                    interpolation=options_dialog.get_interpolation(),
+                    samples_per_pixel=options_dialog.get_samples_per_pixel(),
+                    band_width=options_dialog.get_band_width(),
+                    band_reducer=options_dialog.get_band_reducer()
                 )
             # The rest of the logic (displaying dialog) is now in _on_kymograph_generation_finished
         else:
             if status_bar: status_bar.showMessage("Kymograph generation cancelled by user (options dialog).", 3000)
             logger.info("Kymograph generation cancelled by user in options dialog.")
 
+    def _get_kymograph_lines(self) -> Dict[int, List[PointData]]:
+        """Endpoints of every measurement line that has both points, keyed by line ID."""
+        if self.element_manager is None:
+            return {}
+        return {el['id']: el['data'] for el in self.element_manager.get_elements_by_type(ElementType.MEASUREMENT_LINE)
+                if len(el.get('data', [])) == 2}
+
+    @QtCore.Slot()
+    def _trigger_generate_line_kymographs(self) -> None:
+        """Handles the 'Generate Kymographs for Lines' menu action: one decode pass for all chosen lines."""
+        logger.info("Generate Kymographs for Lines action triggered.")
+        status_bar = self.statusBar()
+
+        if not self.video_loaded or not self._kymograph_handler:
+            QtWidgets.QMessageBox.warning(self, "Kymograph Error", "A video must be loaded to generate kymographs.")
+            return
+
+        lines = self._get_kymograph_lines()
+        if not lines:
+            QtWidgets.QMessageBox.information(self, "Generate Kymographs", "There are no complete measurement lines.")
+            return
+
+        options_dialog = KymographOptionsDialog(
+            total_frames=self.total_frames,
+            fps=self.fps,
+            current_frame_idx=self.current_frame_index,
+            supports_gray16=self.video_handler.supports_gray16,
+            lines=[(line_id, f"Line {line_id}") for line_id in sorted(lines)],
+            parent=self
+        )
+        if options_dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
+            if status_bar: status_bar.showMessage("Kymograph generation cancelled by user (options dialog).", 3000)
+            return
+
+        export_path: Optional[str] = None
+        if options_dialog.get_export_combined():
+            base_video_name = os.path.splitext(os.path.basename(self.video_filepath))[0] if self.video_filepath else "video"
+            start_dir = os.path.dirname(self.video_filepath) if self.video_filepath and os.path.isdir(os.path.dirname(self.video_filepath)) else os.getcwd()
+            export_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Kymographs", os.path.join(start_dir, f"{base_video_name}_kymographs.npz"),
+                                                                   "NumPy Archives (*.npz);;All Files (*)")
+            if not export_path:
+                if status_bar: status_bar.showMessage("Kymograph generation cancelled.", 3000)
+                return
+            if not export_path.lower().endswith(".npz"): export_path += ".npz"
+
+        start_frame_idx, end_frame_idx = options_dialog.get_selected_range_0_based()
+        selected_lines = {line_id: lines[line_id] for line_id in options_dialog.get_selected_line_ids()}
+        logger.info(f"Batch kymograph options accepted. Lines: {sorted(selected_lines)}, Range: {start_frame_idx} - {end_frame_idx}")
+        self._kymograph_request_lines = selected_lines
+        self._kymograph_batch_export_path = export_path
+        self._kymograph_request_start_frame = start_frame_idx
+        self._kymograph_handler.generate_kymographs_for_lines(
+            lines=selected_lines,
+            video_handler=self.video_handler,
+            start_frame_idx=start_frame_idx,
+            end_frame_idx=end_frame_idx,
+            color_mode=options_dialog.get_color_mode(),
+            interpolation=options_dialog.get_interpolation(),
+            samples_per_pixel=options_dialog.get_samples_per_pixel(),
+            band_width=options_dialog.get_band_width(),
+            band_reducer=options_dialog.get_band_reducer()
+        )
+
     @QtCore.Slot()
     def _trigger_open_track_analysis_dialog(self) -> None:
         logger.info("Analyze Track action triggered.")
@@ -2394,6 +2595,8 @@ class MainWindow(QtWidgets.QMainWindow):
         logger.info("Kymograph generation started.")
         if self.generateKymographAction:
             self.generateKymographAction.setEnabled(False)
+        if self.generateLineKymographsAction:
+            self.generateLineKymographsAction.setEnabled(False)
         
         self._kymograph_progress_dialog = QtWidgets.QProgressDialog(
             "Generating kymograph...", "Cancel", 0, 100, self
@@ -2401,15 +2604,17 @@ class MainWindow(QtWidgets.QMainWindow):
         self._kymograph_progress_dialog.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
         self._kymograph_progress_dialog.setWindowTitle("Kymograph Generation")
         self._kymograph_progress_dialog.setValue(0)
+        self._kymograph_progress_dialog.setAutoClose(False) # Closed by the finished handler
+        self._kymograph_progress_dialog.setAutoReset(False)
+        if self._kymograph_handler:
+            # Generation runs on a worker thread, which stops at the next frame and delivers what it has.
+            self._kymograph_progress_dialog.canceled.connect(self._kymograph_handler.cancel)
         self._kymograph_progress_dialog.show()
         
         status_bar = self.statusBar()
         if status_bar:
             status_bar.showMessage("Generating kymograph...", 0) # Persistent message
         
-        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
-        QtWidgets.QApplication.processEvents()
-
     @QtCore.Slot(str, int, int)
     def _on_kymograph_generation_progress(self, message: str, current_value: int, max_value: int) -> None:
         """Updates the kymograph generation progress dialog."""
@@ -2418,80 +2623,108 @@ class MainWindow(QtWidgets.QMainWindow):
                 self._kymograph_progress_dialog.setMaximum(max_value)
             self._kymograph_progress_dialog.setValue(current_value)
             self._kymograph_progress_dialog.setLabelText(message)
-            
-            if self._kymograph_progress_dialog.wasCanceled():
-                # Basic cancellation handling; KymographHandler itself doesn't yet support early termination
-                logger.info("Kymograph generation cancelled by user via progress dialog (effect after current step).")
-                # More sophisticated cancellation would require KymographHandler to check a flag.
-        QtWidgets.QApplication.processEvents()
 
-    @QtCore.Slot(object, str) # object is for Optional[np.ndarray]
-    def _on_kymograph_generation_finished(self, kymo_data_np: Optional[np.ndarray], message: str) -> None:
-        """Handles the completion of kymograph generation."""
-        logger.info(f"Kymograph generation finished. Message: {message}")
-        
+    def _end_kymograph_progress(self, message: str) -> bool:
+        """Closes the progress dialog and restores the UI after generation. Returns True if the user cancelled."""
         was_cancelled = False
         if self._kymograph_progress_dialog:
             was_cancelled = self._kymograph_progress_dialog.wasCanceled()
             self._kymograph_progress_dialog.close()
             self._kymograph_progress_dialog = None
         
-        QtWidgets.QApplication.restoreOverrideCursor()
-        
         status_bar = self.statusBar()
         if status_bar:
             status_bar.showMessage(message, 5000)
 
         if self.generateKymographAction:
             self.generateKymographAction.setEnabled(self._can_enable_kymograph_action()) # Re-evaluate based on state
+        if self.generateLineKymographsAction:
+            self.generateLineKymographsAction.setEnabled(self._can_enable_kymograph_action(require_active_line=False))
 
         if was_cancelled:
-            logger.info("Kymograph generation was cancelled. No kymograph will be displayed.")
-            if status_bar: status_bar.showMessage("Kymograph generation cancelled.", 3000)
-            return
+            logger.info("Kymograph generation was cancelled. Any frames sampled before cancelling will be displayed.")
+        return was_cancelled
+
+    def _show_kymograph_dialog(self, kymo_data_np: np.ndarray, line_id: int, line_data: List[PointData],
+                               start_frame_idx: int) -> None:
+        """Opens a (non-modal) display dialog for a generated kymograph of the given line, starting at start_frame_idx."""
+        video_filename = os.path.basename(self.video_filepath) if self.video_filepath else "Untitled Video"
+        
+        p1_tl_x, p1_tl_y = line_data[0][2], line_data[0][3]
+        p2_tl_x, p2_tl_y = line_data[1][2], line_data[1][3]
+        
+        p1_cs_x, p1_cs_y = self.coord_transformer.transform_point_for_display(p1_tl_x, p1_tl_y)
+        p2_cs_x, p2_cs_y = self.coord_transformer.transform_point_for_display(p2_tl_x, p2_tl_y)
+        
+        line_pixel_length_cs = math.sqrt((p2_cs_x - p1_cs_x)**2 + (p2_cs_y - p1_cs_y)**2)
+        total_line_dist_val, dist_units_str = self.scale_manager.transform_value_for_display(line_pixel_length_cs)
+        # Span of the kymograph's frames from the per-frame timestamps (correct for VFR footage), through the end of its last frame.
+        start_time_ms, end_time_ms = self.video_handler.frame_index_to_time_ms(
+            np.array([start_frame_idx, start_frame_idx + kymo_data_np.shape[0]]))
+        total_vid_duration_s = max(0.0, float(end_time_ms - start_time_ms) / 1000.0)
+        
+        kymo_dialog = KymographDisplayDialog(
+            kymograph_data=kymo_data_np,
+            line_id=line_id,
+            video_filename=video_filename,
+            total_line_distance=total_line_dist_val,
+            distance_units=dist_units_str,
+            total_video_duration_seconds=total_vid_duration_s,
+            total_frames_in_kymo=kymo_data_np.shape[0],      
+            num_distance_points_in_kymo=kymo_data_np.shape[1],
+            parent=self
+        )
+        kymo_dialog.show()
+
+    @QtCore.Slot(object, str) # object is for Optional[np.ndarray]
+    def _on_kymograph_generation_finished(self, kymo_data_np: Optional[np.ndarray], message: str) -> None:
+        """Handles the completion of kymograph generation."""
+        logger.info(f"Kymograph generation finished. Message: {message}")
+        
+        lines, self._kymograph_request_lines = self._kymograph_request_lines, {}
+        was_cancelled = self._end_kymograph_progress(message)
 
         if kymo_data_np is not None:
             logger.info(f"Kymograph data received successfully (shape: {kymo_data_np.shape}). Opening display.")
-            if KymographDisplayDialog is not None:
-                active_element_idx = self.element_manager.active_element_index
-                active_line_data = self.element_manager.elements[active_element_idx].get('data')
-                if not active_line_data or len(active_line_data) != 2: # Should not happen if checks in _trigger pass
-                    logger.error("Error in _on_kymograph_generation_finished: Active line data became invalid.")
-                    QtWidgets.QMessageBox.critical(self, "Kymograph Error", "Internal error: Line data became invalid during generation.")
-                    return
-
-                line_id = self.element_manager.get_active_element_id()
-                video_filename = os.path.basename(self.video_filepath) if self.video_filepath else "Untitled Video"
-                
-                p1_tl_x, p1_tl_y = active_line_data[0][2], active_line_data[0][3]
-                p2_tl_x, p2_tl_y = active_line_data[1][2], active_line_data[1][3]
-                
-                p1_cs_x, p1_cs_y = self.coord_transformer.transform_point_for_display(p1_tl_x, p1_tl_y)
-                p2_cs_x, p2_cs_y = self.coord_transformer.transform_point_for_display(p2_tl_x, p2_tl_y)
-                
-                line_pixel_length_cs = math.sqrt((p2_cs_x - p1_cs_x)**2 + (p2_cs_y - p1_cs_y)**2)
-                total_line_dist_val, dist_units_str = self.scale_manager.transform_value_for_display(line_pixel_length_cs)
-                total_vid_duration_s = kymo_data_np.shape[0] * (1.0 / self.fps) if self.fps > 0 else 0.0 # Use actual kymo frames for duration
-                
-                kymo_dialog = KymographDisplayDialog(
-                    kymograph_data=kymo_data_np,
-                    line_id=line_id,
-                    video_filename=video_filename,
-                    total_line_distance=total_line_dist_val,
-                    distance_units=dist_units_str,
-                    total_video_duration_seconds=total_vid_duration_s,
-                    total_frames_in_kymo=kymo_data_np.shape[0],      
-                    num_distance_points_in_kymo=kymo_data_np.shape[1],
-                    parent=self
-                )
-                kymo_dialog.show()
+            if KymographDisplayDialog is not None and lines:
+                line_id, line_data = next(iter(lines.items()))
+                self._show_kymograph_dialog(kymo_data_np, line_id, line_data, self._kymograph_request_start_frame)
             else:
                 logger.warning("KymographDisplayDialog is not available. Cannot display kymograph.")
                 QtWidgets.QMessageBox.information(self, "Kymograph Generated", "Kymograph data generated, but display dialog is not available.")
-        else:
-            if not was_cancelled: # Only show error if not explicitly cancelled by user
-                logger.warning("Kymograph data is None after generation attempt (and not cancelled).")
+        elif not was_cancelled: # Only show error if not explicitly cancelled by user
+            logger.warning("Kymograph data is None after generation attempt (and not cancelled).")
+            QtWidgets.QMessageBox.warning(self, "Kymograph Error", f"Kymograph generation failed: {message}")
+
+    @QtCore.Slot(object, str) # object is for Optional[Dict[int, np.ndarray]]
+    def _on_kymograph_batch_finished(self, kymographs: Optional[Dict[int, np.ndarray]], message: str) -> None:
+        """Handles the completion of batch kymograph generation: saves the combined file if requested, then shows each kymograph."""
+        logger.info(f"Batch kymograph generation finished. Message: {message}")
+        lines, export_path = self._kymograph_request_lines, self._kymograph_batch_export_path
+        self._kymograph_request_lines, self._kymograph_batch_export_path = {}, None
+
+        was_cancelled = self._end_kymograph_progress(message)
+
+        if not kymographs:
+            if not was_cancelled:
+                logger.warning("No kymographs after batch generation attempt (and not cancelled).")
                 QtWidgets.QMessageBox.warning(self, "Kymograph Error", f"Kymograph generation failed: {message}")
+            return
+
+        if export_path and was_cancelled:
+            logger.info("Batch kymograph generation was cancelled; the partial kymographs are not saved.")
+        elif export_path:
+            if export_kymographs_npz(export_path, kymographs, lines, self._kymograph_request_start_frame, self.fps):
+                if self.statusBar(): self.statusBar().showMessage(f"{message} Saved to {os.path.basename(export_path)}.", 5000)
+            else:
+                QtWidgets.QMessageBox.warning(self, "Kymograph Export Error", f"Could not save the kymographs to:\n{export_path}")
+
+        if KymographDisplayDialog is None:
+            logger.warning("KymographDisplayDialog is not available. Cannot display kymographs.")
+            QtWidgets.QMessageBox.information(self, "Kymographs Generated", "Kymograph data generated, but display dialog is not available.")
+            return
+        for line_id in sorted(kymographs):
+            self._show_kymograph_dialog(kymographs[line_id], line_id, lines[line_id], self._kymograph_request_start_frame)
 
 
     @QtCore.Slot()
@@ -2607,7 +2840,10 @@ class MainWindow(QtWidgets.QMainWindow):
         elif key == QtCore.Qt.Key.Key_Space:
             if self.video_loaded and self.playPauseButton and self.playPauseButton.isEnabled():
                 nav_disabled = (self.scale_panel_controller and hasattr(self.scale_panel_controller, '_is_setting_scale_by_line') and self.scale_panel_controller._is_setting_scale_by_line) or self._is_defining_measurement_line
-                if not nav_disabled: self._toggle_playback(); accepted = True
+                if not nav_disabled:
+                    if modifiers & QtCore.Qt.KeyboardModifier.ShiftModifier: self._toggle_reverse_playback()
+                    else: self._toggle_playback()
+                    accepted = True
         elif key == QtCore.Qt.Key.Key_Delete or key == QtCore.Qt.Key.Key_Backspace:
             if self.video_loaded and self.element_manager.active_element_index != -1 and self.current_frame_index != -1:
                 deleted = self.element_manager.delete_point(self.element_manager.active_element_index, self.current_frame_index)
@@ -2634,7 +2870,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     line_edit_to_process.setReadOnly(False)
                     if is_frame_edit and self.current_frame_index >= 0: line_edit_to_process.setText(str(self.current_frame_index + 1))
                     elif is_time_edit and self.current_frame_index >= 0:
-                        current_ms = (self.current_frame_index / self.fps) * 1000 if self.fps > 0 else -1.0
+                        current_ms = self.video_handler.frame_index_to_time_ms(self.current_frame_index) if self.fps > 0 else -1.0
                         line_edit_to_process.setText(self._format_time(current_ms))
                     elif is_zoom_edit:
                         if self.imageView and self.imageView.get_min_view_scale() > 0:
@@ -2669,7 +2905,10 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             meta = self.video_handler.get_metadata_dictionary()
             if not meta: QtWidgets.QMessageBox.information(self, "Video Information", "Could not retrieve metadata."); return
-            dialog = MetadataDialog(meta, self); dialog.exec()
+            dialog = MetadataDialog(meta, self)
+            self.video_handler.videoMetadataUpdated.connect(dialog.update_metadata) # Probing may still be running
+            try: dialog.exec()
+            finally: self.video_handler.videoMetadataUpdated.disconnect(dialog.update_metadata)
         except Exception as e: QtWidgets.QMessageBox.critical(self, "Error", f"Could not display video info:\\n{e}")
 
     @QtCore.Slot()
@@ -100,6 +100,12 @@ class MetadataDialog(QtWidgets.QDialog):
 
         logger.debug(f"Populated MetadataDialog table with {row} items.")
 
+    @QtCore.Slot(dict)
+    def update_metadata(self, metadata_dict: Dict[str, Any]) -> None:
+        """Replaces the displayed metadata, e.g. when background probing completes."""
+        self._metadata = metadata_dict
+        self.populate_data()
+
 
     @QtCore.Slot(QtCore.QPoint)
     def _show_table_context_menu(self, pos: QtCore.QPoint) -> None:
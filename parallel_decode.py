@@ -0,0 +1,202 @@
+# parallel_decode.py
+"""
+Multi-process decoding of frame ranges for batch passes (kymographs, export).
+
+The range is split into chunks whose boundaries fall on keyframes, so every
+worker starts decoding at a keyframe and no frame is decoded twice. Each chunk
+is decoded by a pool process with its own capture and written into a
+shared-memory block owned by the parent; only chunk ids and validity flags are
+pickled. Frames are yielded in order.
+"""
+import logging
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple, Dict
+
+import cv2 # type: ignore
+import numpy as np
+
+import config
+from decode_profile import DecodeProfile, DecodeColorMode, BGR8_PROFILE
+from capture_source import open_capture, residual_profile
+from image_sequence_source import ImageSequenceCapture
+from video_index import keyframe_at_or_before
+
+logger = logging.getLogger(__name__)
+
+# (chunk_id, seek_index, first_index, last_index)
+ChunkPlan = Tuple[int, int, int, int]
+
+def plan_chunks(start_frame_idx: int,
+                end_frame_idx: int,
+                step: int,
+                frames_per_chunk: int,
+                keyframes: Optional[np.ndarray] = None) -> List[ChunkPlan]:
+    """
+    Splits start..end (inclusive, every step-th frame) into chunks of about
+    frames_per_chunk output frames. With a keyframe index, each boundary is
+    moved back to the nearest keyframe so a chunk's seek target is its own
+    first frame wherever possible.
+    """
+    chunks: List[ChunkPlan] = []
+    frames_per_chunk = max(1, frames_per_chunk)
+    has_keyframes = keyframes is not None and keyframes.size > 0
+    first = start_frame_idx
+    while first <= end_frame_idx:
+        next_first = first + frames_per_chunk * step
+        if has_keyframes and next_first <= end_frame_idx:
+            keyframe = keyframe_at_or_before(keyframes, next_first)
+            if keyframe > first:
+                # Next chunk starts on the first grid frame at or after the keyframe.
+                next_first = first + math.ceil((keyframe - first) / step) * step
+        last = min(next_first - step, end_frame_idx)
+        # Same seek point as the GUI's _DecoderCursor; without an index, seek straight to the chunk.
+        seek_index = keyframe_at_or_before(keyframes, first) if has_keyframes else first
+        chunks.append((len(chunks), seek_index, first, last))
+        first = next_first
+    return chunks
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    # The parent owns (and unlinks) every block. Workers share the parent's
+    # resource tracker, so attaching must not hand ownership to them.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False) # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def iter_chunk_frames(filepath: str,
+                      sequence_options: Optional[dict],
+                      decode_backend: Optional[str],
+                      ffmpeg_threads: int,
+                      seek_index: int,
+                      first_index: int,
+                      last_index: int,
+                      step: int,
+                      profile: DecodeProfile) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Decodes one chunk (see plan_chunks) in the calling process with its own
+    capture, yielding (frame_index, frame) with the profile applied. Stops at
+    the first frame that cannot be decoded.
+    """
+    capture = open_capture(filepath, sequence_options, decode_backend, ffmpeg_threads, profile)
+    frame_profile = residual_profile(capture, profile)
+    try:
+        if not capture.isOpened():
+            return
+        if profile.color_mode == DecodeColorMode.GRAY16 and \
+           not (isinstance(capture, ImageSequenceCapture) and capture.set_native_gray16(True)):
+            return
+        if getattr(capture, "seeks_exactly", False):
+            seek_index = first_index # No need to start at the keyframe
+        position = 0
+        if seek_index > 0:
+            if not capture.set(cv2.CAP_PROP_POS_FRAMES, float(seek_index)):
+                return
+            position = seek_index
+        for frame_index in range(first_index, last_index + 1, step):
+            while position < frame_index:
+                if not capture.grab():
+                    return
+                position += 1
+            ret, frame = capture.read()
+            position += 1
+            if not ret or frame is None:
+                return
+            yield frame_index, frame_profile.apply(frame)
+    finally:
+        capture.release()
+
+def _decode_chunk(task: tuple) -> Tuple[int, List[bool]]:
+    """Worker entry point: decodes one chunk into its shared-memory block."""
+    (chunk_id, filepath, sequence_options, decode_backend, ffmpeg_threads, seek_index, first_index, last_index,
+     step, profile, shm_name, frame_shape) = task
+    frame_indices = range(first_index, last_index + 1, step)
+    valid = [False] * len(frame_indices)
+    shm = attach_shared_memory(shm_name)
+    try:
+        output = np.ndarray((len(frame_indices),) + tuple(frame_shape), dtype=profile.dtype, buffer=shm.buf)
+        for frame_index, frame in iter_chunk_frames(filepath, sequence_options, decode_backend, ffmpeg_threads,
+                                                    seek_index, first_index, last_index, step, profile):
+            if frame.shape == tuple(frame_shape) and frame.dtype == profile.dtype:
+                slot = (frame_index - first_index) // step
+                output[slot] = frame
+                valid[slot] = True
+        return chunk_id, valid
+    finally:
+        output = None # Release the buffer export before closing the block
+        shm.close()
+
+def iter_frames_parallel(filepath: str,
+                         start_frame_idx: int,
+                         end_frame_idx: int,
+                         frame_shape: Tuple[int, ...],
+                         workers: int,
+                         step: int = 1,
+                         profile: DecodeProfile = BGR8_PROFILE,
+                         keyframes: Optional[np.ndarray] = None,
+                         sequence_options: Optional[dict] = None,
+                         decode_backend: Optional[str] = None,
+                         ffmpeg_threads: int = 0) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+    """
+    Yields (frame_index, frame) for start..end like VideoHandler.iter_frames,
+    decoding chunks on a pool of worker processes.
+
+    frame_shape is the shape of each yielded frame after the decode profile
+    (crop and colour mode) is applied; the profile's ROI must already be
+    clipped to the frame. Frames that fail to decode are yielded as None.
+    Closing the generator early terminates the pool and frees all shared memory.
+    """
+    frame_bytes = int(np.prod(frame_shape)) * profile.dtype.itemsize
+    frames_per_chunk = max(config.PARALLEL_DECODE_MIN_CHUNK_FRAMES,
+                           config.PARALLEL_DECODE_CHUNK_BYTES // max(1, frame_bytes))
+    total_output_frames = len(range(start_frame_idx, end_frame_idx + 1, step))
+    # Keep every worker busy even on short ranges.
+    frames_per_chunk = min(frames_per_chunk, max(1, math.ceil(total_output_frames / workers)))
+    chunks = plan_chunks(start_frame_idx, end_frame_idx, step, frames_per_chunk, keyframes)
+    logger.info(f"Parallel decode of {total_output_frames} frames in {len(chunks)} chunks on {workers} processes.")
+
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(processes=workers)
+    blocks: Dict[int, shared_memory.SharedMemory] = {}
+    pending: Dict[int, "multiprocessing.pool.AsyncResult"] = {}
+    next_to_submit = 0
+
+    def submit_next() -> None:
+        nonlocal next_to_submit
+        chunk_id, seek_index, first, last = chunks[next_to_submit]
+        count = len(range(first, last + 1, step))
+        block = shared_memory.SharedMemory(create=True, size=max(1, count * frame_bytes))
+        blocks[chunk_id] = block
+        pending[chunk_id] = pool.apply_async(
+            _decode_chunk,
+            ((chunk_id, filepath, sequence_options, decode_backend, ffmpeg_threads,
+              seek_index, first, last, step, profile, block.name, tuple(frame_shape)),))
+        next_to_submit += 1
+
+    try:
+        for chunk_id, _seek_index, first, last in chunks:
+            # Bound memory in flight to one chunk per worker plus the one being consumed.
+            while next_to_submit < len(chunks) and next_to_submit <= chunk_id + workers:
+                submit_next()
+            _result_id, valid = pending.pop(chunk_id).get()
+            block = blocks[chunk_id]
+            frame_indices = range(first, last + 1, step)
+            output = np.ndarray((len(frame_indices),) + tuple(frame_shape), dtype=profile.dtype, buffer=block.buf)
+            try:
+                for slot, frame_index in enumerate(frame_indices):
+                    yield frame_index, (output[slot].copy() if valid[slot] else None)
+            finally:
+                output = None
+                blocks.pop(chunk_id).close()
+                block.unlink()
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        for block in blocks.values():
+            try:
+                block.close()
+                block.unlink()
+            except (OSError, BufferError) as e:
+                logger.debug(f"Could not free shared memory block '{block.name}': {e}")
@@ -0,0 +1,151 @@
+# parallel_kymograph.py
+"""
+Multi-process kymograph generation for long frame ranges.
+
+As in parallel_decode, the range is split into keyframe-aligned chunks and
+each chunk is decoded by a pool process with its own capture. Here the worker
+also samples every line, writing the kymograph rows straight into
+shared-memory blocks owned by the parent, so decoded frames never leave the
+worker; only chunk ids and row flags are pickled. The parent copies finished
+chunks into the caller's result arrays in order.
+"""
+import logging
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import cv2 # type: ignore
+import numpy as np
+
+import config
+from decode_profile import DecodeProfile
+from kymograph_sampling import LineSampler
+from parallel_decode import attach_shared_memory, iter_chunk_frames, plan_chunks
+
+logger = logging.getLogger(__name__)
+
+def kymograph_chunk_frames(total_frames: int, workers: int) -> int:
+    """Frames per chunk: several chunks per worker for load balancing, capped so progress and cancellation stay prompt."""
+    frames = math.ceil(total_frames / max(1, workers * config.KYMOGRAPH_CHUNKS_PER_WORKER))
+    return max(config.PARALLEL_DECODE_MIN_CHUNK_FRAMES, min(frames, config.KYMOGRAPH_MAX_CHUNK_FRAMES))
+
+def _sample_chunk(task: tuple) -> Tuple[int, np.ndarray]:
+    """Worker entry point: decodes one chunk and writes each line's rows into its shared-memory block."""
+    (chunk_id, filepath, sequence_options, decode_backend, ffmpeg_threads, seek_index, first_index, last_index,
+     profile, frame_roi, samplers, shm_names) = task
+    sampled = np.zeros(last_index - first_index + 1, dtype=bool)
+    blocks = {line_id: attach_shared_memory(name) for line_id, name in shm_names.items()}
+    try:
+        rows = {line_id: np.ndarray((sampled.size,) + sampler.strip_shape(profile.is_gray), dtype=profile.dtype,
+                                    buffer=blocks[line_id].buf)
+                for line_id, sampler in samplers.items()}
+        for frame_index, frame in iter_chunk_frames(filepath, sequence_options, decode_backend, ffmpeg_threads,
+                                                    seek_index, first_index, last_index, 1, profile):
+            slot = frame_index - first_index
+            try:
+                for line_id, sampler in samplers.items():
+                    rows[line_id][slot] = sampler.sample_within(frame, frame_roi)
+                sampled[slot] = True
+            except (cv2.error, ValueError):
+                pass # Row stays zero, as in the sequential path
+        return chunk_id, sampled
+    finally:
+        rows = None # Release the buffer exports before closing the blocks
+        for block in blocks.values():
+            block.close()
+
+def sample_lines_parallel(kymographs: Dict[int, np.ndarray],
+                          samplers: Dict[int, LineSampler],
+                          start_frame_idx: int,
+                          end_frame_idx: int,
+                          frame_roi: Tuple[int, int, int, int],
+                          profile: DecodeProfile,
+                          workers: int,
+                          filepath: str,
+                          keyframes: Optional[np.ndarray] = None,
+                          sequence_options: Optional[dict] = None,
+                          decode_backend: Optional[str] = None,
+                          ffmpeg_threads: int = 0,
+                          is_cancelled: Callable[[], bool] = lambda: False,
+                          progress_callback: Optional[Callable[[int, int], Any]] = None) -> Tuple[int, int, bool]:
+    """
+    Samples every line over start..end (inclusive) on a pool of worker processes.
+
+    Args:
+        kymographs: Preallocated (frames, ...) result array per line ID, filled in place.
+        samplers: LineSampler per line ID; their ROIs must lie inside frame_roi.
+        frame_roi: The crop of profile (already clipped to the frame).
+        filepath .. ffmpeg_threads: The source, as from VideoHandler.decode_source_options().
+        is_cancelled: Polled while waiting for chunks; stops the pass when True.
+        progress_callback: Called with (frames done, total frames) as chunks finish.
+
+    Returns:
+        (frames done, frames sampled, cancelled). Frames are completed in order,
+        so rows before "frames done" are final; later rows are zero.
+    """
+    total_frames = end_frame_idx - start_frame_idx + 1
+    chunks = plan_chunks(start_frame_idx, end_frame_idx, 1, kymograph_chunk_frames(total_frames, workers), keyframes)
+    row_bytes = {line_id: int(np.prod(sampler.strip_shape(profile.is_gray))) * profile.dtype.itemsize
+                 for line_id, sampler in samplers.items()}
+    logger.info(f"Parallel kymograph of {total_frames} frames x {len(samplers)} line(s) in {len(chunks)} chunks "
+                f"on {workers} processes.")
+
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(processes=workers)
+    blocks: Dict[int, Dict[int, shared_memory.SharedMemory]] = {} # chunk_id -> line_id -> rows
+    pending: Dict[int, "multiprocessing.pool.AsyncResult"] = {}
+    next_to_submit = 0
+    frames_done = 0
+    sampled_count = 0
+
+    def submit_next() -> None:
+        nonlocal next_to_submit
+        chunk_id, seek_index, first, last = chunks[next_to_submit]
+        count = last - first + 1
+        blocks[chunk_id] = {line_id: shared_memory.SharedMemory(create=True, size=max(1, count * nbytes))
+                            for line_id, nbytes in row_bytes.items()}
+        pending[chunk_id] = pool.apply_async(
+            _sample_chunk,
+            ((chunk_id, filepath, sequence_options, decode_backend, ffmpeg_threads, seek_index, first, last,
+              profile, frame_roi, samplers, {line_id: block.name for line_id, block in blocks[chunk_id].items()}),))
+        next_to_submit += 1
+
+    def free_chunk(chunk_id: int) -> None:
+        for block in blocks.pop(chunk_id, {}).values():
+            try:
+                block.close()
+                block.unlink()
+            except (OSError, BufferError) as e:
+                logger.debug(f"Could not free shared memory block '{block.name}': {e}")
+
+    try:
+        for chunk_id, _seek_index, first, last in chunks:
+            # Keep every worker busy with one chunk queued behind it, bounding shared memory in flight.
+            while next_to_submit < len(chunks) and next_to_submit <= chunk_id + 2 * workers:
+                submit_next()
+            result = pending.pop(chunk_id)
+            while not result.ready():
+                if is_cancelled():
+                    logger.info(f"Parallel kymograph cancelled after {frames_done} of {total_frames} frames.")
+                    return frames_done, sampled_count, True
+                result.wait(config.KYMOGRAPH_PROGRESS_INTERVAL_S)
+            _result_id, sampled = result.get()
+            rows_first, rows_last = first - start_frame_idx, last - start_frame_idx + 1
+            for line_id, block in blocks[chunk_id].items():
+                rows = np.ndarray((sampled.size,) + samplers[line_id].strip_shape(profile.is_gray),
+                                  dtype=profile.dtype, buffer=block.buf)
+                kymographs[line_id][rows_first:rows_last] = rows
+                rows = None
+            free_chunk(chunk_id)
+            frames_done = rows_last
+            sampled_count += int(np.count_nonzero(sampled))
+            if progress_callback is not None:
+                progress_callback(frames_done, total_frames)
+        pool.close()
+        return frames_done, sampled_count, False
+    finally:
+        pool.terminate()
+        pool.join()
+        for chunk_id in list(blocks):
+            free_chunk(chunk_id)
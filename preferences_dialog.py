@@ -79,6 +79,7 @@ class PreferencesDialog(QtWidgets.QDialog):
         self._create_scales_tab()
         self._create_info_overlays_tab()
         self._create_measurement_lines_tab() # <-- NEW: Call to create the Measurement Lines tab
+        self._create_performance_tab()
 
         button_box = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.StandardButton.Ok |
@@ -269,6 +270,104 @@ class PreferencesDialog(QtWidgets.QDialog):
             self.tab_widget.addTab(measure_lines_tab_widget, "Measurement Lines")
     # --- END NEW METHOD ---
 
+    def _create_performance_tab(self) -> None:
+        performance_tab_widget = QtWidgets.QWidget()
+        performance_main_layout = QtWidgets.QVBoxLayout(performance_tab_widget)
+        performance_main_layout.setSpacing(15)
+
+        cache_group = QtWidgets.QGroupBox("Decoded Frame Cache")
+        cache_layout = QtWidgets.QFormLayout(cache_group)
+        cache_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        cache_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        cache_layout.setHorizontalSpacing(10)
+        cache_layout.setVerticalSpacing(8)
+
+        self._add_setting_to_form(cache_layout, "Memory Budget (MB):", settings_manager.KEY_FRAME_CACHE_BUDGET_MB, "int_spinbox", {"min_val": 0, "max_val": 65536, "step": 256, "tooltip": "Memory reserved for recently decoded frames, shared by display, kymographs and export. 0 disables the cache."})
+        performance_main_layout.addWidget(cache_group)
+
+        prefetch_group = QtWidgets.QGroupBox("Playback Read-Ahead")
+        prefetch_layout = QtWidgets.QFormLayout(prefetch_group)
+        prefetch_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        prefetch_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        prefetch_layout.setHorizontalSpacing(10)
+        prefetch_layout.setVerticalSpacing(8)
+
+        self._add_setting_to_form(prefetch_layout, "Decode Frames in Background:", settings_manager.KEY_PREFETCH_ENABLED, "checkbox", {"tooltip": "Decode upcoming frames on a worker thread during playback and frame stepping."})
+        self._add_setting_to_form(prefetch_layout, "Read-Ahead Depth (frames):", settings_manager.KEY_PREFETCH_DEPTH, "int_spinbox", {"min_val": 1, "max_val": 256, "step": 1, "tooltip": "Maximum number of frames decoded ahead of the playhead. Each frame uses as much memory as one decoded video frame."})
+        performance_main_layout.addWidget(prefetch_group)
+
+        index_group = QtWidgets.QGroupBox("Video Indexing")
+        index_layout = QtWidgets.QFormLayout(index_group)
+        index_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        index_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        index_layout.setHorizontalSpacing(10)
+        index_layout.setVerticalSpacing(8)
+
+        self._add_setting_to_form(index_layout, "Build Keyframe Index:", settings_manager.KEY_BUILD_KEYFRAME_INDEX, "checkbox", {"tooltip": "Scan each newly opened video for keyframes in the background for faster, frame-accurate seeking. The index is saved next to the video and reused."})
+        self._add_setting_to_form(index_layout, "Build Timestamp Index:", settings_manager.KEY_BUILD_TIMESTAMP_INDEX, "checkbox", {"tooltip": "Read the presentation time of every frame in the background, so times stay correct for variable-frame-rate footage (e.g. phones and drones). Saved with the keyframe index."})
+        self._add_setting_to_form(index_layout, "Verify Frame Count:", settings_manager.KEY_VERIFY_FRAME_COUNT, "checkbox", {"tooltip": "Count the decodable frames of each newly opened video in the background and correct the frame count the file reports, so the last frames never fail to read. The count is saved with the video's index."})
+        performance_main_layout.addWidget(index_group)
+
+        proxy_group = QtWidgets.QGroupBox("Scrubbing Proxy")
+        proxy_layout = QtWidgets.QFormLayout(proxy_group)
+        proxy_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        proxy_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        proxy_layout.setHorizontalSpacing(10)
+        proxy_layout.setVerticalSpacing(8)
+
+        self._add_setting_to_form(proxy_layout, "Use Low-Resolution Proxy:", settings_manager.KEY_PROXY_ENABLED, "checkbox", {"tooltip": "Build a downscaled copy of each opened video in the background and show it while the frame slider is dragged. Takes effect for the next opened video."})
+        self._add_setting_to_form(proxy_layout, "Proxy Size (longest side, px):", settings_manager.KEY_PROXY_MAX_DIMENSION, "int_spinbox", {"min_val": 240, "max_val": 1920, "step": 80, "tooltip": "Resolution of the proxy's longest side."})
+        performance_main_layout.addWidget(proxy_group)
+
+        parallel_group = QtWidgets.QGroupBox("Batch Decoding")
+        parallel_layout = QtWidgets.QFormLayout(parallel_group)
+        parallel_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        parallel_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        parallel_layout.setHorizontalSpacing(10)
+        parallel_layout.setVerticalSpacing(8)
+
+        self._add_setting_to_form(parallel_layout, "Decoder Processes:", settings_manager.KEY_DECODE_WORKERS, "int_spinbox", {"min_val": 0, "max_val": 64, "step": 1, "tooltip": "Number of worker processes used to decode long frame ranges for kymographs and video export. 0 or 1 decodes in the application process."})
+        performance_main_layout.addWidget(parallel_group)
+
+        store_group = QtWidgets.QGroupBox("Decoded Frame Disk Cache")
+        store_layout = QtWidgets.QFormLayout(store_group)
+        store_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        store_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        store_layout.setHorizontalSpacing(10)
+        store_layout.setVerticalSpacing(8)
+
+        self._add_setting_to_form(store_layout, "Decode Once to Disk:", settings_manager.KEY_DECODE_STORE_ENABLED, "checkbox", {"tooltip": "Keep every decoded frame in a memory-mapped scratch file so later kymographs, exports and seeks need no decoding. Reused while the video file is unchanged. Takes effect for the next opened video."})
+        self._add_setting_to_form(store_layout, "Store Grayscale Only:", settings_manager.KEY_DECODE_STORE_GRAYSCALE, "checkbox", {"tooltip": "Store frames as 8-bit grayscale (one third of the disk space). Colour is lost for all views of the video while enabled."})
+        self._add_setting_to_form(store_layout, "Disk Cap (GB):", settings_manager.KEY_DECODE_STORE_MAX_GB, "int_spinbox", {"min_val": 1, "max_val": 4096, "step": 5, "tooltip": "Maximum total size of all stores; least recently used stores are deleted first. Videos larger than the cap are not stored."})
+        performance_main_layout.addWidget(store_group)
+
+        backend_group = QtWidgets.QGroupBox("Decoder Backend")
+        backend_layout = QtWidgets.QFormLayout(backend_group)
+        backend_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        backend_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        backend_layout.setHorizontalSpacing(10)
+        backend_layout.setVerticalSpacing(8)
+
+        self._add_setting_to_form(backend_layout, "Decode with FFmpeg:", settings_manager.KEY_FFMPEG_DECODER_ENABLED, "checkbox", {"tooltip": "Open newly loaded videos with a local ffmpeg binary (found on PATH) instead of OpenCV. ffmpeg crops and converts to grayscale before frames reach PyroTracker during kymograph passes. Falls back to OpenCV when ffmpeg is not installed. Projects reopen with the decoder they were saved with."})
+        self._add_setting_to_form(backend_layout, "FFmpeg Decoder Threads:", settings_manager.KEY_FFMPEG_THREADS, "int_spinbox", {"min_val": 0, "max_val": 64, "step": 1, "tooltip": "Threads per ffmpeg decoder. 0 lets ffmpeg choose."})
+        performance_main_layout.addWidget(backend_group)
+
+        kymograph_cache_group = QtWidgets.QGroupBox("Kymograph Cache")
+        kymograph_cache_layout = QtWidgets.QFormLayout(kymograph_cache_group)
+        kymograph_cache_layout.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
+        kymograph_cache_layout.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        kymograph_cache_layout.setHorizontalSpacing(10)
+        kymograph_cache_layout.setVerticalSpacing(8)
+
+        self._add_setting_to_form(kymograph_cache_layout, "Cache Kymographs on Disk:", settings_manager.KEY_KYMOGRAPH_CACHE_ENABLED, "checkbox", {"tooltip": "Keep generated kymographs in compressed files so repeating a kymograph with the same video, line, range and sampling options loads it instead of decoding the video again."})
+        self._add_setting_to_form(kymograph_cache_layout, "Disk Cap (MB):", settings_manager.KEY_KYMOGRAPH_CACHE_MAX_MB, "int_spinbox", {"min_val": 16, "max_val": 1048576, "step": 256, "tooltip": "Maximum total size of cached kymographs; least recently used ones are deleted first."})
+        performance_main_layout.addWidget(kymograph_cache_group)
+
+        performance_main_layout.addStretch()
+
+        if self.tab_widget:
+            self.tab_widget.addTab(performance_tab_widget, "Performance")
+
     def _load_settings(self) -> None:
         logger.debug("Loading settings into PreferencesDialog widgets.")
         for key, widget in self.setting_widgets.items():
@@ -46,6 +46,7 @@ class ProjectManager(QtCore.QObject):
         self._current_project_filepath: Optional[str] = None
         self._has_unsaved_changes: bool = False
         self._is_loading_project: bool = False
+        self._points_retimed_on_load: int = 0
 
         logger.info("ProjectManager initialized.")
 
@@ -62,6 +63,10 @@ class ProjectManager(QtCore.QObject):
         """Returns True if there are unsaved changes, False otherwise."""
         return self._has_unsaved_changes
 
+    def points_retimed_on_load(self) -> int:
+        """Returns how many points of the last applied project got new times from the video's frame timestamps."""
+        return self._points_retimed_on_load
+
     def set_project_dirty(self, dirty: bool = True) -> None:
         """
         Sets the project's dirty state (unsaved changes).
@@ -135,6 +140,10 @@ class ProjectManager(QtCore.QObject):
             metadata[config.META_FRAMES] = video_info.get('total_frames', 0)
             metadata[config.META_FPS] = video_info.get('fps', 0.0)
             metadata[config.META_DURATION] = video_info.get('duration_ms', 0.0)
+            if video_info.get('sequence_options') is not None:
+                metadata[config.META_SEQUENCE_OPTIONS] = video_info['sequence_options']
+            else:
+                metadata[config.META_DECODE_BACKEND] = video_info.get('decode_backend')
         else:
             metadata[config.META_FILENAME] = "N/A"; metadata[config.META_WIDTH] = 0
             metadata[config.META_HEIGHT] = 0; metadata[config.META_FRAMES] = 0
@@ -376,11 +385,21 @@ class ProjectManager(QtCore.QObject):
         video_context_fps_for_elements = actual_fps
         if video_context_width_for_elements <= 0 or video_context_height_for_elements <= 0 or video_context_frames_for_elements <= 0:
              apply_warnings.append("Video context for element validation is invalid. Point validation may be unreliable.")
+        video_handler = self._main_window_ref.video_handler
+        frame_to_time_ms = video_handler.frame_index_to_time_ms if video_handler and video_handler.has_frame_timestamps else None
         _success_elements, element_warnings = self._element_manager.load_elements_from_project_data(
             elements_to_load, video_context_width_for_elements, video_context_height_for_elements,
-            video_context_frames_for_elements, video_context_fps_for_elements
+            video_context_frames_for_elements, video_context_fps_for_elements, frame_to_time_ms
         )
         apply_warnings.extend(element_warnings)
+        self._points_retimed_on_load = 0
+        if frame_to_time_ms is not None:
+            # Points saved before the video's timestamps were known carry nominal-FPS times.
+            self._points_retimed_on_load = self._element_manager.retime_points(frame_to_time_ms)
+            if self._points_retimed_on_load:
+                retime_message = f"Corrected the times of {self._points_retimed_on_load} points from the video's frame timestamps."
+                logger.info(retime_message)
+                apply_warnings.append(retime_message)
 
         # --- NEW: Apply Scale Analysis State ---
         loaded_scale_analysis_state = loaded_state_dict.get('scale_analysis_state')
@@ -0,0 +1,94 @@
+# seek_worker.py
+"""
+Background decoding of interactive seek targets (slider drags, held arrow keys).
+"""
+import logging
+import threading
+from typing import Callable, Optional, Any
+
+from PySide6 import QtCore
+
+logger = logging.getLogger(__name__)
+
+class FrameSeekWorker(QtCore.QObject):
+    """
+    Decodes seek targets on a worker thread, latest-wins.
+
+    The GUI thread posts (request_id, frame_index) pairs with request(); the
+    worker only ever holds one pending target, so a burst of requests collapses
+    into decoding whichever target was posted last. Each decoded frame is
+    reported through frameDecoded(request_id, frame_index, frame), delivered to
+    the GUI thread by a queued connection. frame is None if decoding failed.
+
+    Like FramePrefetcher, the worker owns its own decoder, created through
+    cursor_factory on the worker thread; the cursor must provide
+    read_frame(index) and release().
+    """
+    frameDecoded = QtCore.Signal(int, int, object)
+
+    def __init__(self,
+                 cursor_factory: Callable[[], Optional[Any]],
+                 parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self._cursor_factory = cursor_factory
+        self._condition = threading.Condition()
+        self._pending: Optional[tuple] = None # (request_id, frame_index) not yet picked up
+        self._stop_requested: bool = False
+        self._thread: Optional[threading.Thread] = None
+
+    def request(self, request_id: int, frame_index: int) -> None:
+        """Replaces any pending target with frame_index."""
+        with self._condition:
+            if self._pending is not None:
+                logger.debug(f"Seek target {self._pending[1]} superseded by {frame_index}.")
+            self._pending = (request_id, frame_index)
+            self._condition.notify_all()
+        self._ensure_thread()
+
+    def stop(self) -> None:
+        """Stops the worker thread and releases its decoder. Pending targets are dropped."""
+        with self._condition:
+            self._stop_requested = True
+            self._pending = None
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            if self._thread.is_alive():
+                logger.warning("Frame seek thread did not stop within timeout.")
+        self._thread = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_requested = False
+        self._thread = threading.Thread(target=self._run, name="FrameSeekWorker", daemon=True)
+        self._thread.start()
+        logger.debug("Frame seek thread started.")
+
+    def _run(self) -> None:
+        cursor = self._cursor_factory()
+        if cursor is None:
+            logger.error("Frame seek worker could not open its own decoder.")
+            with self._condition:
+                pending, self._pending = self._pending, None
+            if pending is not None:
+                self.frameDecoded.emit(pending[0], pending[1], None)
+            return
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._stop_requested or self._pending is not None)
+                    if self._stop_requested:
+                        break
+                    request_id, frame_index = self._pending
+                    self._pending = None
+                frame = cursor.read_frame(frame_index)
+                with self._condition:
+                    if self._stop_requested:
+                        break
+                self.frameDecoded.emit(request_id, frame_index, frame)
+        except Exception as e:
+            logger.exception(f"Frame seek thread failed: {e}")
+        finally:
+            cursor.release()
+            logger.debug("Frame seek thread exited and released its decoder.")
@@ -59,6 +59,24 @@ KEY_SHOW_MEASUREMENT_LINE_LENGTHS = f"{MEASUREMENT_LINES_GROUP}/showMeasurementL
 PROJECT_STATE_GROUP = "project_state"
 KEY_LAST_PROJECT_DIRECTORY = f"{PROJECT_STATE_GROUP}/lastProjectDirectory"
 
+PERFORMANCE_GROUP = "performance"
+KEY_FRAME_CACHE_BUDGET_MB = f"{PERFORMANCE_GROUP}/frameCacheBudgetMB"
+KEY_PREFETCH_ENABLED = f"{PERFORMANCE_GROUP}/prefetchEnabled"
+KEY_PREFETCH_DEPTH = f"{PERFORMANCE_GROUP}/prefetchDepth"
+KEY_BUILD_KEYFRAME_INDEX = f"{PERFORMANCE_GROUP}/buildKeyframeIndex"
+KEY_BUILD_TIMESTAMP_INDEX = f"{PERFORMANCE_GROUP}/buildTimestampIndex"
+KEY_VERIFY_FRAME_COUNT = f"{PERFORMANCE_GROUP}/verifyFrameCount"
+KEY_PROXY_ENABLED = f"{PERFORMANCE_GROUP}/proxyEnabled"
+KEY_PROXY_MAX_DIMENSION = f"{PERFORMANCE_GROUP}/proxyMaxDimension"
+KEY_DECODE_WORKERS = f"{PERFORMANCE_GROUP}/decodeWorkers"
+KEY_DECODE_STORE_ENABLED = f"{PERFORMANCE_GROUP}/decodeStoreEnabled"
+KEY_DECODE_STORE_GRAYSCALE = f"{PERFORMANCE_GROUP}/decodeStoreGrayscale"
+KEY_DECODE_STORE_MAX_GB = f"{PERFORMANCE_GROUP}/decodeStoreMaxGB"
+KEY_FFMPEG_DECODER_ENABLED = f"{PERFORMANCE_GROUP}/ffmpegDecoderEnabled"
+KEY_FFMPEG_THREADS = f"{PERFORMANCE_GROUP}/ffmpegThreads"
+KEY_KYMOGRAPH_CACHE_ENABLED = f"{PERFORMANCE_GROUP}/kymographCacheEnabled"
+KEY_KYMOGRAPH_CACHE_MAX_MB = f"{PERFORMANCE_GROUP}/kymographCacheMaxMB"
+
 # --- BEGIN MODIFICATION: Logging Setting Keys --- [cite: 5]
 LOGGING_GROUP = "logging"
 KEY_LOGGING_ENABLED = f"{LOGGING_GROUP}/enabled"
@@ -108,6 +126,23 @@ DEFAULT_SETTINGS = {
 
     KEY_LAST_PROJECT_DIRECTORY: "",
 
+    KEY_FRAME_CACHE_BUDGET_MB: 1024,
+    KEY_PREFETCH_ENABLED: True,
+    KEY_PREFETCH_DEPTH: 8,
+    KEY_BUILD_KEYFRAME_INDEX: True,
+    KEY_BUILD_TIMESTAMP_INDEX: True,
+    KEY_VERIFY_FRAME_COUNT: True,
+    KEY_PROXY_ENABLED: False,
+    KEY_PROXY_MAX_DIMENSION: 960,
+    KEY_DECODE_WORKERS: 0,
+    KEY_DECODE_STORE_ENABLED: False,
+    KEY_DECODE_STORE_GRAYSCALE: False,
+    KEY_DECODE_STORE_MAX_GB: 20,
+    KEY_FFMPEG_DECODER_ENABLED: False,
+    KEY_FFMPEG_THREADS: 0,
+    KEY_KYMOGRAPH_CACHE_ENABLED: True,
+    KEY_KYMOGRAPH_CACHE_MAX_MB: 2048,
+
     # --- BEGIN MODIFICATION: Logging Default Settings --- [cite: 6]
     KEY_LOGGING_ENABLED: False,
     KEY_LOGGING_FILE_PATH: "", # Default to empty, setup_logging will use get_default_log_path
@@ -44,11 +44,17 @@ def setup_main_window_ui(main_window: 'MainWindow') -> None:
     main_window.play_icon = style.standardIcon(QtWidgets.QStyle.StandardPixmap.SP_MediaPlay)
     main_window.stop_icon = style.standardIcon(QtWidgets.QStyle.StandardPixmap.SP_MediaStop)
     main_window.playPauseButton = QtWidgets.QPushButton(main_window.play_icon, "")
-    main_window.playPauseButton.setToolTip("Play/Pause Video (Space)")
+    main_window.playPauseButton.setToolTip("Play/Pause Video (Space, Shift+Space for reverse)")
     main_window.prevFrameButton = QtWidgets.QPushButton("<< Prev"); main_window.prevFrameButton.setToolTip("Previous Frame")
     main_window.nextFrameButton = QtWidgets.QPushButton("Next >>"); main_window.nextFrameButton.setToolTip("Next Frame")
+    main_window.playbackRateComboBox = QtWidgets.QComboBox()
+    for rate in config.PLAYBACK_RATES:
+        main_window.playbackRateComboBox.addItem(f"{rate:g}x", rate)
+    main_window.playbackRateComboBox.setCurrentIndex(config.PLAYBACK_RATES.index(1.0))
+    main_window.playbackRateComboBox.setToolTip("Playback speed relative to the video's frame rate")
 
     frame_nav_layout.addWidget(main_window.playPauseButton)
+    frame_nav_layout.addWidget(main_window.playbackRateComboBox)
     frame_nav_layout.addSpacing(10)
     frame_nav_layout.addWidget(main_window.prevFrameButton)
     frame_nav_layout.addWidget(main_window.nextFrameButton)
@@ -8,13 +8,103 @@ import numpy as np
 import logging
 import os
 import re # Added for time parsing
-from typing import Optional, Dict, Any
+import sys
+import time
+from typing import Optional, Dict, Any, List, Iterator, Tuple
 
 from PySide6 import QtCore, QtGui
 
+import config
+import settings_manager
+from frame_cache import FrameCache
+from frame_prefetcher import FramePrefetcher
+from seek_worker import FrameSeekWorker
+from decoded_frame_store import DecodedFrameStore
+from decode_profile import DecodeProfile, DecodeColorMode, BGR8_PROFILE
+import video_index
+from video_index import VideoIndexScanThread, keyframe_at_or_before
+import video_proxy
+import parallel_decode
+import capture_source
+import image_sequence_source
+from image_sequence_source import ImageSequenceCapture
+import ffmpeg_source
+from ffmpeg_source import BACKEND_OPENCV, BACKEND_FFMPEG, FFmpegPipeCapture
+from video_proxy import ProxyBuildThread
+import video_metadata
+from video_metadata import MetadataProbeThread
+
 # Get a logger for this module
 logger = logging.getLogger(__name__)
 
+class _DecoderCursor:
+    """
+    Wraps a cv2.VideoCapture (or ImageSequenceCapture/FFmpegPipeCapture) and tracks the index of the frame that the next
+    read() will return, so that forward access can be served by decoding
+    sequentially instead of seeking. When a keyframe index is available, seeks
+    land on the nearest preceding keyframe and decode forward to the target,
+    unless the capture seeks exactly by itself (the ffmpeg backend).
+    """
+    def __init__(self, capture: cv2.VideoCapture, keyframes: Optional[np.ndarray] = None) -> None:
+        self.capture = capture
+        self.keyframes = keyframes
+        self.next_index: int = 0 # -1 when the decoder position is unknown
+
+    def read_frame(self, frame_index: int) -> Optional[np.ndarray]:
+        """
+        Decodes and returns the frame at frame_index.
+
+        Reads directly when the target is the next frame, skips forward gaps with
+        grab() when that is cheaper than seeking, and otherwise seeks.
+        """
+        gap = frame_index - self.next_index
+        # Checked per read: an ffmpeg capture of a VFR stream seeks exactly once it has the timestamp index.
+        seeks_exactly = getattr(self.capture, "seeks_exactly", False)
+        if self.keyframes is not None and self.keyframes.size > 0 and not seeks_exactly:
+            keyframe = keyframe_at_or_before(self.keyframes, frame_index)
+            # Decoding forward is cheaper whenever the cursor is already inside the target's GOP.
+            can_decode_forward = self.next_index >= 0 and gap >= 0 and \
+                                 (self.next_index >= keyframe or gap <= config.VIDEO_SEQUENTIAL_GRAB_MAX_GAP)
+            if not can_decode_forward:
+                self._seek(keyframe)
+                gap = frame_index - keyframe
+        elif self.next_index < 0 or gap < 0 or gap > config.VIDEO_SEQUENTIAL_GRAB_MAX_GAP:
+            self._seek(frame_index)
+            gap = 0
+
+        if gap > 0:
+            logger.debug(f"Skipping {gap} frame(s) with grab() to reach frame {frame_index}.")
+            for _ in range(gap):
+                if not self.capture.grab():
+                    logger.warning(f"grab() failed while advancing to frame {frame_index}.")
+                    self.next_index = -1
+                    return None
+            if self.next_index >= 0:
+                self.next_index = frame_index
+
+        ret: bool; frame_data: Optional[np.ndarray]
+        ret, frame_data = self.capture.read()
+        if ret and frame_data is not None:
+            if self.next_index >= 0:
+                self.next_index = frame_index + 1
+            return frame_data
+        self.next_index = -1
+        return None
+
+    def release(self) -> None:
+        try:
+            self.capture.release()
+        except Exception as e:
+            logger.error(f"Exception during cv2.VideoCapture release: {e}", exc_info=True)
+
+    def _seek(self, frame_index: int) -> None:
+        logger.debug(f"Seeking decoder to frame {frame_index} (cursor was at {self.next_index}).")
+        if self.capture.set(cv2.CAP_PROP_POS_FRAMES, float(frame_index)):
+            self.next_index = frame_index
+        else:
+            logger.warning(f"Seek to raw frame {frame_index} using CAP_PROP_POS_FRAMES failed (might be inaccurate).")
+            self.next_index = -1
+
 class VideoHandler(QtCore.QObject):
     """
     Handles video operations: loading, releasing, playback, navigation, frame conversion.
@@ -27,19 +117,82 @@ class VideoHandler(QtCore.QObject):
                             video properties like 'filepath', 'filename', 'total_frames',
                             'fps', 'width', 'height', 'duration_ms'.
         videoLoadFailed (str): Emitted if opening a video fails, carrying an error message.
-        frameChanged (QtGui.QPixmap, int): Emitted when a new frame is ready for display,
-                                           providing the frame pixmap and its 0-based index.
+        frameChanged (QtGui.QPixmap, int, int): Emitted when a new frame is ready for display,
+                                                providing the frame pixmap, its 0-based index and the
+                                                id of the seek request it answers. Results of
+                                                superseded asynchronous seeks are never emitted.
         playbackStateChanged (bool): Emitted when playback starts (True) or stops (False).
+        proxyFrameChanged (QtGui.QPixmap, int): Emitted instead of frameChanged for preview seeks
+                                                served from the low-resolution proxy. The pixmap
+                                                must be displayed scaled up to the full frame size.
+        playbackStatsChanged (float, float, int): Emitted about once a second during playback with the
+                                                  achieved display rate (frames shown per second), the
+                                                  achieved playback speed relative to real time, and the
+                                                  number of frames skipped in that interval.
+        frameTimesChanged (): Emitted once per-frame presentation timestamps for the loaded video
+                              are known (from the index sidecar or a background scan). Times from
+                              frame_index_to_time_ms() and total_duration_ms may have changed.
+        totalFramesChanged (int): Emitted when the background frame count scan finds that the video
+                                  holds a different number of decodable frames than it reports.
+                                  total_frames and total_duration_ms have been corrected.
+        videoMetadataUpdated (dict): Emitted with the new get_metadata_dictionary() whenever
+                                     background probing (codec details, indexes) completes
+                                     for the loaded video.
     """
     # --- Signals ---
     videoLoaded = QtCore.Signal(dict)
     videoLoadFailed = QtCore.Signal(str)
-    frameChanged = QtCore.Signal(QtGui.QPixmap, int)
+    frameChanged = QtCore.Signal(QtGui.QPixmap, int, int)
     playbackStateChanged = QtCore.Signal(bool)
+    proxyFrameChanged = QtCore.Signal(QtGui.QPixmap, int)
+    playbackStatsChanged = QtCore.Signal(float, float, int)
+    frameTimesChanged = QtCore.Signal()
+    totalFramesChanged = QtCore.Signal(int)
+    videoMetadataUpdated = QtCore.Signal(dict)
 
     # --- Internal State Variables ---
-    _video_capture: Optional[cv2.VideoCapture] = None # OpenCV video capture object
+    _video_capture: Optional[cv2.VideoCapture] = None # OpenCV video capture object (or ImageSequenceCapture)
+    _sequence_options: Optional[Dict[str, Any]] = None # FPS and raw layout when the source is an image sequence
+    _decode_backend: str = BACKEND_OPENCV # Decoder the current video was opened with (BACKEND_* in ffmpeg_source)
+    _ffmpeg_threads: int = 0 # Decoder threads per ffmpeg process (0 = ffmpeg's choice)
+    _decoder_cursor: Optional[_DecoderCursor] = None # Tracks the decode position of _video_capture
+    _frame_cache: FrameCache # Decoded frames shared by display, kymograph and export paths
+    _prefetcher: Optional[FramePrefetcher] = None # Background read-ahead for playback and stepping
+    _prefetch_enabled: bool = True
+    _prefetch_depth: int = 8
+    _step_direction: int = 1 # Direction of the user's most recent frame step (+1 or -1)
+    _seek_worker: Optional[FrameSeekWorker] = None # Latest-wins background decoder for interactive seeks
+    _seek_request_id: int = 0 # Id of the most recent seek; results for older ids are dropped
+    _pending_seek_index: int = -1 # Target of the in-flight asynchronous seek, or -1
+    _frame_store: Optional[DecodedFrameStore] = None # On-disk "decode once" store, when enabled
+    _keyframes: Optional[np.ndarray] = None # Sorted keyframe indices, once known
+    _frame_times_ms: Optional[np.ndarray] = None # Presentation time of each frame (ms from frame 0), once known
+    _index_scan_threads: List[VideoIndexScanThread]
+    _open_generation: int = 0 # Incremented per open/release; deferred work for older opens is dropped
+    _container_metadata: Optional[Dict[str, str]] = None # Codec details from the background probe, once known
+    _metadata_probe_thread: Optional[MetadataProbeThread] = None
+    # Scrubbing proxy
+    _proxy_cursor: Optional[_DecoderCursor] = None # Decoder on the downscaled proxy, once built
+    _proxy_scale: float = 1.0 # Proxy width / original width
+    _proxy_build_thread: Optional[ProxyBuildThread] = None
+    _is_showing_proxy: bool = False # True while the displayed frame came from the proxy
     _play_timer: QtCore.QTimer # Timer for triggering frame advances during playback
+    _playback_clock: QtCore.QElapsedTimer # Wall clock that decides which frame is due
+    _playback_rate: float = 1.0 # Playback speed multiplier (1.0 = real time)
+    _playback_anchor_frame: int = 0 # Frame shown when the playback clock was (re)started
+    _playback_stride: int = 1 # Frames advanced per display tick when the video outpaces the display
+    _playback_direction: int = 1 # +1 plays forward, -1 plays in reverse
+    _stats_window_start_ms: int = 0
+    _stats_frames_shown: int = 0
+    _stats_frames_skipped: int = 0
+    _stats_window_start_frame: int = 0
+    # Display conversion
+    _display_staging_buffers: Dict[Tuple[int, ...], np.ndarray] # Reused when a frame must be made contiguous/converted
+    _conversion_count: int = 0
+    _conversion_total_s: float = 0.0
+    _conversion_max_s: float = 0.0
+    _conversion_last_s: float = 0.0
+    _conversion_staged_count: int = 0 # Conversions that needed a staging copy before wrapping
     # Video properties
     _video_filepath: str = ""
     _total_frames: int = 0
@@ -60,18 +213,49 @@ class VideoHandler(QtCore.QObject):
         # Use PreciseTimer for potentially smoother playback timing
         self._play_timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
         self._play_timer.timeout.connect(self._advance_frame)
+        self._playback_clock = QtCore.QElapsedTimer()
+        self._frame_cache = FrameCache()
+        self._index_scan_threads = []
+        self._display_staging_buffers = {}
+        self.reload_performance_settings()
         logger.info("VideoHandler initialized.")
 
     # --- Public Methods ---
 
-    def open_video(self, filepath: str) -> bool:
+    def open_video(self,
+                   filepath: str,
+                   sequence_options: Optional[Dict[str, Any]] = None,
+                   decode_backend: Optional[str] = None) -> bool:
+        """
+        Opens a video file, or an image sequence (a directory, a glob pattern such
+        as 'run1/frame_*.tif', or a single .npy/raw frame stack). For image sequences,
+        sequence_options supplies the FPS and, for raw data, the frame layout
+        (see the OPTION_* keys in image_sequence_source).
+
+        decode_backend chooses the decoder for video files (BACKEND_OPENCV or
+        BACKEND_FFMPEG); None uses the preference. The ffmpeg backend falls back
+        to OpenCV when ffmpeg is not installed or cannot open the file.
+
+        Only the work needed to show frame 0 happens here; indexes, the proxy, the
+        decoded-frame store and codec details are loaded in the background afterwards
+        (see videoMetadataUpdated and frameTimesChanged).
+        """
         logger.info(f"Attempting to open video: {filepath}")
         self.release_video() 
 
         try:
-            cap = cv2.VideoCapture(filepath)
+            is_sequence = image_sequence_source.is_image_sequence_source(filepath)
+            self._ffmpeg_threads = int(settings_manager.get_setting(settings_manager.KEY_FFMPEG_THREADS))
+            backend = self._choose_decode_backend(decode_backend) if not is_sequence else BACKEND_OPENCV
+            cap = capture_source.open_capture(filepath, sequence_options, backend, self._ffmpeg_threads)
+            if backend == BACKEND_FFMPEG and not cap.isOpened():
+                logger.warning("FFmpeg decoder could not open the video; falling back to OpenCV.")
+                cap.release()
+                backend = BACKEND_OPENCV
+                cap = capture_source.open_capture(filepath, sequence_options, backend)
             if not cap or not cap.isOpened():
-                raise IOError(f"Cannot open video file via OpenCV: {filepath}")
+                raise IOError(f"Cannot open {'image sequence' if is_sequence else 'video file via OpenCV'}: {filepath}")
+            self._decode_backend = backend
 
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             fps = float(cap.get(cv2.CAP_PROP_FPS))
@@ -88,19 +272,19 @@ class VideoHandler(QtCore.QObject):
                 fps = 30.0 
 
             self._video_capture = cap
+            self._decoder_cursor = _DecoderCursor(cap)
             self._video_filepath = filepath
+            self._sequence_options = dict(sequence_options or {}) if is_sequence else None
             self._total_frames = total_frames
             self._fps = fps
             self._frame_width = frame_width
             self._frame_height = frame_height
-            self._total_duration_ms = (self._total_frames / self._fps) * 1000 if self._fps > 0 else 0.0
+            self._update_total_duration()
             self._is_loaded = True
             self._current_frame_index = -1 
 
             if self._fps > 0:
-                timer_interval: int = int(1000 / self._fps) 
-                self._play_timer.setInterval(max(1, timer_interval)) 
-                logger.debug(f"Playback timer interval set to {self._play_timer.interval()} ms.")
+                self._update_playback_timing()
             else:
                 logger.warning("Cannot set playback timer interval due to invalid FPS.")
 
@@ -109,6 +293,9 @@ class VideoHandler(QtCore.QObject):
             self.videoLoaded.emit(video_info) 
 
             self._read_and_emit_frame(0)
+            # Everything not needed for the first frame runs once it is on screen.
+            generation = self._open_generation
+            QtCore.QTimer.singleShot(0, lambda: self._start_deferred_loading(generation))
             return True
 
         except (IOError, ValueError, cv2.error, Exception) as e:
@@ -121,6 +308,23 @@ class VideoHandler(QtCore.QObject):
     def release_video(self) -> None:
         logger.info("Releasing video resources...")
         self.stop_playback() 
+        self._stop_prefetcher()
+        self._stop_seek_worker()
+        self._new_seek_request_id()
+        self._cancel_index_scans()
+        self._cancel_metadata_probe()
+        self._open_generation += 1
+        self._release_proxy()
+        if self._is_loaded:
+            logger.info(f"Frame cache stats for released video: {self._frame_cache.get_stats()}")
+            logger.info(f"Display conversion stats for released video: {self.get_display_conversion_stats()}")
+        self._frame_cache.clear()
+        self._frame_cache.reset_stats()
+        self._display_staging_buffers.clear()
+        self._reset_display_conversion_stats()
+        if self._frame_store is not None:
+            self._frame_store.close()
+            self._frame_store = None
         if self._video_capture:
             try:
                 self._video_capture.release()
@@ -128,7 +332,12 @@ class VideoHandler(QtCore.QObject):
             except Exception as e:
                 logger.error(f"Exception during cv2.VideoCapture release: {e}", exc_info=True)
         self._video_capture = None
+        self._decoder_cursor = None
+        self._keyframes = None
+        self._frame_times_ms = None
+        self._container_metadata = None
         self._video_filepath = ""
+        self._sequence_options = None
         self._total_frames = 0
         self._fps = 0.0
         self._frame_width = 0
@@ -137,6 +346,7 @@ class VideoHandler(QtCore.QObject):
         self._current_frame_index = -1
         self._is_playing = False
         self._is_loaded = False
+        self._step_direction = 1
         logger.info("Video resources released and state reset.")
 
     def get_video_info(self) -> Dict[str, Any]:
@@ -145,7 +355,7 @@ class VideoHandler(QtCore.QObject):
             return {}
         return {
             "filepath": self._video_filepath,
-            "filename": os.path.basename(self._video_filepath),
+            "filename": os.path.basename(os.path.normpath(self._video_filepath)),
             "total_frames": self._total_frames,
             "fps": self._fps,
             "width": self._frame_width,
@@ -153,6 +363,8 @@ class VideoHandler(QtCore.QObject):
             "duration_ms": self._total_duration_ms,
             "current_frame": self._current_frame_index, 
             "is_loaded": self._is_loaded,
+            "sequence_options": dict(self._sequence_options) if self._sequence_options is not None else None,
+            "decode_backend": self._decode_backend,
         }
 
     def get_metadata_dictionary(self) -> Dict[str, Any]:
@@ -167,24 +379,39 @@ class VideoHandler(QtCore.QObject):
         metadata["Frame Width"] = self._frame_width
         metadata["Frame Height"] = self._frame_height
         metadata["FPS"] = f"{self._fps:.3f}" if self._fps > 0 else "N/A"
-        try:
-            fourcc_int = int(self._video_capture.get(cv2.CAP_PROP_FOURCC))
-            if fourcc_int != 0:
-                fourcc_code = "".join([chr((fourcc_int >> 8 * i) & 0xFF) for i in range(4)])
-                fourcc_code = "".join(filter(str.isprintable, fourcc_code)).strip() 
-                metadata["FourCC Codec"] = fourcc_code if fourcc_code else "N/A"
-            else:
-                 metadata["FourCC Codec"] = "N/A"
-            bitrate = self._video_capture.get(cv2.CAP_PROP_BITRATE)
-            metadata["Bitrate (bps)"] = f"{int(bitrate)}" if bitrate > 0 else "N/A"
-        except Exception as e:
-            logger.error(f"Error retrieving specific OpenCV properties: {e}", exc_info=False)
-            if "FourCC Codec" not in metadata: metadata["FourCC Codec"] = "Error"
-            if "Bitrate (bps)" not in metadata: metadata["Bitrate (bps)"] = "Error"
+        if isinstance(self._video_capture, ImageSequenceCapture):
+            metadata["Source Type"] = self._video_capture.description
+        else:
+            metadata["Decoder"] = "FFmpeg (pipe)" if self._decode_backend == BACKEND_FFMPEG else "OpenCV"
+        if self._frame_store is not None:
+            metadata["Decoded-Frame Store"] = f"{self._frame_store.stored_frame_count}/{self._total_frames} frames" + \
+                                              (" (grayscale)" if self._frame_store.is_grayscale else "")
+        if self._keyframes is not None:
+            metadata["Keyframe Index"] = f"{self._keyframes.size} keyframes"
+        elif any(t.section == video_index.SECTION_KEYFRAMES for t in self._index_scan_threads):
+            metadata["Keyframe Index"] = "Scanning..."
+        else:
+            metadata["Keyframe Index"] = "N/A"
+        if self._frame_times_ms is not None and self._frame_times_ms.size > 1:
+            intervals = np.diff(self._frame_times_ms)
+            metadata["Frame Timestamps"] = f"{self._frame_times_ms.size} frames, interval " \
+                                           f"{intervals.min():.2f}-{intervals.max():.2f} ms"
+        elif any(t.section == video_index.SECTION_FRAME_TIMES for t in self._index_scan_threads):
+            metadata["Frame Timestamps"] = "Scanning..."
+        if self._container_metadata is not None:
+            metadata.update(self._container_metadata)
+        else: # Filled in by the background probe; the dialog updates through videoMetadataUpdated
+            metadata[video_metadata.FIELD_FOURCC] = "Probing..."
+            metadata[video_metadata.FIELD_BITRATE] = "Probing..."
         logger.debug(f"Generated metadata dictionary: {metadata}")
         return metadata
 
-    def seek_frame(self, frame_index: int) -> None:
+    def seek_frame(self, frame_index: int, preview: bool = False) -> None:
+        """
+        Displays the frame at frame_index. With preview=True (e.g. while the slider is
+        being dragged) the frame is taken from the low-resolution proxy when one is
+        available; call show_full_resolution_frame() once the preview ends.
+        """
         if not self._is_loaded:
             logger.warning("seek_frame called but no video loaded.")
             return
@@ -194,19 +421,71 @@ class VideoHandler(QtCore.QObject):
             frame_index = clamped_index
         if self._is_playing:
             self.stop_playback()
-        if frame_index != self._current_frame_index:
+        if preview and self._proxy_cursor is not None:
+            if frame_index != self._current_frame_index and self._read_and_emit_proxy_frame(frame_index):
+                return
+        if frame_index != self._current_frame_index or self._is_showing_proxy:
             logger.debug(f"Seeking to frame {frame_index}")
             self._read_and_emit_frame(frame_index)
         else:
             logger.debug(f"Seek requested to current frame ({frame_index}), no operation needed.")
 
+    def request_seek(self, frame_index: int, preview: bool = False) -> int:
+        """
+        Asynchronous counterpart of seek_frame for interactive scrubbing. Frames that
+        are cached (or, with preview=True, available from the proxy) are shown at
+        once; otherwise the target is handed to a background decoder that only
+        serves the most recent request. Returns the request id that will accompany
+        the resulting frameChanged emission.
+        """
+        if not self._is_loaded:
+            logger.warning("request_seek called but no video loaded.")
+            return self._seek_request_id
+        frame_index = max(0, min(frame_index, self._total_frames - 1))
+        if self._is_playing:
+            self.stop_playback()
+        if preview and self._proxy_cursor is not None:
+            if frame_index != self._current_frame_index and self._read_and_emit_proxy_frame(frame_index):
+                return self._seek_request_id
+        if frame_index == self._display_target_index() and not self._is_showing_proxy:
+            return self._seek_request_id
+        frame_data = self._take_prefetched_frame(frame_index)
+        if frame_data is None:
+            frame_data = self._lookup_decoded_frame(frame_index)
+        if frame_data is not None:
+            self._emit_decoded_frame(frame_index, frame_data, self._new_seek_request_id())
+            return self._seek_request_id
+        request_id = self._new_seek_request_id()
+        self._pending_seek_index = frame_index
+        self._ensure_seek_worker().request(request_id, frame_index)
+        return request_id
+
+    def request_step(self, step: int) -> None:
+        """Steps relative to the latest seek target (not the displayed frame), asynchronously."""
+        if not self._is_loaded or step == 0: return
+        target_frame = self._display_target_index() + step
+        if not (0 <= target_frame < self._total_frames):
+            logger.debug("Frame step would leave the video; ignoring.")
+            return
+        self._step_direction = 1 if step > 0 else -1
+        self.request_seek(target_frame)
+        self._schedule_read_ahead(target_frame + self._step_direction, self._step_direction)
+
+    def show_full_resolution_frame(self) -> None:
+        """Replaces a displayed proxy frame with the full-resolution frame (decoded in the background)."""
+        if self._is_loaded and self._is_showing_proxy and self._current_frame_index >= 0:
+            logger.debug(f"Loading full-resolution frame {self._current_frame_index} to replace proxy frame.")
+            self.request_seek(self._current_frame_index)
+
     def next_frame(self) -> None:
         if not self._is_loaded: return
         target_frame = self._current_frame_index + 1
         if target_frame < self._total_frames:
             logger.debug("Moving to next frame.")
             if self._is_playing: self.stop_playback() 
+            self._step_direction = 1
             self._read_and_emit_frame(target_frame)
+            self._schedule_read_ahead(target_frame + 1, self._step_direction)
         else:
             logger.debug("Already at the last frame.")
 
@@ -216,11 +495,14 @@ class VideoHandler(QtCore.QObject):
         if target_frame >= 0:
             logger.debug("Moving to previous frame.")
             if self._is_playing: self.stop_playback() 
+            self._step_direction = -1
             self._read_and_emit_frame(target_frame)
+            self._schedule_read_ahead(target_frame - 1, self._step_direction)
         else:
             logger.debug("Already at the first frame.")
 
-    def toggle_playback(self) -> None:
+    def toggle_playback(self, direction: int = 1) -> None:
+        """Stops playback if it is running, otherwise starts it forward (direction 1) or in reverse (-1)."""
         if not self._is_loaded:
             logger.warning("Cannot toggle playback: No video loaded.")
             return
@@ -230,9 +512,14 @@ class VideoHandler(QtCore.QObject):
         if self._is_playing:
             self.stop_playback()
         else:
-            self.start_playback()
+            self.start_playback(direction)
 
-    def start_playback(self) -> None:
+    def start_playback(self, direction: int = 1) -> None:
+        """
+        Starts playback forward (direction 1) or in reverse (-1). Reverse playback is
+        served by the read-ahead's backward chunks (see FramePrefetcher), so each
+        GOP is decoded once rather than once per displayed frame.
+        """
         if not self._is_loaded:
             logger.warning("Cannot start playback: No video loaded.")
             return
@@ -242,18 +529,39 @@ class VideoHandler(QtCore.QObject):
         if self._fps <= 0 or not self._play_timer.interval() > 0:
              logger.warning("Cannot start playback: Invalid FPS or timer interval.")
              return
-        logger.info("Starting video playback.")
-        if self._current_frame_index >= self._total_frames - 1:
-            logger.debug("Playback start requested at end of video, wrapping to beginning (frame 0).")
-            self._read_and_emit_frame(0)
-            if self._current_frame_index != 0:
-                 logger.error("Failed to seek to frame 0 when wrapping playback. Aborting start.")
+        direction = 1 if direction >= 0 else -1
+        logger.info(f"Starting video playback{' in reverse' if direction < 0 else ''}.")
+        wrap_frame = 0 if direction > 0 else self._total_frames - 1
+        if (direction > 0 and self._current_frame_index >= self._total_frames - 1) or \
+           (direction < 0 and self._current_frame_index <= 0):
+            logger.debug(f"Playback start requested at the {'end' if direction > 0 else 'start'} of video, wrapping to frame {wrap_frame}.")
+            self._read_and_emit_frame(wrap_frame)
+            if self._current_frame_index != wrap_frame:
+                 logger.error(f"Failed to seek to frame {wrap_frame} when wrapping playback. Aborting start.")
                  return
+        self._new_seek_request_id() # Playback supersedes any in-flight seek
         self._is_playing = True
+        self._playback_direction = direction
+        self._update_playback_timing()
+        self._restart_playback_clock()
+        self._schedule_playback_read_ahead(self._current_frame_index)
         self._play_timer.start()
         logger.debug("Playback timer started.")
         self.playbackStateChanged.emit(True) 
 
+    def set_playback_rate(self, rate: float) -> None:
+        """Sets the playback speed multiplier (clamped to the configured range). Applies immediately."""
+        rate = max(config.PLAYBACK_RATE_MIN, min(float(rate), config.PLAYBACK_RATE_MAX))
+        if rate == self._playback_rate:
+            return
+        self._playback_rate = rate
+        logger.info(f"Playback rate set to {rate:g}x.")
+        if self._is_loaded and self._fps > 0:
+            self._update_playback_timing()
+        if self._is_playing:
+            self._restart_playback_clock()
+            self._schedule_playback_read_ahead(self._current_frame_index)
+
     def stop_playback(self) -> None:
         if not self._is_playing:
             return 
@@ -264,8 +572,230 @@ class VideoHandler(QtCore.QObject):
         self.playbackStateChanged.emit(False) 
 
     def get_raw_frame_at_index(self, frame_index: int) -> Optional[np.ndarray]:
+        """
+        Returns the decoded BGR frame at frame_index, served from the shared frame
+        cache when possible. The returned array is read-only.
+        """
         logger.debug(f"get_raw_frame_at_index called for frame {frame_index}.")
-        return self._read_raw_frame_from_video(frame_index)
+        cached_frame = self._lookup_decoded_frame(frame_index)
+        if cached_frame is not None:
+            return cached_frame
+        frame_data = self._read_raw_frame_from_video(frame_index)
+        if frame_data is not None:
+            self._remember_decoded_frame(frame_index, frame_data)
+        return frame_data
+
+    def iter_frames(self,
+                    start_frame_idx: int,
+                    end_frame_idx: int,
+                    step: int = 1,
+                    profile: Optional[DecodeProfile] = None,
+                    parallel: bool = False) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """
+        Streams the frames start_frame_idx..end_frame_idx (inclusive) for batch
+        consumers such as kymograph generation and export.
+
+        A dedicated decoder seeks once and then decodes sequentially (frames
+        skipped by step are only grabbed), so the display position is not
+        disturbed. Frames already in the frame cache are reused, but streamed
+        frames are not added to it, so a long pass does not evict the user's
+        working set.
+
+        Args:
+            start_frame_idx: First 0-based frame index.
+            end_frame_idx: Last 0-based frame index (inclusive).
+            step: Yield every step-th frame (decimation).
+            profile: Colour mode and crop applied right after decoding (see
+                     analysis_profile()). Defaults to full BGR frames.
+            parallel: Allows long ranges to be decoded on worker processes, as
+                      configured by the decoder-process preference.
+
+        Yields:
+            (frame_index, frame) tuples. frame is None if the frame could not be decoded.
+            Cropped or converted frames are contiguous copies owned by the caller.
+        """
+        if not self._is_loaded:
+            logger.warning("iter_frames called but no video loaded.")
+            return
+        start_frame_idx = max(0, start_frame_idx)
+        end_frame_idx = min(end_frame_idx, self._total_frames - 1)
+        step = max(1, int(step))
+        profile = self.analysis_profile(profile.color_mode, profile.roi) if profile is not None else BGR8_PROFILE
+        workers = self.parallel_decode_workers(start_frame_idx, end_frame_idx, step, profile) if parallel else 0
+        yield from self.iter_source_frames(self.frame_source(profile.color_mode), start_frame_idx, end_frame_idx,
+                                           step, profile, workers)
+
+    def frame_source(self, color_mode: DecodeColorMode = DecodeColorMode.BGR8) -> Dict[str, Any]:
+        """
+        Snapshot of what iter_source_frames() needs to read the current video for
+        an analysis pass in color_mode: the decode_source_options(), frame size
+        and count, the colour mode analysis_profile() resolves color_mode to, and
+        the frame cache and decoded-frame store usable for it. Take it on the GUI
+        thread; a worker thread can then read frames without touching handler
+        state that the GUI thread replaces (store, keyframe index, backend).
+        """
+        resolved_mode = self.analysis_profile(color_mode).color_mode
+        return {"decode_options": self.decode_source_options(), "frame_width": self._frame_width,
+                "frame_height": self._frame_height, "total_frames": self._total_frames, "color_mode": resolved_mode,
+                "frame_cache": self._frame_cache, "frame_store": self._frame_store_for(DecodeProfile(resolved_mode))}
+
+    @staticmethod
+    def iter_source_frames(source: Dict[str, Any],
+                           start_frame_idx: int,
+                           end_frame_idx: int,
+                           step: int = 1,
+                           profile: Optional[DecodeProfile] = None,
+                           workers: int = 0) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """
+        iter_frames() over a frame_source() snapshot, safe to run on any thread.
+        profile must already be resolved by analysis_profile() (clipped ROI, colour
+        mode as in the snapshot). Frames are decoded on worker processes if workers > 1.
+        """
+        start_frame_idx = max(0, start_frame_idx)
+        end_frame_idx = min(end_frame_idx, source["total_frames"] - 1)
+        step = max(1, int(step))
+        profile = profile if profile is not None else BGR8_PROFILE
+        decode_options = source["decode_options"]
+        frame_width, frame_height = source["frame_width"], source["frame_height"]
+        native_depth = profile.color_mode == DecodeColorMode.GRAY16
+        # The frame cache and store hold 8-bit frames; native-depth passes bypass them.
+        store: Optional[DecodedFrameStore] = source["frame_store"] if not native_depth else None
+        if workers > 1:
+            if store is None:
+                yield from parallel_decode.iter_frames_parallel(
+                    start_frame_idx=start_frame_idx, end_frame_idx=end_frame_idx,
+                    frame_shape=profile.frame_shape(frame_width, frame_height), workers=workers,
+                    step=step, profile=profile, **decode_options)
+                return
+            # Decode whole frames in the store's format so the pass also fills the store.
+            store_profile = DecodeProfile(DecodeColorMode.GRAY8 if store.is_grayscale else DecodeColorMode.BGR8)
+            for frame_index, frame in parallel_decode.iter_frames_parallel(
+                    start_frame_idx=start_frame_idx, end_frame_idx=end_frame_idx,
+                    frame_shape=store_profile.frame_shape(frame_width, frame_height), workers=workers,
+                    step=step, profile=store_profile, **decode_options):
+                if frame is not None:
+                    store.put(frame_index, frame)
+                    frame = profile.apply(frame)
+                yield frame_index, frame
+            return
+        cursor: Optional[_DecoderCursor] = None # Opened only if some frame actually needs decoding
+        # Without a store to fill, the ffmpeg backend can crop and convert while decoding.
+        decoder_profile = profile if store is None and not native_depth else None
+        decoded_frame_profile = profile # What remains to be applied to frames from the cursor
+        try:
+            for frame_index in range(start_frame_idx, end_frame_idx + 1, step):
+                frame = source["frame_cache"].get(frame_index) if not native_depth else None
+                if frame is None and store is not None:
+                    frame = store.get(frame_index)
+                if frame is None:
+                    if cursor is None:
+                        cursor = VideoHandler._open_decoder_cursor(profile=decoder_profile, **decode_options)
+                        if cursor is None:
+                            return
+                        if decoder_profile is not None:
+                            decoded_frame_profile = capture_source.residual_profile(cursor.capture, profile)
+                        if native_depth and not cursor.capture.set_native_gray16(True):
+                            logger.error("iter_frames: source cannot deliver 16-bit frames.")
+                            return
+                    frame = cursor.read_frame(frame_index)
+                    if frame is None:
+                        logger.warning(f"iter_frames: could not decode frame {frame_index}.")
+                        yield frame_index, None
+                        continue
+                    if store is not None:
+                        store.put(frame_index, frame)
+                    yield frame_index, decoded_frame_profile.apply(frame)
+                    continue
+                yield frame_index, profile.apply(frame)
+        finally:
+            if cursor is not None:
+                cursor.release()
+
+    def parallel_decode_workers(self,
+                                start_frame_idx: int,
+                                end_frame_idx: int,
+                                step: int = 1,
+                                profile: Optional[DecodeProfile] = None) -> int:
+        """
+        Number of worker processes a batch pass over the range should decode on,
+        per the decoder-process preference; 0 if it should stream in this process
+        (short ranges, or ranges the decoded frame store already holds).
+        """
+        workers = int(settings_manager.get_setting(settings_manager.KEY_DECODE_WORKERS))
+        if workers <= 1 or len(range(start_frame_idx, end_frame_idx + 1, max(1, step))) < config.PARALLEL_DECODE_MIN_FRAMES:
+            return 0
+        store = self._frame_store_for(profile if profile is not None else BGR8_PROFILE)
+        if store is not None and store.covers(start_frame_idx, end_frame_idx, step):
+            return 0
+        return workers
+
+    def decode_source_options(self) -> Dict[str, Any]:
+        """
+        Keyword arguments that let another process open and seek the current
+        video like this handler does (filepath, keyframes, sequence_options,
+        decode_backend, ffmpeg_threads), for the parallel_decode functions.
+        """
+        return {"filepath": self._video_filepath, "keyframes": self._keyframes,
+                "sequence_options": self._sequence_options, "decode_backend": self._decode_backend,
+                "ffmpeg_threads": self._ffmpeg_threads}
+
+    def analysis_profile(self,
+                         color_mode: DecodeColorMode = DecodeColorMode.BGR8,
+                         roi: Optional[Tuple[int, int, int, int]] = None) -> DecodeProfile:
+        """
+        Returns a decode profile for batch analysis of the current video: the ROI is
+        clipped to the frame, and GRAY16 falls back to GRAY8 when the source has no
+        deeper-than-8-bit samples (only 16-bit image sequences do).
+        """
+        if color_mode == DecodeColorMode.GRAY16 and not self.supports_gray16:
+            logger.info("16-bit grayscale is not available for this source; using 8-bit grayscale.")
+            color_mode = DecodeColorMode.GRAY8
+        return DecodeProfile(color_mode, self._clip_roi(roi) if roi is not None else None)
+
+    def _clip_roi(self, roi: Tuple[int, int, int, int]) -> Optional[Tuple[int, int, int, int]]:
+        """Clips an (x, y, width, height) ROI to the frame. Returns None if it covers the whole frame."""
+        x, y, w, h = (int(v) for v in roi)
+        x0 = max(0, min(x, self._frame_width - 1))
+        y0 = max(0, min(y, self._frame_height - 1))
+        x1 = max(x0 + 1, min(x + w, self._frame_width))
+        y1 = max(y0 + 1, min(y + h, self._frame_height))
+        if x0 == 0 and y0 == 0 and x1 == self._frame_width and y1 == self._frame_height:
+            return None
+        return x0, y0, x1 - x0, y1 - y0
+
+    def reload_performance_settings(self) -> None:
+        """Applies performance-related preferences (frame cache budget, read-ahead)."""
+        budget_mb = settings_manager.get_setting(settings_manager.KEY_FRAME_CACHE_BUDGET_MB)
+        self._frame_cache.set_budget(int(budget_mb) * 1024 * 1024)
+
+        prefetch_enabled = bool(settings_manager.get_setting(settings_manager.KEY_PREFETCH_ENABLED))
+        prefetch_depth = int(settings_manager.get_setting(settings_manager.KEY_PREFETCH_DEPTH))
+        if prefetch_enabled != self._prefetch_enabled or prefetch_depth != self._prefetch_depth:
+            self._stop_prefetcher() # Recreated lazily with the new settings
+        self._prefetch_enabled = prefetch_enabled
+        self._prefetch_depth = prefetch_depth
+
+    def get_frame_cache_stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and memory usage of the decoded-frame cache."""
+        return self._frame_cache.get_stats()
+
+    def get_display_conversion_stats(self) -> Dict[str, Any]:
+        """Returns timing of the frame-to-QPixmap conversion on the display path."""
+        count = self._conversion_count
+        return {
+            "conversions": count,
+            "mean_ms": (self._conversion_total_s / count * 1000.0) if count > 0 else 0.0,
+            "max_ms": self._conversion_max_s * 1000.0,
+            "last_ms": self._conversion_last_s * 1000.0,
+            "staged": self._conversion_staged_count,
+        }
+
+    def _reset_display_conversion_stats(self) -> None:
+        self._conversion_count = 0
+        self._conversion_total_s = 0.0
+        self._conversion_max_s = 0.0
+        self._conversion_last_s = 0.0
+        self._conversion_staged_count = 0
 
     # --- NEW Helper Method: Parse time string to milliseconds ---
     def parse_time_to_ms(self, time_str: str) -> Optional[float]:
@@ -333,6 +863,17 @@ class VideoHandler(QtCore.QObject):
         logger.warning(f"Failed to parse time string: '{time_str}'")
         return None
 
+    def frame_index_to_time_ms(self, frame_index: Any) -> Any:
+        """
+        Converts a frame index, or an array of them, to presentation time in milliseconds.
+
+        Uses the per-frame timestamp index once it is known, so times are correct for
+        variable-frame-rate footage; until then (and for image sequences) times follow
+        the nominal FPS. Scalars give a float, arrays an array of float64.
+        """
+        times_ms = video_index.frame_times_to_ms(self._frame_times_ms, frame_index, self._fps)
+        return float(times_ms) if times_ms.ndim == 0 else times_ms
+
     # --- NEW Helper Method: Convert time (ms) to nearest frame index ---
     def time_ms_to_frame_index(self, time_ms: float) -> Optional[int]:
         """
@@ -352,105 +893,599 @@ class VideoHandler(QtCore.QObject):
             logger.warning(f"Time {time_ms}ms is outside video duration. Cannot convert to frame index.")
             return None
 
-        frame_float = (time_ms / 1000.0) * self._fps
-        frame_index = round(frame_float) # Find nearest frame
+        frame_index = int(video_index.nearest_frames_for_times_ms(self._frame_times_ms, time_ms, self._fps)) # Find nearest frame
 
         # Clamp to valid frame range [0, total_frames - 1]
-        clamped_frame_index = max(0, min(int(frame_index), self._total_frames - 1))
+        clamped_frame_index = max(0, min(frame_index, self._total_frames - 1))
         
-        logger.debug(f"Converted {time_ms:.3f}ms to frame_float={frame_float:.3f}, rounded_index={frame_index}, clamped_index={clamped_frame_index}")
+        logger.debug(f"Converted {time_ms:.3f}ms to nearest_index={frame_index}, clamped_index={clamped_frame_index}")
         return clamped_frame_index
 
     # --- Internal Helper Methods ---
     def _read_raw_frame_from_video(self, frame_index: int) -> Optional[np.ndarray]:
-        if not self._video_capture or not self._is_loaded:
+        if not self._video_capture or not self._decoder_cursor or not self._is_loaded:
             logger.warning(f"_read_raw_frame_from_video({frame_index}) called but video capture not ready.")
             return None
         if not (0 <= frame_index < self._total_frames):
              logger.error(f"Internal error: _read_raw_frame_from_video called with invalid index {frame_index} for video with {self._total_frames} frames.")
              return None
-        logger.debug(f"Reading raw frame {frame_index} via seek...")
-        current_capture_pos = self._video_capture.get(cv2.CAP_PROP_POS_FRAMES)
-        seek_success = self._video_capture.set(cv2.CAP_PROP_POS_FRAMES, float(frame_index))
-        if not seek_success:
-            logger.warning(f"Seek to raw frame {frame_index} using CAP_PROP_POS_FRAMES failed (might be inaccurate).")
-            self._video_capture.set(cv2.CAP_PROP_POS_FRAMES, float(current_capture_pos -1 if current_capture_pos > 0 else 0))
-        ret: bool; frame_data: Optional[np.ndarray]
-        ret, frame_data = self._video_capture.read()
-        if ret and frame_data is not None:
+        logger.debug(f"Reading raw frame {frame_index} (decoder cursor at {self._decoder_cursor.next_index})...")
+        frame_data = self._decoder_cursor.read_frame(frame_index)
+        if frame_data is not None:
             logger.debug(f"Successfully read raw frame {frame_index}.")
             return frame_data
         else:
-            logger.warning(f"Failed to read raw frame {frame_index} after seeking (ret={ret}).")
+            logger.warning(f"Failed to read raw frame {frame_index}.")
             return None
 
     @QtCore.Slot()
     def _advance_frame(self) -> None:
-        if not self._is_playing or not self._video_capture or not self._is_loaded:
+        """
+        Playback tick. Shows the frame that is due according to the wall clock, so
+        playback keeps real-time pacing: when decoding falls behind, the frames in
+        between are skipped (the decoder grabs over them) instead of slowing down.
+        """
+        if not self._is_playing or not self._decoder_cursor or not self._is_loaded:
             logger.warning("_advance_frame called unexpectedly. Stopping playback.")
             if self._play_timer.isActive(): self.stop_playback()
             return
-        ret: bool; frame_data: Optional[np.ndarray]
-        ret, frame_data = self._video_capture.read()
-        if ret and frame_data is not None:
-            next_frame_index = self._current_frame_index + 1
-            if next_frame_index >= self._total_frames:
-                logger.info("Playback reached end of video.")
-                self.stop_playback()
-                return
+        direction = self._playback_direction
+        if (direction > 0 and self._current_frame_index >= self._total_frames - 1) or \
+           (direction < 0 and self._current_frame_index <= 0):
+            logger.info(f"Playback reached {'end' if direction > 0 else 'start'} of video.")
+            self.stop_playback()
+            return
+        next_frame_index = max(0, min(self._due_playback_frame(), self._total_frames - 1))
+        if (next_frame_index - self._current_frame_index) * direction <= 0:
+            return # Tick arrived early; the current frame is still due
+        stride = self._playback_stride
+        # Never wait on the read-ahead worker here: this runs on the GUI thread.
+        frame_data = self._take_prefetched_frame(next_frame_index)
+        if frame_data is None:
+            frame_data = self._lookup_decoded_frame(next_frame_index)
+        if frame_data is None and self._prefetcher is not None and self._prefetcher.is_pending(next_frame_index):
+            # The worker is decoding it (or, backwards, its whole GOP): skip this tick rather
+            # than decode it twice. The wall clock picks the due frame again on the next tick.
+            return
+        if frame_data is None:
+            frame_data = self._decoder_cursor.read_frame(next_frame_index)
+            if frame_data is not None:
+                self._remember_decoded_frame(next_frame_index, frame_data)
+            self._schedule_playback_read_ahead(next_frame_index)
+        if frame_data is not None:
+            self._stats_frames_skipped += max(0, abs(next_frame_index - self._current_frame_index) - stride)
+            self._stats_frames_shown += 1
             self._current_frame_index = next_frame_index
+            self._is_showing_proxy = False
             q_pixmap = self._convert_cv_to_qpixmap(frame_data)
             if not q_pixmap.isNull():
-                self.frameChanged.emit(q_pixmap, self._current_frame_index)
+                self.frameChanged.emit(q_pixmap, self._current_frame_index, self._seek_request_id)
             else:
                 logger.warning(f"Failed to convert frame {self._current_frame_index} during playback.")
+            self._emit_playback_stats_if_due()
         else:
             logger.warning("Playback stopped: End of stream reached or error reading next frame during _advance_frame.")
             self.stop_playback()
 
+    def _update_playback_timing(self) -> None:
+        """
+        Derives the display tick and frame stride from the video FPS and playback
+        rate. Ticks never come faster than the display can usefully show frames;
+        above that, each tick advances several video frames.
+        """
+        frames_per_second = self._fps * self._playback_rate
+        frame_interval_ms = 1000.0 / frames_per_second
+        tick_ms = max(frame_interval_ms, config.PLAYBACK_MIN_DISPLAY_INTERVAL_MS)
+        self._playback_stride = max(1, int(round(tick_ms / frame_interval_ms)))
+        self._play_timer.setInterval(max(1, int(round(frame_interval_ms * self._playback_stride))))
+        logger.debug(f"Playback timer interval set to {self._play_timer.interval()} ms, "
+                     f"stride {self._playback_stride} frame(s) at {self._playback_rate:g}x.")
+
+    def _restart_playback_clock(self) -> None:
+        self._playback_anchor_frame = max(0, self._current_frame_index)
+        self._playback_clock.start()
+        self._stats_window_start_ms = 0
+        self._stats_window_start_frame = self._playback_anchor_frame
+        self._stats_frames_shown = 0
+        self._stats_frames_skipped = 0
+
+    def _due_playback_frame(self) -> int:
+        """Index of the frame that should be on screen now, on the playback stride grid."""
+        elapsed_frames = self._playback_clock.elapsed() * self._fps * self._playback_rate / 1000.0
+        steps = int(round(elapsed_frames / self._playback_stride))
+        return self._playback_anchor_frame + steps * self._playback_stride * self._playback_direction
+
+    def _emit_playback_stats_if_due(self) -> None:
+        elapsed_ms = self._playback_clock.elapsed()
+        window_ms = elapsed_ms - self._stats_window_start_ms
+        if window_ms < config.PLAYBACK_STATS_INTERVAL_MS:
+            return
+        window_s = window_ms / 1000.0
+        display_fps = self._stats_frames_shown / window_s
+        frames_advanced = abs(self._current_frame_index - self._stats_window_start_frame)
+        achieved_speed = (frames_advanced / window_s) / self._fps if self._fps > 0 else 0.0
+        logger.debug(f"Playback: {display_fps:.1f} fps shown, {achieved_speed:.2f}x real time, "
+                     f"{self._stats_frames_skipped} frames skipped, "
+                     f"last frame conversion {self._conversion_last_s * 1000.0:.2f} ms.")
+        self.playbackStatsChanged.emit(display_fps, achieved_speed, self._stats_frames_skipped)
+        self._stats_window_start_ms = elapsed_ms
+        self._stats_window_start_frame = self._current_frame_index
+        self._stats_frames_shown = 0
+        self._stats_frames_skipped = 0
+
     def _read_and_emit_frame(self, frame_index: int) -> None:
-        frame_data = self._read_raw_frame_from_video(frame_index)
+        request_id = self._new_seek_request_id() # A synchronous seek supersedes any in-flight one
+        frame_data = self._take_prefetched_frame(frame_index)
+        if frame_data is None:
+            frame_data = self.get_raw_frame_at_index(frame_index)
         if frame_data is not None:
-            self._current_frame_index = frame_index 
-            q_pixmap = self._convert_cv_to_qpixmap(frame_data)
-            if not q_pixmap.isNull():
-                logger.debug(f"Successfully read/converted frame {frame_index} for GUI. Emitting frameChanged.")
-                self.frameChanged.emit(q_pixmap, frame_index)
-            else:
-                logger.warning(f"Failed to convert frame {frame_index} to QPixmap after reading for GUI.")
+            self._emit_decoded_frame(frame_index, frame_data, request_id)
         else:
             logger.warning(f"Failed to read frame {frame_index} for GUI in _read_and_emit_frame.")
 
+    def _emit_decoded_frame(self, frame_index: int, frame_data: np.ndarray, request_id: int) -> None:
+        self._current_frame_index = frame_index 
+        self._is_showing_proxy = False
+        q_pixmap = self._convert_cv_to_qpixmap(frame_data)
+        if not q_pixmap.isNull():
+            logger.debug(f"Successfully read/converted frame {frame_index} for GUI. Emitting frameChanged.")
+            self.frameChanged.emit(q_pixmap, frame_index, request_id)
+        else:
+            logger.warning(f"Failed to convert frame {frame_index} to QPixmap after reading for GUI.")
+
+    def _new_seek_request_id(self) -> int:
+        """Starts a new seek request; results of every earlier asynchronous seek become stale."""
+        self._seek_request_id += 1
+        self._pending_seek_index = -1
+        return self._seek_request_id
+
+    def _display_target_index(self) -> int:
+        """The frame that will be on screen once the in-flight seek (if any) completes."""
+        return self._pending_seek_index if self._pending_seek_index >= 0 else self._current_frame_index
+
+    def _ensure_seek_worker(self) -> FrameSeekWorker:
+        if self._seek_worker is None:
+            filepath = self._video_filepath
+            keyframes = self._keyframes
+            sequence_options = self._sequence_options
+            backend, threads = self._decode_backend, self._ffmpeg_threads
+            self._seek_worker = FrameSeekWorker(
+                cursor_factory=lambda: VideoHandler._open_decoder_cursor(filepath, keyframes, sequence_options, backend, threads),
+                parent=self)
+            self._seek_worker.frameDecoded.connect(self._on_seek_frame_decoded)
+        return self._seek_worker
+
+    def _stop_seek_worker(self) -> None:
+        if self._seek_worker is not None:
+            self._seek_worker.frameDecoded.disconnect(self._on_seek_frame_decoded)
+            self._seek_worker.stop()
+            self._seek_worker.deleteLater()
+            self._seek_worker = None
+
+    @QtCore.Slot(int, int, object)
+    def _on_seek_frame_decoded(self, request_id: int, frame_index: int, frame_data: Optional[np.ndarray]) -> None:
+        if request_id != self._seek_request_id or not self._is_loaded:
+            logger.debug(f"Dropping stale seek result for frame {frame_index} (request {request_id}).")
+            return
+        self._pending_seek_index = -1
+        if frame_data is None:
+            logger.warning(f"Background seek could not decode frame {frame_index}.")
+            return
+        self._remember_decoded_frame(frame_index, frame_data)
+        self._emit_decoded_frame(frame_index, frame_data, request_id)
+
+    @staticmethod
+    def _open_decoder_cursor(filepath: str,
+                             keyframes: Optional[np.ndarray] = None,
+                             sequence_options: Optional[Dict[str, Any]] = None,
+                             decode_backend: str = BACKEND_OPENCV,
+                             ffmpeg_threads: int = 0,
+                             profile: Optional[DecodeProfile] = None) -> Optional[_DecoderCursor]:
+        """
+        Opens an independent capture on filepath for use by a worker thread. profile
+        is only honoured by the ffmpeg backend (see capture_source.residual_profile).
+        """
+        capture = capture_source.open_capture(filepath, sequence_options, decode_backend, ffmpeg_threads, profile)
+        if not capture or not capture.isOpened():
+            logger.error(f"Could not open an additional decoder for '{os.path.basename(filepath)}'.")
+            return None
+        return _DecoderCursor(capture, keyframes)
+
+    @staticmethod
+    def _choose_decode_backend(requested: Optional[str]) -> str:
+        backend = requested
+        if backend is None:
+            use_ffmpeg = bool(settings_manager.get_setting(settings_manager.KEY_FFMPEG_DECODER_ENABLED))
+            backend = BACKEND_FFMPEG if use_ffmpeg else BACKEND_OPENCV
+        if backend == BACKEND_FFMPEG and not ffmpeg_source.ffmpeg_available():
+            logger.warning("FFmpeg decoder requested but ffmpeg/ffprobe were not found on PATH; using OpenCV.")
+            return BACKEND_OPENCV
+        return backend if backend in (BACKEND_OPENCV, BACKEND_FFMPEG) else BACKEND_OPENCV
+
+    def _start_deferred_loading(self, generation: int) -> None:
+        """
+        Second half of open_video(), run after the first frame is displayed: loads or
+        scans the indexes, opens the proxy and frame store, and probes codec details.
+        Each step reads or writes files next to the video, which can take seconds on
+        network storage.
+        """
+        if generation != self._open_generation or not self._is_loaded:
+            return
+        self._load_or_verify_frame_count()
+        self._load_or_scan_keyframe_index()
+        self._load_or_scan_timestamp_index()
+        self._open_or_build_proxy()
+        self._open_frame_store()
+        self._start_metadata_probe()
+        self._emit_metadata_updated()
+
+    def _start_metadata_probe(self) -> None:
+        if self._sequence_options is not None:
+            self._container_metadata = {video_metadata.FIELD_FOURCC: "N/A", video_metadata.FIELD_BITRATE: "N/A"}
+            return
+        self._metadata_probe_thread = MetadataProbeThread(self._video_filepath, self)
+        self._metadata_probe_thread.probeFinished.connect(self._on_metadata_probe_finished)
+        self._metadata_probe_thread.start(QtCore.QThread.Priority.LowPriority)
+
+    def _cancel_metadata_probe(self) -> None:
+        if self._metadata_probe_thread is None:
+            return
+        self._metadata_probe_thread.probeFinished.disconnect(self._on_metadata_probe_finished)
+        self._metadata_probe_thread.requestInterruption()
+        self._metadata_probe_thread.wait()
+        self._metadata_probe_thread.deleteLater()
+        self._metadata_probe_thread = None
+
+    @QtCore.Slot(str, object)
+    def _on_metadata_probe_finished(self, filepath: str, metadata: Dict[str, str]) -> None:
+        if self._metadata_probe_thread is not None:
+            self._metadata_probe_thread.wait()
+            self._metadata_probe_thread.deleteLater()
+            self._metadata_probe_thread = None
+        if not self._is_loaded or filepath != self._video_filepath:
+            return
+        self._container_metadata = dict(metadata)
+        self._emit_metadata_updated()
+
+    def _emit_metadata_updated(self) -> None:
+        if self._is_loaded:
+            self.videoMetadataUpdated.emit(self.get_metadata_dictionary())
+
+    def _load_or_scan_keyframe_index(self) -> None:
+        """Uses a cached keyframe index for the current video or starts a background scan."""
+        if self._sequence_options is not None:
+            return # Every frame of an image sequence is independently addressable
+        keyframes = video_index.load_index_section(self._video_filepath, video_index.SECTION_KEYFRAMES)
+        if keyframes is not None:
+            self._apply_keyframe_index(keyframes)
+            return
+        if not settings_manager.get_setting(settings_manager.KEY_BUILD_KEYFRAME_INDEX):
+            logger.debug("Keyframe indexing disabled in preferences.")
+            return
+        self._start_index_scan(video_index.SECTION_KEYFRAMES, video_index.scan_keyframes)
+
+    def _load_or_scan_timestamp_index(self) -> None:
+        """Uses cached per-frame timestamps for the current video or starts a background scan."""
+        if self._sequence_options is not None:
+            return # Image sequences have no timestamps; their FPS is exact by definition
+        frame_times_ms = video_index.load_index_section(self._video_filepath, video_index.SECTION_FRAME_TIMES)
+        if frame_times_ms is not None:
+            self._apply_frame_times(frame_times_ms)
+            return
+        if not settings_manager.get_setting(settings_manager.KEY_BUILD_TIMESTAMP_INDEX):
+            logger.debug("Timestamp indexing disabled in preferences.")
+            return
+        self._start_index_scan(video_index.SECTION_FRAME_TIMES, video_index.scan_frame_times)
+
+    def _load_or_verify_frame_count(self) -> None:
+        """Uses a cached decodable-frame count for the current video or starts a background count."""
+        if self._sequence_options is not None:
+            return # Image sequence frame counts are exact
+        frame_count = video_index.load_index_section(self._video_filepath, video_index.SECTION_FRAME_COUNT)
+        if frame_count is not None:
+            self._apply_decodable_frame_count(frame_count)
+            return
+        if not settings_manager.get_setting(settings_manager.KEY_VERIFY_FRAME_COUNT):
+            logger.debug("Frame count verification disabled in preferences.")
+            return
+        self._start_index_scan(video_index.SECTION_FRAME_COUNT, video_index.scan_decodable_frame_count)
+
+    def _start_index_scan(self, section: str, scan_function: Any) -> None:
+        scan_thread = VideoIndexScanThread(self._video_filepath, section, scan_function, self)
+        scan_thread.scanFinished.connect(self._on_index_scan_finished)
+        scan_thread.finished.connect(self._on_index_scan_thread_finished)
+        self._index_scan_threads.append(scan_thread)
+        scan_thread.start(QtCore.QThread.Priority.LowPriority)
+
+    @QtCore.Slot()
+    def _on_index_scan_thread_finished(self) -> None:
+        scan_thread = self.sender()
+        if scan_thread in self._index_scan_threads:
+            self._index_scan_threads.remove(scan_thread)
+        if scan_thread is not None:
+            scan_thread.deleteLater()
+
+    def _cancel_index_scans(self) -> None:
+        for scan_thread in list(self._index_scan_threads):
+            scan_thread.scanFinished.disconnect(self._on_index_scan_finished)
+            scan_thread.requestInterruption()
+            scan_thread.wait()
+        self._index_scan_threads.clear()
+
+    @QtCore.Slot(str, str, object)
+    def _on_index_scan_finished(self, section: str, filepath: str, result: Any) -> None:
+        if not self._is_loaded or filepath != self._video_filepath:
+            logger.debug(f"Discarding '{section}' scan result for a video that is no longer loaded.")
+            return
+        if result is None:
+            logger.info(f"Background '{section}' scan produced no result for '{os.path.basename(filepath)}'.")
+            return
+        if section == video_index.SECTION_KEYFRAMES:
+            self._apply_keyframe_index(result)
+        elif section == video_index.SECTION_FRAME_TIMES:
+            self._apply_frame_times(result)
+        elif section == video_index.SECTION_FRAME_COUNT:
+            self._apply_decodable_frame_count(result)
+        self._emit_metadata_updated()
+
+    def _apply_keyframe_index(self, keyframes: np.ndarray) -> None:
+        self._keyframes = np.asarray(keyframes, dtype=np.int64)
+        if self._decoder_cursor:
+            self._decoder_cursor.keyframes = self._keyframes
+        self._stop_prefetcher() # Recreated lazily so its decoder uses the index
+        if self._seek_worker is not None:
+            self._stop_seek_worker()
+            if self._pending_seek_index >= 0: # Re-post the in-flight seek to the new decoder
+                self._ensure_seek_worker().request(self._seek_request_id, self._pending_seek_index)
+        logger.info(f"Keyframe index active: {self._keyframes.size} keyframes.")
+
+    def _apply_frame_times(self, frame_times_ms: np.ndarray) -> None:
+        self._frame_times_ms = np.asarray(frame_times_ms, dtype=np.float64)
+        if self._frame_times_ms.size != self._total_frames:
+            logger.warning(f"Timestamp index has {self._frame_times_ms.size} entries but the video reports "
+                           f"{self._total_frames} frames. Frames past the index use the nominal FPS.")
+        self._update_total_duration()
+        if isinstance(self._video_capture, FFmpegPipeCapture) and not self._video_capture.is_cfr:
+            # VFR ffmpeg decoders seek by these timestamps instead of decoding forward from frame 0.
+            self._video_capture.set_frame_times(self._frame_times_ms)
+            self._stop_prefetcher() # Recreated lazily; new decoders load the index from the sidecar
+            if self._seek_worker is not None:
+                self._stop_seek_worker()
+                if self._pending_seek_index >= 0:
+                    self._ensure_seek_worker().request(self._seek_request_id, self._pending_seek_index)
+        logger.info(f"Timestamp index active: {self._frame_times_ms.size} frames, duration {self._total_duration_ms:.1f} ms.")
+        self.frameTimesChanged.emit()
+
+    def _apply_decodable_frame_count(self, frame_count: np.ndarray) -> None:
+        decodable_frames = int(frame_count)
+        if decodable_frames <= 0 or decodable_frames == self._total_frames:
+            return
+        logger.warning(f"Video reports {self._total_frames} frames but {decodable_frames} decode. Using {decodable_frames}.")
+        self._total_frames = decodable_frames
+        self._update_total_duration()
+        self._stop_prefetcher() # Recreated lazily with the corrected range
+        if self._frame_store is not None: # Reopened with the corrected layout
+            self._frame_store.close()
+            self._frame_store = None
+            self._open_frame_store()
+        self.totalFramesChanged.emit(decodable_frames)
+        if self._current_frame_index >= decodable_frames:
+            self.seek_frame(decodable_frames - 1)
+
+    def _update_total_duration(self) -> None:
+        """Derives total_duration_ms from the frame count and, once known, the frame timestamps."""
+        if self._total_frames <= 0 or self._fps <= 0:
+            self._total_duration_ms = 0.0
+        elif self._frame_times_ms is None:
+            self._total_duration_ms = (self._total_frames / self._fps) * 1000
+        else:
+            # The last frame is displayed for one (mean) frame interval.
+            mean_interval_ms = float(np.diff(self._frame_times_ms).mean()) if self._frame_times_ms.size > 1 else 1000.0 / self._fps
+            self._total_duration_ms = self.frame_index_to_time_ms(self._total_frames - 1) + mean_interval_ms
+
+    def _schedule_playback_read_ahead(self, shown_index: int) -> None:
+        stride = self._playback_stride
+        self._schedule_read_ahead(shown_index + stride * self._playback_direction, self._playback_direction, stride)
+
+    def _schedule_read_ahead(self, anchor_index: int, direction: int, stride: int = 1) -> None:
+        """Points the background read-ahead at anchor_index, creating the worker if needed."""
+        if not self._is_loaded or not self._prefetch_enabled:
+            return
+        if not (0 <= anchor_index < self._total_frames):
+            return
+        if self._prefetcher is None:
+            filepath = self._video_filepath
+            keyframes = self._keyframes
+            sequence_options = self._sequence_options
+            backend, threads = self._decode_backend, self._ffmpeg_threads
+            self._prefetcher = FramePrefetcher(
+                cursor_factory=lambda: VideoHandler._open_decoder_cursor(filepath, keyframes, sequence_options, backend, threads),
+                total_frames=self._total_frames,
+                depth=self._prefetch_depth,
+                reverse_chunk_frames=config.REVERSE_DECODE_CHUNK_BYTES // max(1, self._frame_width * self._frame_height * 3))
+            logger.info(f"Frame read-ahead enabled (depth {self._prefetch_depth} frames).")
+        self._prefetcher.retarget(anchor_index, direction, stride)
+
+    def _take_prefetched_frame(self, frame_index: int, timeout_s: float = 0.0) -> Optional[np.ndarray]:
+        """Returns the frame from the read-ahead buffer (and caches it), or None if not prefetched."""
+        if self._prefetcher is None:
+            return None
+        frame_data = self._prefetcher.take(frame_index, timeout_s)
+        if frame_data is not None:
+            self._remember_decoded_frame(frame_index, frame_data)
+        return frame_data
+
+    def _frame_store_for(self, profile: DecodeProfile) -> Optional[DecodedFrameStore]:
+        """
+        The decoded-frame store if it can serve frames for profile, else None. A
+        grayscale store only serves 8-bit grayscale passes: colour requests
+        (display, export, BGR analysis) must decode, not get gray frames back
+        as BGR. Native-depth (GRAY16) passes never use the 8-bit store.
+        """
+        store = self._frame_store
+        if store is None or profile.color_mode == DecodeColorMode.GRAY16:
+            return None
+        if store.is_grayscale and profile.color_mode != DecodeColorMode.GRAY8:
+            return None
+        return store
+
+    def _lookup_decoded_frame(self, frame_index: int) -> Optional[np.ndarray]:
+        """Returns the BGR frame from the memory cache or the decoded-frame store, or None."""
+        frame_data = self._frame_cache.get(frame_index)
+        store = self._frame_store_for(BGR8_PROFILE)
+        if frame_data is None and store is not None:
+            stored_frame = store.get(frame_index)
+            if stored_frame is not None:
+                frame_data = BGR8_PROFILE.apply(stored_frame)
+        return frame_data
+
+    def _remember_decoded_frame(self, frame_index: int, frame_data: np.ndarray) -> None:
+        self._frame_cache.put(frame_index, frame_data)
+        if self._frame_store is not None:
+            self._frame_store.put(frame_index, frame_data)
+
+    def _open_frame_store(self) -> None:
+        """Opens the on-disk decoded-frame store for the current video if "decode once" mode is on."""
+        if not settings_manager.get_setting(settings_manager.KEY_DECODE_STORE_ENABLED):
+            return
+        if isinstance(self._video_capture, ImageSequenceCapture) and self._video_capture.is_memory_mapped:
+            logger.debug("Image sequence is memory-mapped already; decoded-frame store not needed.")
+            return
+        max_gb = float(settings_manager.get_setting(settings_manager.KEY_DECODE_STORE_MAX_GB))
+        self._frame_store = DecodedFrameStore.open_for_video(
+            self._video_filepath, self._frame_width, self._frame_height, self._total_frames,
+            grayscale=bool(settings_manager.get_setting(settings_manager.KEY_DECODE_STORE_GRAYSCALE)),
+            max_total_bytes=int(max_gb * 1024**3))
+
+    def _stop_prefetcher(self) -> None:
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+            self._prefetcher = None
+
+    def _read_and_emit_proxy_frame(self, frame_index: int) -> bool:
+        """Emits proxyFrameChanged for frame_index. Returns False if the proxy cannot serve it."""
+        if self._proxy_cursor is None:
+            return False
+        proxy_frame = self._proxy_cursor.read_frame(frame_index)
+        if proxy_frame is None:
+            logger.debug(f"Proxy has no frame {frame_index}; falling back to full resolution.")
+            return False
+        q_pixmap = self._convert_cv_to_qpixmap(proxy_frame)
+        if q_pixmap.isNull():
+            return False
+        self._new_seek_request_id()
+        self._current_frame_index = frame_index
+        self._is_showing_proxy = True
+        self.proxyFrameChanged.emit(q_pixmap, frame_index)
+        return True
+
+    def _open_or_build_proxy(self) -> None:
+        """Opens an existing scrubbing proxy for the current video or starts building one."""
+        if not settings_manager.get_setting(settings_manager.KEY_PROXY_ENABLED):
+            return
+        if self._sequence_options is not None:
+            logger.debug("Image sequences are read frame by frame; no scrubbing proxy needed.")
+            return
+        max_dimension = int(settings_manager.get_setting(settings_manager.KEY_PROXY_MAX_DIMENSION))
+        if max(self._frame_width, self._frame_height) <= max_dimension:
+            logger.debug("Video is already no larger than the proxy size; no proxy needed.")
+            return
+        proxy_path = video_proxy.proxy_path_for(self._video_filepath, max_dimension)
+        if proxy_path is None:
+            return
+        if os.path.isfile(proxy_path):
+            self._attach_proxy(proxy_path)
+            return
+        self._proxy_build_thread = ProxyBuildThread(self._video_filepath, proxy_path, max_dimension, self)
+        self._proxy_build_thread.proxyBuildFinished.connect(self._on_proxy_build_finished)
+        self._proxy_build_thread.start(QtCore.QThread.Priority.LowPriority)
+
+    @QtCore.Slot(str, str)
+    def _on_proxy_build_finished(self, filepath: str, proxy_path: str) -> None:
+        if self._proxy_build_thread is not None:
+            self._proxy_build_thread.wait()
+            self._proxy_build_thread.deleteLater()
+            self._proxy_build_thread = None
+        if self._is_loaded and filepath == self._video_filepath and proxy_path:
+            self._attach_proxy(proxy_path)
+
+    def _attach_proxy(self, proxy_path: str) -> None:
+        capture = cv2.VideoCapture(proxy_path)
+        if not capture.isOpened():
+            logger.warning(f"Could not open scrubbing proxy '{proxy_path}'.")
+            return
+        proxy_width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        if proxy_width <= 0 or self._frame_width <= 0:
+            capture.release()
+            return
+        self._proxy_cursor = _DecoderCursor(capture)
+        self._proxy_scale = proxy_width / float(self._frame_width)
+        logger.info(f"Scrubbing proxy active ({proxy_width}px wide, scale {self._proxy_scale:.3f}).")
+
+    def _release_proxy(self) -> None:
+        if self._proxy_build_thread is not None:
+            self._proxy_build_thread.proxyBuildFinished.disconnect(self._on_proxy_build_finished)
+            self._proxy_build_thread.requestInterruption()
+            self._proxy_build_thread.wait()
+            self._proxy_build_thread.deleteLater()
+            self._proxy_build_thread = None
+        if self._proxy_cursor is not None:
+            self._proxy_cursor.release()
+            self._proxy_cursor = None
+        self._proxy_scale = 1.0
+        self._is_showing_proxy = False
+
     def _convert_cv_to_qpixmap(self, cv_img: np.ndarray) -> QtGui.QPixmap:
+        """
+        Converts a decoded frame to a QPixmap with a single copy (into the pixmap).
+
+        BGR and grayscale frames are wrapped in place using QImage formats that
+        match OpenCV's byte order, so no colour conversion is needed. Frames that
+        are not C-contiguous (e.g. ROI views) or need conversion go through a
+        staging buffer that is reused between frames of the same shape. The
+        QImage only borrows the numpy memory; QPixmap.fromImage copies it
+        before the array can go out of scope.
+        """
         try:
             if cv_img is None:
                 logger.warning("Attempted to convert None image to QPixmap.")
                 return QtGui.QPixmap()
+            started = time.perf_counter()
             height, width = cv_img.shape[:2]
             channels = cv_img.shape[2] if len(cv_img.shape) == 3 else 1
-            bytes_per_line: int = cv_img.strides[0] 
-            q_img: Optional[QtGui.QImage] = None
-            if channels == 1: 
+            if channels == 1:
                 img_format = QtGui.QImage.Format.Format_Grayscale8
-                cv_img_copy = np.require(cv_img, np.uint8, 'C') 
-                q_img = QtGui.QImage(cv_img_copy.data, width, height, bytes_per_line, img_format)
-            elif channels == 3: 
-                img_format = QtGui.QImage.Format.Format_RGB888
-                rgb_img = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB) 
-                rgb_img_copy = np.require(rgb_img, np.uint8, 'C')
-                q_img = QtGui.QImage(rgb_img_copy.data, width, height, bytes_per_line, img_format)
-            elif channels == 4: 
-                img_format = QtGui.QImage.Format.Format_RGBA8888
-                rgba_img = cv2.cvtColor(cv_img, cv2.COLOR_BGRA2RGBA) 
-                rgba_img_copy = np.require(rgba_img, np.uint8, 'C')
-                q_img = QtGui.QImage(rgba_img_copy.data, width, height, bytes_per_line, img_format)
+                display_img = self._contiguous_for_display(cv_img)
+            elif channels == 3:
+                img_format = QtGui.QImage.Format.Format_BGR888
+                display_img = self._contiguous_for_display(cv_img)
+            elif channels == 4:
+                if sys.byteorder == "little":
+                    # ARGB32 is 0xAARRGGBB in native endianness, i.e. B,G,R,A bytes: OpenCV's BGRA.
+                    img_format = QtGui.QImage.Format.Format_ARGB32
+                    display_img = self._contiguous_for_display(cv_img)
+                else:
+                    img_format = QtGui.QImage.Format.Format_RGBA8888
+                    display_img = self._staging_buffer_for(cv_img.shape)
+                    cv2.cvtColor(cv_img, cv2.COLOR_BGRA2RGBA, dst=display_img)
             else:
                 logger.error(f"Unsupported number of image channels ({channels}) for conversion.")
                 return QtGui.QPixmap()
-            if q_img is None or q_img.isNull():
+            if display_img.dtype != np.uint8:
+                logger.error(f"Unsupported image dtype ({display_img.dtype}) for conversion.")
+                return QtGui.QPixmap()
+            q_img = QtGui.QImage(display_img.data, width, height, display_img.strides[0], img_format)
+            if q_img.isNull():
                 logger.error("QImage creation failed during conversion.")
                 return QtGui.QPixmap()
-            return QtGui.QPixmap.fromImage(q_img.copy())
+            q_pixmap = QtGui.QPixmap.fromImage(q_img)
+            del q_img # Drop the borrowed view before display_img can be reused
+            elapsed = time.perf_counter() - started
+            self._conversion_count += 1
+            self._conversion_total_s += elapsed
+            self._conversion_last_s = elapsed
+            self._conversion_max_s = max(self._conversion_max_s, elapsed)
+            return q_pixmap
         except cv2.error as e:
             logger.error(f"OpenCV error during image conversion: {e}", exc_info=False) 
             return QtGui.QPixmap()
@@ -458,6 +1493,25 @@ class VideoHandler(QtCore.QObject):
             logger.exception(f"Unexpected error converting OpenCV frame to QPixmap: {e}")
             return QtGui.QPixmap()
 
+    def _contiguous_for_display(self, cv_img: np.ndarray) -> np.ndarray:
+        """Returns cv_img itself if QImage can wrap it, else a copy in a reused staging buffer."""
+        if cv_img.flags['C_CONTIGUOUS']:
+            return cv_img
+        staging = self._staging_buffer_for(cv_img.shape)
+        np.copyto(staging, cv_img)
+        return staging
+
+    def _staging_buffer_for(self, shape: Tuple[int, ...]) -> np.ndarray:
+        buffer = self._display_staging_buffers.get(shape)
+        if buffer is None:
+            # One buffer per shape (full frames and proxy frames alternate while scrubbing).
+            if len(self._display_staging_buffers) >= 4:
+                self._display_staging_buffers.clear()
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._display_staging_buffers[shape] = buffer
+        self._conversion_staged_count += 1
+        return buffer
+
     # --- Properties ---
     @property
     def is_loaded(self) -> bool:
@@ -479,4 +1533,29 @@ class VideoHandler(QtCore.QObject):
         return self._frame_height
     @property
     def total_duration_ms(self) -> float:
-        return self._total_duration_ms
\ No newline at end of file
+        return self._total_duration_ms
+    @property
+    def has_frame_timestamps(self) -> bool:
+        return self._frame_times_ms is not None
+    @property
+    def playback_rate(self) -> float:
+        return self._playback_rate
+    @property
+    def playback_direction(self) -> int:
+        return self._playback_direction
+    @property
+    def latest_seek_request_id(self) -> int:
+        return self._seek_request_id
+    @property
+    def decode_backend(self) -> str:
+        return self._decode_backend
+    @property
+    def supports_gray16(self) -> bool:
+        """True if analysis passes can request native-depth 16-bit grayscale frames."""
+        return isinstance(self._video_capture, ImageSequenceCapture) and self._video_capture.has_16bit_samples
+    @property
+    def is_showing_proxy_frame(self) -> bool:
+        return self._is_showing_proxy
+    @property
+    def proxy_scale(self) -> float:
+        return self._proxy_scale
\ No newline at end of file
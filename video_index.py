@@ -0,0 +1,311 @@
+# video_index.py
+"""
+Per-video indexes (e.g. keyframe positions) computed by background scans and
+persisted in a sidecar file keyed by the video's size and modification time.
+"""
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from typing import Callable, Dict, Optional, Any
+
+import cv2 # type: ignore
+import numpy as np
+from PySide6 import QtCore
+
+import config
+from ffmpeg_source import ffmpeg_available, subprocess_flags
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = ".pyroindex.npz"
+_FINGERPRINT_SIZE_KEY = "_fingerprint_size"
+_FINGERPRINT_MTIME_KEY = "_fingerprint_mtime_ns"
+
+# Index section names stored in the sidecar
+SECTION_KEYFRAMES = "keyframes"
+SECTION_FRAME_TIMES = "frame_times_ms"
+SECTION_FRAME_COUNT = "decodable_frame_count"
+
+# Scans of different sections finish on different threads; each save is a
+# read-merge-write of the whole sidecar, so saves must not interleave.
+_sidecar_write_lock = threading.Lock()
+
+def compute_file_fingerprint(filepath: str) -> Optional[Dict[str, int]]:
+    """Returns the size and modification time identifying the current contents of filepath."""
+    try:
+        stat_result = os.stat(filepath)
+    except OSError as e:
+        logger.warning(f"Cannot fingerprint '{filepath}': {e}")
+        return None
+    return {"size": int(stat_result.st_size), "mtime_ns": int(stat_result.st_mtime_ns)}
+
+def _fallback_sidecar_path(filepath: str) -> str:
+    cache_dir = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.CacheLocation)
+    path_hash = hashlib.sha1(os.path.abspath(filepath).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, "video_index", path_hash + SIDECAR_SUFFIX)
+
+def _candidate_sidecar_paths(filepath: str) -> list:
+    # Next to the video first; the user cache directory covers read-only archives.
+    return [filepath + SIDECAR_SUFFIX, _fallback_sidecar_path(filepath)]
+
+def _read_sidecar(filepath: str) -> Dict[str, np.ndarray]:
+    fingerprint = compute_file_fingerprint(filepath)
+    if fingerprint is None:
+        return {}
+    for sidecar_path in _candidate_sidecar_paths(filepath):
+        if not os.path.isfile(sidecar_path):
+            continue
+        try:
+            with np.load(sidecar_path, allow_pickle=False) as data:
+                sections = {name: data[name] for name in data.files}
+        except Exception as e:
+            logger.warning(f"Could not read video index sidecar '{sidecar_path}': {e}")
+            continue
+        size = sections.pop(_FINGERPRINT_SIZE_KEY, None)
+        mtime_ns = sections.pop(_FINGERPRINT_MTIME_KEY, None)
+        if size is None or mtime_ns is None or \
+           int(size) != fingerprint["size"] or int(mtime_ns) != fingerprint["mtime_ns"]:
+            logger.info(f"Video index sidecar '{sidecar_path}' is stale (video changed). Ignoring.")
+            continue
+        return sections
+    return {}
+
+def load_index_section(filepath: str, section: str) -> Optional[np.ndarray]:
+    """Returns a cached index section for filepath, or None if absent or stale."""
+    array = _read_sidecar(filepath).get(section)
+    if array is not None:
+        logger.info(f"Loaded cached '{section}' index for '{os.path.basename(filepath)}' ({array.size} entries).")
+    return array
+
+def _write_sidecar(sidecar_path: str, sections: Dict[str, np.ndarray]) -> bool:
+    # A unique temporary file, replaced into place, so readers never see a partial sidecar.
+    temp_path = ""
+    try:
+        directory = os.path.dirname(sidecar_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        with os.fdopen(file_descriptor, "wb") as f:
+            np.savez_compressed(f, **sections)
+        os.replace(temp_path, sidecar_path)
+        return True
+    except OSError as e:
+        logger.debug(f"Could not write video index sidecar '{sidecar_path}': {e}")
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return False
+
+def save_index_section(filepath: str, section: str, array: np.ndarray) -> bool:
+    """Stores an index section for filepath, keeping any other valid sections."""
+    fingerprint = compute_file_fingerprint(filepath)
+    if fingerprint is None:
+        return False
+    with _sidecar_write_lock:
+        sections = _read_sidecar(filepath)
+        sections[section] = np.asarray(array)
+        sections[_FINGERPRINT_SIZE_KEY] = np.array(fingerprint["size"], dtype=np.int64)
+        sections[_FINGERPRINT_MTIME_KEY] = np.array(fingerprint["mtime_ns"], dtype=np.int64)
+        for sidecar_path in _candidate_sidecar_paths(filepath):
+            if _write_sidecar(sidecar_path, sections):
+                logger.info(f"Saved '{section}' index to '{sidecar_path}'.")
+                return True
+    logger.warning(f"Could not save '{section}' index for '{os.path.basename(filepath)}' to any location.")
+    return False
+
+def scan_keyframes(filepath: str, should_cancel: Callable[[], bool]) -> Optional[np.ndarray]:
+    """
+    Lists the 0-based indices of keyframes in the video.
+
+    The capture is opened in raw (packet) mode, so grab() only demuxes and no
+    frame is decoded. Packet order equals display order at keyframes for
+    closed-GOP streams, which covers camera and phone footage.
+    Returns None if the backend cannot report keyframe flags or the scan is cancelled.
+    """
+    if not hasattr(cv2, "CAP_PROP_LRF_HAS_KEY_FRAME"):
+        logger.info("This OpenCV build cannot report keyframe flags. Keyframe index unavailable.")
+        return None
+    capture = cv2.VideoCapture(filepath, cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    try:
+        if not capture.isOpened() or int(capture.get(cv2.CAP_PROP_FORMAT)) != -1:
+            logger.info(f"Raw packet access unavailable for '{os.path.basename(filepath)}'. Keyframe index unavailable.")
+            return None
+        keyframes = []
+        packet_index = 0
+        while capture.grab():
+            if capture.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                keyframes.append(packet_index)
+            packet_index += 1
+            if packet_index % 500 == 0 and should_cancel():
+                logger.info("Keyframe scan cancelled.")
+                return None
+    finally:
+        capture.release()
+    if not keyframes:
+        logger.info(f"No keyframes reported for '{os.path.basename(filepath)}'. Keyframe index unavailable.")
+        return None
+    if keyframes[0] != 0:
+        keyframes.insert(0, 0) # The first decodable frame is always a valid restart point
+    logger.info(f"Keyframe scan found {len(keyframes)} keyframes in {packet_index} packets.")
+    return np.asarray(keyframes, dtype=np.int64)
+
+def keyframe_at_or_before(keyframes: np.ndarray, frame_index: int) -> int:
+    """Returns the nearest keyframe index <= frame_index (0 if none precedes it)."""
+    position = int(np.searchsorted(keyframes, frame_index, side="right")) - 1
+    return int(keyframes[position]) if position >= 0 else 0
+
+def _probe_packet_times_s(filepath: str, should_cancel: Callable[[], bool]) -> Optional[list]:
+    # Packet timestamps need no decoding; sorting puts B-frame reordered packets back in display order.
+    command = [config.FFPROBE_EXECUTABLE, "-v", "error", "-select_streams", "v:0",
+               "-show_entries", "packet=pts_time", "-of", "csv=p=0", filepath]
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   stdin=subprocess.DEVNULL, creationflags=subprocess_flags())
+    except OSError as e:
+        logger.info(f"Could not run ffprobe for the timestamp scan: {e}")
+        return None
+    times_s = []
+    try:
+        for line in process.stdout:
+            value = line.decode("ascii", errors="replace").strip().rstrip(",")
+            try:
+                times_s.append(float(value))
+            except ValueError:
+                continue # Packets without a timestamp ("N/A")
+            if len(times_s) % 5000 == 0 and should_cancel():
+                logger.info("Timestamp scan cancelled.")
+                return None
+    finally:
+        process.kill()
+        process.stdout.close()
+        process.wait()
+    return times_s or None
+
+def _capture_frame_times_s(filepath: str, should_cancel: Callable[[], bool]) -> Optional[list]:
+    capture = cv2.VideoCapture(filepath)
+    try:
+        if not capture.isOpened():
+            return None
+        times_s = []
+        while capture.grab():
+            times_s.append(capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+            if len(times_s) % 500 == 0 and should_cancel():
+                logger.info("Timestamp scan cancelled.")
+                return None
+    finally:
+        capture.release()
+    return times_s
+
+def scan_frame_times(filepath: str, should_cancel: Callable[[], bool]) -> Optional[np.ndarray]:
+    """
+    Lists the presentation time of every frame in milliseconds, relative to the
+    first frame (so frame 0 is at 0 ms).
+
+    Uses ffprobe's packet timestamps when ffprobe is installed (no decoding),
+    otherwise grabs every frame through OpenCV. Returns None if no timestamps
+    could be read or the scan is cancelled.
+    """
+    times_s = _probe_packet_times_s(filepath, should_cancel) if ffmpeg_available() else None
+    if times_s is None and not should_cancel():
+        times_s = _capture_frame_times_s(filepath, should_cancel)
+    if not times_s or should_cancel():
+        logger.info(f"No frame timestamps available for '{os.path.basename(filepath)}'.")
+        return None
+    times_ms = np.sort(np.asarray(times_s, dtype=np.float64)) * 1000.0
+    times_ms -= times_ms[0]
+    if times_ms.size > 1:
+        intervals = np.diff(times_ms)
+        logger.info(f"Timestamp scan found {times_ms.size} frames; frame interval "
+                    f"{intervals.min():.3f}-{intervals.max():.3f} ms (mean {intervals.mean():.3f} ms).")
+    return times_ms
+
+def scan_decodable_frame_count(filepath: str, should_cancel: Callable[[], bool]) -> Optional[np.ndarray]:
+    """
+    Counts the frames OpenCV can actually decode, by grab()bing through the video.
+    CAP_PROP_FRAME_COUNT is estimated from container headers and is often off by
+    a few frames for camera files. Returns the count as a 0-d int64 array (index
+    sections are arrays), or None if the video cannot be opened or the scan is cancelled.
+    """
+    capture = cv2.VideoCapture(filepath)
+    try:
+        if not capture.isOpened():
+            return None
+        reported_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        frame_count = 0
+        while capture.grab():
+            frame_count += 1
+            if frame_count % 500 == 0 and should_cancel():
+                logger.info("Frame count scan cancelled.")
+                return None
+    finally:
+        capture.release()
+    if frame_count == 0:
+        return None
+    logger.info(f"Frame count scan: {frame_count} decodable frames ({reported_count} reported by the container).")
+    return np.array(frame_count, dtype=np.int64)
+
+def frame_times_to_ms(frame_times_ms: Optional[np.ndarray], frame_indices: Any, fps: float) -> np.ndarray:
+    """
+    Vectorized frame index -> presentation time (ms). Indices beyond the end of
+    frame_times_ms (or all indices, when there is no index) use the nominal fps.
+    """
+    indices = np.asarray(frame_indices, dtype=np.float64)
+    frame_interval_ms = 1000.0 / fps if fps > 0 else 0.0
+    if frame_times_ms is None or frame_times_ms.size == 0:
+        return indices * frame_interval_ms
+    last = frame_times_ms.size - 1
+    lookup = frame_times_ms[np.clip(indices, 0, last).astype(np.int64)]
+    return np.where(indices <= last, lookup, frame_times_ms[last] + (indices - last) * frame_interval_ms)
+
+def nearest_frames_for_times_ms(frame_times_ms: Optional[np.ndarray], times_ms: Any, fps: float) -> np.ndarray:
+    """Vectorized presentation time (ms) -> nearest frame index, by binary search of frame_times_ms."""
+    times = np.asarray(times_ms, dtype=np.float64)
+    if frame_times_ms is None or frame_times_ms.size == 0:
+        return np.rint(times * fps / 1000.0).astype(np.int64)
+    after = np.clip(np.searchsorted(frame_times_ms, times, side="left"), 1, max(1, frame_times_ms.size - 1))
+    before = after - 1
+    if frame_times_ms.size == 1:
+        return np.zeros(times.shape, dtype=np.int64)
+    pick_after = np.abs(frame_times_ms[after] - times) < np.abs(times - frame_times_ms[before])
+    return np.where(pick_after, after, before).astype(np.int64)
+
+
+class VideoIndexScanThread(QtCore.QThread):
+    """
+    Runs an index scan for one video off the GUI thread, saves the result to the
+    sidecar and reports it through scanFinished(section, filepath, result).
+    The result is None if the scan failed or was cancelled.
+    """
+    scanFinished = QtCore.Signal(str, str, object)
+
+    def __init__(self,
+                 filepath: str,
+                 section: str,
+                 scan_function: Callable[[str, Callable[[], bool]], Optional[Any]],
+                 parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self._filepath = filepath
+        self._section = section
+        self._scan_function = scan_function
+
+    @property
+    def section(self) -> str:
+        return self._section
+
+    def run(self) -> None:
+        logger.info(f"Background '{self._section}' scan started for '{os.path.basename(self._filepath)}'.")
+        result: Optional[Any] = None
+        try:
+            result = self._scan_function(self._filepath, self.isInterruptionRequested)
+            if result is not None and not self.isInterruptionRequested():
+                save_index_section(self._filepath, self._section, result)
+        except Exception as e:
+            logger.exception(f"Background '{self._section}' scan failed: {e}")
+            result = None
+        if self.isInterruptionRequested():
+            result = None
+        self.scanFinished.emit(self._section, self._filepath, result)
@@ -0,0 +1,97 @@
+# video_metadata.py
+"""
+Container and stream details for the Video Information dialog (codec, bitrate,
+pixel format). None of it is needed to display frames, so it is probed on a
+background thread after the first frame is shown.
+"""
+import json
+import logging
+import os
+import subprocess
+from typing import Dict, Optional
+
+import cv2 # type: ignore
+from PySide6 import QtCore
+
+import config
+from ffmpeg_source import ffmpeg_available, subprocess_flags
+
+logger = logging.getLogger(__name__)
+
+# Keys of the probed values, as shown in the Video Information dialog
+FIELD_FOURCC = "FourCC Codec"
+FIELD_BITRATE = "Bitrate (bps)"
+FIELD_CODEC = "Codec"
+FIELD_PIXEL_FORMAT = "Pixel Format"
+FIELD_CONTAINER = "Container"
+
+def _probe_with_ffprobe(filepath: str) -> Optional[Dict[str, str]]:
+    command = [config.FFPROBE_EXECUTABLE, "-v", "error", "-select_streams", "v:0",
+               "-show_entries", "stream=codec_long_name,codec_tag_string,pix_fmt,bit_rate:format=format_long_name,bit_rate",
+               "-of", "json", filepath]
+    try:
+        result = subprocess.run(command, capture_output=True, check=True, timeout=60,
+                                creationflags=subprocess_flags())
+        info = json.loads(result.stdout.decode("utf-8", errors="replace"))
+        stream = info["streams"][0]
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError) as e:
+        logger.info(f"ffprobe metadata probe failed for '{os.path.basename(filepath)}': {e}")
+        return None
+    container = info.get("format", {})
+    fourcc = str(stream.get("codec_tag_string") or "")
+    bitrate = int(stream.get("bit_rate") or container.get("bit_rate") or 0)
+    return {
+        FIELD_FOURCC: fourcc if fourcc and not fourcc.startswith("[") else "N/A", # ffprobe writes untagged codecs as "[0][0][0][0]"
+        FIELD_BITRATE: str(bitrate) if bitrate > 0 else "N/A",
+        FIELD_CODEC: str(stream.get("codec_long_name") or "N/A"),
+        FIELD_PIXEL_FORMAT: str(stream.get("pix_fmt") or "N/A"),
+        FIELD_CONTAINER: str(container.get("format_long_name") or "N/A"),
+    }
+
+def _probe_with_opencv(filepath: str) -> Optional[Dict[str, str]]:
+    capture = cv2.VideoCapture(filepath)
+    try:
+        if not capture.isOpened():
+            return None
+        fourcc_int = int(capture.get(cv2.CAP_PROP_FOURCC))
+        fourcc_code = "".join(chr((fourcc_int >> 8 * i) & 0xFF) for i in range(4)) if fourcc_int != 0 else ""
+        fourcc_code = "".join(filter(str.isprintable, fourcc_code)).strip()
+        bitrate = capture.get(cv2.CAP_PROP_BITRATE)
+    except cv2.error as e:
+        logger.info(f"OpenCV metadata probe failed for '{os.path.basename(filepath)}': {e}")
+        return None
+    finally:
+        capture.release()
+    return {FIELD_FOURCC: fourcc_code or "N/A", FIELD_BITRATE: f"{int(bitrate)}" if bitrate > 0 else "N/A"}
+
+def probe_container_metadata(filepath: str) -> Dict[str, str]:
+    """
+    Returns display-ready codec details for filepath: always FourCC and bitrate;
+    also codec, pixel format and container when ffprobe is installed. Values
+    that cannot be read are "N/A", or "Error" if the file could not be probed.
+    """
+    metadata = _probe_with_ffprobe(filepath) if ffmpeg_available() else None
+    if metadata is None:
+        metadata = _probe_with_opencv(filepath)
+    if metadata is None:
+        logger.warning(f"Could not probe metadata for '{os.path.basename(filepath)}'.")
+        return {FIELD_FOURCC: "Error", FIELD_BITRATE: "Error"}
+    return metadata
+
+
+class MetadataProbeThread(QtCore.QThread):
+    """Runs probe_container_metadata() off the GUI thread and reports probeFinished(filepath, metadata)."""
+    probeFinished = QtCore.Signal(str, object)
+
+    def __init__(self, filepath: str, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self._filepath = filepath
+
+    def run(self) -> None:
+        try:
+            metadata = probe_container_metadata(self._filepath)
+        except Exception as e:
+            logger.exception(f"Metadata probe failed: {e}")
+            metadata = {FIELD_FOURCC: "Error", FIELD_BITRATE: "Error"}
+        if not self.isInterruptionRequested():
+            self.probeFinished.emit(self._filepath, metadata)
@@ -0,0 +1,120 @@
+# video_proxy.py
+"""
+Builds downscaled, intra-only proxy copies of videos for responsive slider
+scrubbing. Proxies map 1:1 to the original frame indices.
+"""
+import hashlib
+import logging
+import os
+from typing import Callable, Optional
+
+import cv2 # type: ignore
+from PySide6 import QtCore
+
+from video_index import compute_file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+PROXY_SUFFIX = ".proxy.avi"
+PROXY_FOURCC = "MJPG" # Motion JPEG: every frame is a keyframe, so proxy seeks never decode a GOP
+
+def proxy_path_for(filepath: str, max_dimension: int) -> Optional[str]:
+    """Returns the cache location of the proxy for filepath at the given size, or None."""
+    fingerprint = compute_file_fingerprint(filepath)
+    if fingerprint is None:
+        return None
+    key = f"{os.path.abspath(filepath)}|{fingerprint['size']}|{fingerprint['mtime_ns']}|{max_dimension}"
+    key_hash = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    cache_dir = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(cache_dir, "proxies", key_hash + PROXY_SUFFIX)
+
+def proxy_size_for(width: int, height: int, max_dimension: int) -> tuple:
+    """Returns the (width, height) of the proxy, preserving aspect ratio."""
+    scale = min(1.0, float(max_dimension) / float(max(width, height)))
+    return max(2, int(round(width * scale))), max(2, int(round(height * scale)))
+
+def build_proxy(filepath: str,
+                proxy_path: str,
+                max_dimension: int,
+                should_cancel: Callable[[], bool]) -> bool:
+    """
+    Decodes filepath sequentially and writes every frame, downscaled, to an
+    MJPG proxy at proxy_path. Writes to a temporary file first so an interrupted
+    build never leaves a truncated proxy behind.
+    """
+    source = cv2.VideoCapture(filepath)
+    if not source.isOpened():
+        logger.error(f"Proxy build: cannot open '{filepath}'.")
+        return False
+    temp_path = proxy_path + ".partial.avi"
+    writer: Optional[cv2.VideoWriter] = None
+    frames_written = 0
+    try:
+        width = int(source.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(source.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = float(source.get(cv2.CAP_PROP_FPS))
+        if width <= 0 or height <= 0:
+            logger.error("Proxy build: source reports invalid dimensions.")
+            return False
+        proxy_width, proxy_height = proxy_size_for(width, height, max_dimension)
+        os.makedirs(os.path.dirname(proxy_path), exist_ok=True)
+        writer = cv2.VideoWriter(temp_path, cv2.VideoWriter_fourcc(*PROXY_FOURCC),
+                                 fps if fps > 0 else 30.0, (proxy_width, proxy_height))
+        if not writer.isOpened():
+            logger.error(f"Proxy build: cannot open writer for '{temp_path}'.")
+            return False
+        while True:
+            ret, frame = source.read()
+            if not ret or frame is None:
+                break
+            writer.write(cv2.resize(frame, (proxy_width, proxy_height), interpolation=cv2.INTER_AREA))
+            frames_written += 1
+            if frames_written % 100 == 0 and should_cancel():
+                logger.info("Proxy build cancelled.")
+                return False
+        writer.release()
+        writer = None
+        if frames_written == 0:
+            logger.error("Proxy build: no frames could be decoded from the source.")
+            return False
+        os.replace(temp_path, proxy_path)
+        logger.info(f"Proxy built: {frames_written} frames at {proxy_width}x{proxy_height} -> '{proxy_path}'.")
+        return True
+    except (OSError, cv2.error) as e:
+        logger.error(f"Proxy build failed: {e}", exc_info=True)
+        return False
+    finally:
+        source.release()
+        if writer is not None:
+            writer.release()
+        if os.path.exists(temp_path):
+            try: os.remove(temp_path)
+            except OSError: pass
+
+
+class ProxyBuildThread(QtCore.QThread):
+    """
+    Builds a proxy off the GUI thread and reports the result through
+    proxyBuildFinished(source_filepath, proxy_path), with an empty proxy_path
+    on failure or cancellation.
+    """
+    proxyBuildFinished = QtCore.Signal(str, str)
+
+    def __init__(self,
+                 filepath: str,
+                 proxy_path: str,
+                 max_dimension: int,
+                 parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self._filepath = filepath
+        self._proxy_path = proxy_path
+        self._max_dimension = max_dimension
+
+    def run(self) -> None:
+        logger.info(f"Building scrubbing proxy for '{os.path.basename(self._filepath)}'...")
+        success = False
+        try:
+            success = build_proxy(self._filepath, self._proxy_path, self._max_dimension, self.isInterruptionRequested)
+        except Exception as e:
+            logger.exception(f"Proxy build thread failed: {e}")
+        self.proxyBuildFinished.emit(self._filepath, self._proxy_path if success and not self.isInterruptionRequested() else "")